@@ -9,6 +9,23 @@ class ArchesSearchConfig(AppConfig):
 
     def ready(self):
         from arches_modular_reports.config_generator_registry import register
+        from arches_search.indexing.concept_cache import (
+            connect_concept_cache_invalidation,
+        )
+        from arches_search.indexing.language_indexes import (
+            connect_language_index_sync,
+        )
+        from arches_search.indexing.node_keys import connect_node_key_assignment
+        from arches_search.indexing.partitions import connect_graph_partitioning
+        from arches_search.indexing.resource_references import (
+            connect_resource_rename_cascade,
+        )
+
+        connect_concept_cache_invalidation()
+        connect_graph_partitioning()
+        connect_language_index_sync(self)
+        connect_node_key_assignment()
+        connect_resource_rename_cascade()
 
         register(
             "search",
@@ -1,13 +1,32 @@
+from django.conf import settings
+from django.db import transaction
 from arches.app.functions.base import BaseFunction
 from arches.app.models.tile import Tile
-from arches_search.indexing.index_from_tile import index_from_tile
+from arches_search.indexing.fingerprints import changed_fingerprints, save_fingerprints
+from arches_search.indexing.index_from_tile import (
+    fingerprint_tiles,
+    index_from_tile,
+    save_index_records,
+)
+from arches_search.indexing.index_queue import enqueue_tiles
 
 
 class SearchIndexingFunction(BaseFunction):
     # occurs after Tile.save
     def post_save(self, *args, **kwargs):
         tile: Tile = args[0]
+        if settings.SEARCH_INDEXING_MODE == "async":
+            enqueue_tiles([tile.tileid])
+            return
+
         nodegroup_cache = kwargs.get("nodegroup_cache", {})
-        index_records = index_from_tile(tile, nodegroup_cache=nodegroup_cache)
-        for record in index_records:
-            record.save()
+        with transaction.atomic():
+            # saves that leave the indexed values alone keep their rows
+            fingerprints = changed_fingerprints(
+                fingerprint_tiles([tile], nodegroup_cache=nodegroup_cache)
+            )
+            if not fingerprints:
+                return
+            index_records = index_from_tile(tile, nodegroup_cache=nodegroup_cache)
+            save_index_records(index_records)
+            save_fingerprints(fingerprints)
@@ -2,8 +2,36 @@ from arches.app.datatypes.datatypes import BaseDataType
 
 
 class BaseIndexing:
+    """Builds search rows for one datatype.
+
+    `node` is the node's IndexPlanEntry, which carries its string nodeid,
+    alias and graph_slug; other attributes are the node's own.
+
+    Indexers whose rows depend only on the tile's value and the node set
+    reads_tile_only, which lets saves that leave those alone skip reindexing
+    (see fingerprints.tile_fingerprint). Others, such as those that look up
+    concept labels or resource names, are reindexed on every save.
+    """
+
+    reads_tile_only = False
+
     def __init__(self):
         self.datatype: BaseDataType = None
 
     def index(self, tile, node):
         pass
+
+    def prefetch(self, tiles, node):
+        """Bulk-load whatever indexing these tiles will look up; optional."""
+        pass
+
+    def index_tiles(self, tiles, node):
+        """Search rows for node's value in each of the tiles.
+
+        Indexers that can convert a whole column of values at once override
+        this; by default the tiles are indexed one by one.
+        """
+        search_items = []
+        for tile in tiles:
+            search_items.extend(self.index(tile, node) or ())
+        return search_items
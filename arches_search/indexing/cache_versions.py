@@ -0,0 +1,56 @@
+from django.db import connection, transaction
+from arches_search.models.models import IndexCacheVersion
+
+# Per-process indexing caches compare a version counter kept in the database
+# with the one they were filled at; writers bump it after they commit.
+
+
+def cache_version(name):
+    return (
+        IndexCacheVersion.objects.filter(name=name)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+def _bump(name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {IndexCacheVersion._meta.db_table} AS v (name, version) "
+            "VALUES (%s, 1) "
+            "ON CONFLICT (name) DO UPDATE SET version = v.version + 1",
+            [name],
+        )
+
+
+def bump_cache_version(name):
+    """Bump the version once the current transaction commits.
+
+    Waiting for the commit keeps the hot counter row unlocked during long
+    imports, and other processes cannot reload the old data after the bump.
+    """
+    transaction.on_commit(lambda: _bump(name))
+
+
+class VersionCheck:
+    """Throttled comparison of a cache's version with the database's."""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+        self._version = None
+        self._checked_at = None
+
+    def mark_current(self, now):
+        self._version = cache_version(self.name)
+        self._checked_at = now
+
+    def is_stale(self, now):
+        """True when the version moved since the last check, at most once
+        per interval seconds."""
+        if self._checked_at is not None and now - self._checked_at < self.interval:
+            return False
+        version = self._version
+        self.mark_current(now)
+        return version is not None and version != self._version
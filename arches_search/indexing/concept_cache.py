@@ -0,0 +1,146 @@
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from arches.app.models.models import Value
+from arches_search.indexing.cache_versions import VersionCheck, bump_cache_version
+from arches_search.indexing.edtf_cache import parse_edtf
+
+ConceptValue = namedtuple("ConceptValue", ["conceptid", "label", "date_range"])
+
+# bumped in arches_search_cache_version whenever a concept value changes, so
+# other processes drop their copy too
+CACHE_NAME = "concept_values"
+VERSION_CHECK_INTERVAL = 30  # seconds
+
+_DATE_VALUETYPES = ("min_year", "max_year")
+# remembered for valueids with no Value row, so they are not queried again
+_MISSING = object()
+
+
+def _date_range(years):
+    if "min_year" not in years or "max_year" not in years:
+        return None
+    return (
+        parse_edtf(years["min_year"]).bounds.lower,
+        parse_edtf(years["max_year"]).bounds.upper,
+    )
+
+
+class ConceptCache:
+    """valueid -> ConceptValue(conceptid, label, date_range) for concept indexing.
+
+    date_range is the (gte, lte) sortable span from the concept's min_year and
+    max_year values, or None. preload() fills the cache with up to
+    INDEX_CONCEPT_CACHE_SIZE labels in two queries; values it has not seen are
+    fetched on demand and the least recently used are evicted past that size.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._date_ranges = {}
+        self._version_check = VersionCheck(CACHE_NAME, VERSION_CHECK_INTERVAL)
+
+    def _get_maxsize(self):
+        if self.maxsize is None:
+            return settings.INDEX_CONCEPT_CACHE_SIZE
+        return self.maxsize
+
+    def clear(self):
+        self._values.clear()
+        self._date_ranges.clear()
+
+    def _load_date_ranges(self, conceptids=None):
+        years = {}
+        date_values = Value.objects.filter(valuetype_id__in=_DATE_VALUETYPES)
+        if conceptids is not None:
+            date_values = date_values.filter(concept_id__in=conceptids)
+            for conceptid in conceptids:
+                years[conceptid] = {}
+        for conceptid, valuetype, value in date_values.values_list(
+            "concept_id", "valuetype_id", "value"
+        ):
+            years.setdefault(conceptid, {})[valuetype] = value
+        for conceptid, concept_years in years.items():
+            self._date_ranges[conceptid] = _date_range(concept_years)
+
+    def _add(self, rows):
+        for valueid, conceptid, label in rows:
+            self._values[str(valueid)] = ConceptValue(
+                conceptid, label, self._date_ranges.get(conceptid)
+            )
+
+    def _evict(self):
+        maxsize = self._get_maxsize()
+        while len(self._values) > maxsize:
+            self._values.popitem(last=False)
+        if len(self._date_ranges) > maxsize:
+            # only saves queries for concepts seen before; start over
+            self._date_ranges.clear()
+
+    def preload(self):
+        self.clear()
+        self._version_check.mark_current(time.monotonic())
+        self._load_date_ranges()
+        self._add(
+            Value.objects.filter(valuetype__category="label")
+            .values_list("valueid", "concept_id", "value")[: self._get_maxsize()]
+            .iterator(chunk_size=10000)
+        )
+
+    def get_many(self, valueids):
+        """ConceptValues for the given valueids; unknown ids are left out."""
+        if self._version_check.is_stale(time.monotonic()):
+            self.clear()
+        found = {}
+        missing = []
+        for valueid in valueids:
+            concept_value = self._values.get(valueid)
+            if concept_value is None:
+                missing.append(valueid)
+                continue
+            self._values.move_to_end(valueid)
+            if concept_value is not _MISSING:
+                found[valueid] = concept_value
+        if missing:
+            rows = list(
+                Value.objects.filter(valueid__in=missing).values_list(
+                    "valueid", "concept_id", "value"
+                )
+            )
+            new_conceptids = {conceptid for _, conceptid, _ in rows}
+            new_conceptids -= self._date_ranges.keys()
+            if new_conceptids:
+                self._load_date_ranges(new_conceptids)
+            self._add(rows)
+            for valueid in missing:
+                concept_value = self._values.setdefault(valueid, _MISSING)
+                if concept_value is not _MISSING:
+                    found[valueid] = concept_value
+            self._evict()
+        return found
+
+
+concept_cache = ConceptCache()
+
+
+def invalidate_concept_cache(**kwargs):
+    concept_cache.clear()
+    bump_cache_version(CACHE_NAME)
+
+
+def connect_concept_cache_invalidation():
+    # Value covers label edits as well as min_year/max_year changes; deleting
+    # a concept cascades to its values
+    post_save.connect(
+        invalidate_concept_cache,
+        sender=Value,
+        dispatch_uid="arches_search_concept_cache_save",
+    )
+    post_delete.connect(
+        invalidate_concept_cache,
+        sender=Value,
+        dispatch_uid="arches_search_concept_cache_delete",
+    )
@@ -0,0 +1,246 @@
+import struct
+import uuid
+from decimal import Decimal
+
+from django.contrib.gis.db.models import GeometryField
+from django.db import connection
+from django.db.models.fields import AutoFieldMixin
+
+COPY_FORMATS = ("text", "binary")
+
+# rows are encoded lazily and handed to postgres in chunks of roughly this
+# many bytes, so a flush never holds more than one chunk of COPY data
+COPY_CHUNK_SIZE = 1 << 20
+
+_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_BINARY_TRAILER = struct.pack(">h", -1)
+_NULL_BINARY = struct.pack(">i", -1)
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _as_uuid(value):
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _as_decimal(value):
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _as_geometry(value, field):
+    if value.srid is None:
+        value.srid = field.srid
+    return value
+
+
+def _encode_numeric(value):
+    """Encode a Decimal in postgres' binary numeric format (base-10000 digits)."""
+    value = _as_decimal(value)
+    if value.is_nan():
+        return struct.pack(">hhHH", 0, 0, 0xC000, 0)
+    sign, digits, exponent = value.as_tuple()
+    digit_str = "".join(map(str, digits))
+    if exponent > 0:
+        digit_str += "0" * exponent
+        exponent = 0
+    frac_len = -exponent
+    digit_str = digit_str.rjust(frac_len + 1, "0")
+    int_part = digit_str[: len(digit_str) - frac_len]
+    frac_part = digit_str[len(digit_str) - frac_len :]
+
+    int_part = int_part.rjust(-(-len(int_part) // 4) * 4, "0")
+    frac_part = frac_part.ljust(-(-len(frac_part) // 4) * 4, "0")
+    groups = [int(int_part[i : i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(groups) - 1
+    groups += [int(frac_part[i : i + 4]) for i in range(0, len(frac_part), 4)]
+
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+        sign = 0
+
+    return struct.pack(
+        f">hhHH{len(groups)}H",
+        len(groups),
+        weight,
+        0x4000 if sign else 0,
+        frac_len,
+        *groups,
+    )
+
+
+def _text_encoder(field):
+    if isinstance(field, GeometryField):
+        return lambda value: _as_geometry(value, field).hexewkb.decode()
+    internal_type = (
+        field.target_field.get_internal_type()
+        if field.is_relation
+        else field.get_internal_type()
+    )
+    if internal_type in ("TextField", "CharField"):
+        return lambda value: str(value).translate(_TEXT_ESCAPES)
+    if internal_type == "BooleanField":
+        return lambda value: "t" if value else "f"
+    if internal_type in (
+        "UUIDField",
+        "BigIntegerField",
+        "IntegerField",
+        "PositiveIntegerField",
+        "SmallIntegerField",
+        "PositiveSmallIntegerField",
+        "DecimalField",
+    ):
+        return str
+    if internal_type == "FloatField":
+        return lambda value: repr(float(value))
+    raise ValueError(f"COPY writer does not support {internal_type} ({field.name})")
+
+
+def _binary_encoder(field):
+    if isinstance(field, GeometryField):
+        return lambda value: bytes(_as_geometry(value, field).ewkb)
+    internal_type = (
+        field.target_field.get_internal_type()
+        if field.is_relation
+        else field.get_internal_type()
+    )
+    if internal_type in ("TextField", "CharField"):
+        return lambda value: str(value).encode()
+    if internal_type == "UUIDField":
+        return lambda value: _as_uuid(value).bytes
+    if internal_type == "BooleanField":
+        return lambda value: b"\x01" if value else b"\x00"
+    if internal_type == "BigIntegerField":
+        return lambda value: struct.pack(">q", int(value))
+    if internal_type in ("IntegerField", "PositiveIntegerField"):
+        return lambda value: struct.pack(">i", int(value))
+    if internal_type in ("SmallIntegerField", "PositiveSmallIntegerField"):
+        return lambda value: struct.pack(">h", int(value))
+    if internal_type == "FloatField":
+        return lambda value: struct.pack(">d", float(value))
+    if internal_type == "DecimalField":
+        return _encode_numeric
+    raise ValueError(f"COPY writer does not support {internal_type} ({field.name})")
+
+
+def copy_fields(model):
+    """Columns written by COPY: everything but the serial pk and generated columns."""
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if not field.generated and not isinstance(field, AutoFieldMixin)
+    ]
+
+
+class _ChunkReader:
+    """File-like adapter over an iterator of byte chunks, for copy_expert."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class CopyWriter:
+    """Streams search rows into their tables with COPY ... FROM STDIN.
+
+    Generated columns (TermSearch.search_vector) are left to postgres and
+    geometries are sent as EWKB, hex encoded in text format.
+    """
+
+    def __init__(self, copy_format="text", chunk_size=COPY_CHUNK_SIZE):
+        if copy_format not in COPY_FORMATS:
+            raise ValueError(f"Unknown COPY format: {copy_format}")
+        self.copy_format = copy_format
+        self.chunk_size = chunk_size
+        self._plans = {}
+
+    def _plan(self, model):
+        if model not in self._plans:
+            fields = copy_fields(model)
+            make_encoder = (
+                _binary_encoder if self.copy_format == "binary" else _text_encoder
+            )
+            columns = ", ".join(
+                connection.ops.quote_name(field.column) for field in fields
+            )
+            sql = (
+                f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) "
+                f"FROM STDIN WITH (FORMAT {self.copy_format})"
+            )
+            self._plans[model] = (
+                sql,
+                [(field.attname, make_encoder(field)) for field in fields],
+            )
+        return self._plans[model]
+
+    def _encode_text(self, records, encoders):
+        for record in records:
+            line = "\t".join(
+                r"\N" if (value := getattr(record, attname)) is None else encode(value)
+                for attname, encode in encoders
+            )
+            yield (line + "\n").encode()
+
+    def _encode_binary(self, records, encoders):
+        field_count = struct.pack(">h", len(encoders))
+        for record in records:
+            parts = [field_count]
+            for attname, encode in encoders:
+                value = getattr(record, attname)
+                if value is None:
+                    parts.append(_NULL_BINARY)
+                else:
+                    data = encode(value)
+                    parts.append(struct.pack(">i", len(data)))
+                    parts.append(data)
+            yield b"".join(parts)
+
+    def _chunks(self, records, encoders):
+        if self.copy_format == "binary":
+            rows = self._encode_binary(records, encoders)
+            buffer = [_BINARY_HEADER]
+            buffered = len(_BINARY_HEADER)
+        else:
+            rows = self._encode_text(records, encoders)
+            buffer = []
+            buffered = 0
+        for row in rows:
+            buffer.append(row)
+            buffered += len(row)
+            if buffered >= self.chunk_size:
+                yield b"".join(buffer)
+                buffer = []
+                buffered = 0
+        if self.copy_format == "binary":
+            buffer.append(_BINARY_TRAILER)
+        if buffer:
+            yield b"".join(buffer)
+
+    def write(self, model, records):
+        if not records:
+            return
+        sql, encoders = self._plan(model)
+        chunks = self._chunks(records, encoders)
+        with connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, "copy"):
+                # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    for chunk in chunks:
+                        copy.write(chunk)
+            else:
+                raw_cursor.copy_expert(sql, _ChunkReader(chunks), size=self.chunk_size)
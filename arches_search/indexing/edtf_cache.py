@@ -0,0 +1,59 @@
+import functools
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from arches.app.utils.date_utils import ExtendedDateFormat
+
+EDTFBounds = namedtuple("EDTFBounds", ["lower", "upper", "lower_fuzzy", "upper_fuzzy"])
+
+ParsedEDTF = namedtuple("ParsedEDTF", ["bounds", "result_set"])
+
+_cached_parse = None
+
+
+def _bounds(date_range):
+    return EDTFBounds(
+        date_range.lower,
+        date_range.upper,
+        date_range.lower_fuzzy,
+        date_range.upper_fuzzy,
+    )
+
+
+def _parse(value, config_json):
+    config = json.loads(config_json) if config_json else {}
+    edtf = ExtendedDateFormat(value, **config)
+    result_set = tuple(_bounds(result) for result in edtf.result_set or ())
+    return ParsedEDTF(_bounds(edtf), result_set)
+
+
+def parse_edtf(value, config=None):
+    """ExtendedDateFormat(value, **config), reduced to its sortable bounds.
+
+    Results are kept in a process-wide LRU of INDEX_EDTF_CACHE_SIZE entries,
+    since the same few EDTF strings make up most of a large dataset.
+    """
+    global _cached_parse
+    if _cached_parse is None:
+        _cached_parse = functools.lru_cache(maxsize=settings.INDEX_EDTF_CACHE_SIZE)(
+            _parse
+        )
+    config_json = (
+        json.dumps(dict(config), sort_keys=True, default=str) if config else ""
+    )
+    return _cached_parse(value, config_json)
+
+
+def edtf_cache_stats():
+    """(hits, misses) of the EDTF cache in this process."""
+    if _cached_parse is None:
+        return 0, 0
+    info = _cached_parse.cache_info()
+    return info.hits, info.misses
+
+
+def edtf_cache_summary(hits, misses):
+    lookups = hits + misses
+    rate = 100.0 * hits / lookups if lookups else 0.0
+    return f"EDTF cache {hits} hits, {misses} misses ({rate:.1f}% hit rate)"
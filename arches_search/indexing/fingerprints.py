@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+from arches.app.models.models import TileModel
+from arches_search.models.models import TileIndexFingerprint
+
+# bump when the built-in indexers change the rows they build, so tiles saved
+# with unchanged values are reindexed once more
+FINGERPRINT_VERSION = 1
+
+
+def _indexer_name(indexer):
+    return f"{type(indexer).__module__}.{type(indexer).__qualname__}"
+
+
+def tile_fingerprint(tile, plan):
+    """Hash of everything a tile's search rows are built from, or None.
+
+    That is the tile's value for each node in its nodegroup's IndexPlan, along
+    with the node's alias, graph slug, datatype and config and the indexer
+    class, so renaming a node or registering another indexer also changes the
+    fingerprint. None when an indexer reads other tables (concept labels,
+    resource names): such tiles are reindexed on every save.
+    """
+    if not all(entry.indexer.reads_tile_only for entry in plan):
+        return None
+    indexed = sorted(
+        (
+            entry.nodeid,
+            entry.alias,
+            entry.graph_slug,
+            entry.node.datatype,
+            entry.node.config,
+            _indexer_name(entry.indexer),
+            tile.data.get(entry.nodeid),
+        )
+        for entry in plan
+    )
+    encoded = json.dumps(
+        [FINGERPRINT_VERSION, indexed],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def changed_fingerprints(fingerprints):
+    """The entries of {tileid: fingerprint} that differ from the stored ones.
+
+    A None fingerprint always counts as changed.
+    """
+    stored = {
+        str(tileid): fingerprint
+        for tileid, fingerprint in TileIndexFingerprint.objects.filter(
+            tileid__in=list(fingerprints)
+        ).values_list("tileid", "fingerprint")
+    }
+    return {
+        tileid: fingerprint
+        for tileid, fingerprint in fingerprints.items()
+        if fingerprint is None or stored.get(str(tileid)) != fingerprint
+    }
+
+
+def save_fingerprints(fingerprints):
+    TileIndexFingerprint.objects.bulk_create(
+        [
+            TileIndexFingerprint(tileid_id=tileid, fingerprint=fingerprint)
+            for tileid, fingerprint in fingerprints.items()
+            if fingerprint is not None
+        ],
+        update_conflicts=True,
+        unique_fields=["tileid"],
+        update_fields=["fingerprint"],
+    )
+
+
+def clear_fingerprints(tile_filter=None):
+    """Forget the fingerprints of the tiles matching tile_filter (a TileModel
+    Q; every tile when None), so their next save reindexes them."""
+    fingerprints = TileIndexFingerprint.objects.all()
+    if tile_filter is not None:
+        fingerprints = fingerprints.filter(
+            tileid__in=TileModel.objects.filter(tile_filter).values("tileid")
+        )
+    fingerprints.delete()
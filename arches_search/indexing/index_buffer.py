@@ -0,0 +1,55 @@
+from django.contrib.gis.geos import GEOSGeometry
+from arches_search.indexing.index_from_tile import SEARCH_MODELS, group_index_records
+
+# rough in-memory cost of one unsaved search model instance (object, __dict__,
+# ModelState and its small scalar values) before any long strings or geometries
+ROW_OVERHEAD_BYTES = 600
+COORDINATE_BYTES = 24
+
+
+def estimate_record_bytes(record):
+    size = ROW_OVERHEAD_BYTES
+    for value in record.__dict__.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, GEOSGeometry):
+            size += value.num_coords * COORDINATE_BYTES
+    return size
+
+
+class IndexBuffer:
+    """Search rows waiting to be written, grouped by model, with a size estimate.
+
+    Callers flush once is_full() reports that either the row or the estimated
+    byte budget is spent, so tiles that fan out into many (or large) rows
+    cannot push a worker past its memory limit. The high-water marks are kept
+    for the end-of-run summary.
+    """
+
+    def __init__(self, max_rows, max_bytes):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.values = {model: [] for model in SEARCH_MODELS}
+        self.rows = 0
+        self.bytes = 0
+        self.peak_rows = 0
+        self.peak_bytes = 0
+
+    def extend(self, records):
+        group_index_records(records, self.values)
+        for record in records:
+            self.rows += 1
+            self.bytes += estimate_record_bytes(record)
+        self.peak_rows = max(self.peak_rows, self.rows)
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def is_full(self):
+        return self.rows >= self.max_rows or self.bytes >= self.max_bytes
+
+    def flush(self, write):
+        """Hand the buffered rows, grouped by model, to `write` and start over."""
+        write(self.values)
+        for values in self.values.values():
+            values.clear()
+        self.rows = 0
+        self.bytes = 0
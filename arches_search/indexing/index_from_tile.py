@@ -1,5 +1,7 @@
 from django.db.models import Q
 from arches.app.models.models import Node
+from arches_search.indexing.fingerprints import tile_fingerprint
+from arches_search.indexing.index_plan import IndexPlan
 from arches_search.indexing.indexing_factory import IndexingFactory
 from arches_search.models.models import (
     BooleanSearch,
@@ -9,8 +11,21 @@ from arches_search.models.models import (
     GeometrySearch,
     NumericSearch,
     TermSearch,
+    TileIndexFingerprint,
+    UUIDSearch,
 )
 
+SEARCH_MODELS = [
+    TermSearch,
+    NumericSearch,
+    DateSearch,
+    UUIDSearch,
+    DateRangeSearch,
+    BooleanSearch,
+    GeometrySearch,
+    FileListSearch,
+]
+
 
 def _get_nodegroup(nodegroup_id):
     return Node.objects.filter(
@@ -18,42 +33,184 @@ def _get_nodegroup(nodegroup_id):
     ).select_related("graph")
 
 
+def _load_nodegroups(nodegroup_ids, nodegroup_cache):
+    missing = set(nodegroup_ids) - nodegroup_cache.keys()
+    if not missing:
+        return
+    for nodegroup_id in missing:
+        nodegroup_cache[nodegroup_id] = []
+    for node in Node.objects.filter(
+        Q(nodegroup_id__in=missing) & ~Q(graph__slug="arches_system_settings")
+    ).select_related("graph"):
+        nodegroup_cache[node.nodegroup_id].append(node)
+
+
+def delete_index_records(tileids):
+    """Purge the search rows of the given tiles with one DELETE per search table."""
+    tileids = list(tileids)
+    if not tileids:
+        return
+    for model in SEARCH_MODELS:
+        model.objects.filter(tileid__in=tileids).delete()
+    TileIndexFingerprint.objects.filter(tileid__in=tileids).delete()
+
+
+def purge_graph_index_records(graphid):
+    """Purge the search rows of every resource in a graph, one DELETE per table.
+
+    Run it before deleting a graph's resources so postgres does not cascade
+    into the search tables resource by resource. Returns the rows deleted.
+    """
+    deleted = 0
+    for model in SEARCH_MODELS:
+        count, _ = model.objects.filter(resourceinstanceid__graph_id=graphid).delete()
+        deleted += count
+    TileIndexFingerprint.objects.filter(
+        tileid__resourceinstance__graph_id=graphid
+    ).delete()
+    return deleted
+
+
+def group_index_records(records, grouped=None):
+    """Bucket search rows by their model so each table gets one bulk insert."""
+    if grouped is None:
+        grouped = {model: [] for model in SEARCH_MODELS}
+    for record in records:
+        grouped[type(record)].append(record)
+    return grouped
+
+
+def save_grouped_index_records(grouped, batch_size=None):
+    for model, values in grouped.items():
+        if values:
+            model.objects.bulk_create(values, batch_size=batch_size)
+
+
+def save_index_records(records, batch_size=None):
+    save_grouped_index_records(group_index_records(records), batch_size=batch_size)
+
+
+def _get_index_plan(nodegroup_id, nodegroup_cache, indexing_factory=None):
+    """The nodegroup's IndexPlan, compiling cached nodes into one on first use."""
+    plan = nodegroup_cache.get(nodegroup_id)
+    if plan is None:
+        plan = _get_nodegroup(nodegroup_id)
+    if not isinstance(plan, IndexPlan):
+        if indexing_factory is None:
+            indexing_factory = IndexingFactory()
+        plan = nodegroup_cache[nodegroup_id] = IndexPlan.compile(plan, indexing_factory)
+    return plan
+
+
 def index_from_tile(
     tile, delete_existing=True, indexing_factory=None, nodegroup_cache=None
 ):
+    """Search rows for a tile.
+
+    nodegroup_cache maps nodegroup ids to their nodes; each entry is replaced
+    by its compiled IndexPlan the first time a tile of that nodegroup is
+    indexed, so the same cache should always be used with the same factory.
+    """
     if nodegroup_cache is None:
         nodegroup_cache = {}
-    if tile.nodegroup_id not in nodegroup_cache:
-        nodegroup_cache[tile.nodegroup_id] = _get_nodegroup(tile.nodegroup_id)
-    nodes = nodegroup_cache[tile.nodegroup_id]
+    plan = _get_index_plan(tile.nodegroup_id, nodegroup_cache, indexing_factory)
 
     if delete_existing:
-        TermSearch.objects.filter(tileid=tile.tileid).delete()
-        DateSearch.objects.filter(tileid=tile.tileid).delete()
-        DateRangeSearch.objects.filter(tileid=tile.tileid).delete()
-        BooleanSearch.objects.filter(tileid=tile.tileid).delete()
-        NumericSearch.objects.filter(tileid=tile.tileid).delete()
-        GeometrySearch.objects.filter(tileid=tile.tileid).delete()
-        FileListSearch.objects.filter(tileid=tile.tileid).delete()
+        delete_index_records([tile.tileid])
 
-    if indexing_factory is None:
-        factory = IndexingFactory()
-    else:
-        factory = indexing_factory
+    result = []
+    data = tile.data
+    for entry in plan:
+        if data.get(entry.nodeid) is not None:
+            res = entry.index(tile, entry)
+            if res:
+                result.extend(_keyed(res, entry.node_key))
+    return result
 
+
+def fingerprint_tiles(tiles, nodegroup_cache=None, indexing_factory=None):
+    """{tileid: fingerprint} of the values the tiles' search rows are built from
+    (None for tiles that are reindexed on every save)."""
+    tiles = list(tiles)
     if nodegroup_cache is None:
-        nodes = Node.objects.filter(nodegroup_id=tile.nodegroup_id)
-        nodegroup_cache = {tile.nodegroup_id: list(nodes)}
+        nodegroup_cache = {}
+    _load_nodegroups({tile.nodegroup_id for tile in tiles}, nodegroup_cache)
+    return {
+        tile.tileid: tile_fingerprint(
+            tile, _get_index_plan(tile.nodegroup_id, nodegroup_cache, indexing_factory)
+        )
+        for tile in tiles
+    }
 
-    result = []
-    for node in nodes:
-        nodeid = str(node.nodeid)
-        if nodeid in tile.data:
-            if tile.data[nodeid] is None:
-                continue
 
-            indexer = factory.get_indexing_class(node.datatype)
-            res = indexer.index(tile, node)
-            if res:
-                result.extend(res)
-    return result
+def _group_by_nodegroup(tiles):
+    tiles_by_nodegroup = {}
+    for tile in tiles:
+        tiles_by_nodegroup.setdefault(tile.nodegroup_id, []).append(tile)
+    return tiles_by_nodegroup
+
+
+def _keyed(records, node_key):
+    for record in records:
+        record.node_key = node_key
+        yield record
+
+
+def _valued_tiles(tiles, entry):
+    return [tile for tile in tiles if tile.data.get(entry.nodeid) is not None]
+
+
+def prefetch_index_data(tiles, nodegroup_cache, indexing_factory=None):
+    """Let indexers bulk-load what they will look up for a batch of tiles.
+
+    For callers that go on to index the tiles one at a time with
+    index_from_tile; index_from_tiles does not need it.
+    """
+    for nodegroup_id, nodegroup_tiles in _group_by_nodegroup(tiles).items():
+        plan = _get_index_plan(nodegroup_id, nodegroup_cache, indexing_factory)
+        for entry in plan:
+            if entry.prefetch is not None:
+                valued_tiles = _valued_tiles(nodegroup_tiles, entry)
+                if valued_tiles:
+                    entry.prefetch(valued_tiles, entry)
+
+
+def index_from_tiles(
+    tiles,
+    delete_existing=True,
+    indexing_factory=None,
+    nodegroup_cache=None,
+    datatypes=None,
+):
+    """Index a batch of tiles at once.
+
+    Nodegroups missing from the cache are loaded with a single query and, when
+    delete_existing is set, old rows are purged with one `tileid__in` DELETE
+    per search table. Each node's values are handed to its indexer as one
+    column (BaseIndexing.index_tiles); `datatypes` limits indexing to the nodes
+    of those datatypes. Returns the new rows grouped by search model, ready
+    for save_grouped_index_records.
+    """
+    tiles = list(tiles)
+    if nodegroup_cache is None:
+        nodegroup_cache = {}
+    if indexing_factory is None:
+        indexing_factory = IndexingFactory()
+
+    _load_nodegroups({tile.nodegroup_id for tile in tiles}, nodegroup_cache)
+    if delete_existing:
+        delete_index_records([tile.tileid for tile in tiles])
+
+    grouped = {model: [] for model in SEARCH_MODELS}
+    for nodegroup_id, nodegroup_tiles in _group_by_nodegroup(tiles).items():
+        plan = _get_index_plan(nodegroup_id, nodegroup_cache, indexing_factory)
+        for entry in plan:
+            if datatypes is not None and entry.node.datatype not in datatypes:
+                continue
+            valued_tiles = _valued_tiles(nodegroup_tiles, entry)
+            if valued_tiles:
+                group_index_records(
+                    _keyed(entry.index_tiles(valued_tiles, entry), entry.node_key),
+                    grouped,
+                )
+    return grouped
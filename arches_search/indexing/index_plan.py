@@ -0,0 +1,73 @@
+from arches_search.indexing.base import BaseIndexing
+from arches_search.indexing.node_keys import node_keys
+
+
+class IndexPlanEntry:
+    """One indexable node of a nodegroup, with everything the hot loop reads.
+
+    Indexers receive the entry in place of the node: nodeid (as a string),
+    alias and graph_slug are read from it directly, anything else (config,
+    datatype, ...) falls through to the node.
+    """
+
+    __slots__ = (
+        "nodeid",
+        "alias",
+        "graph_slug",
+        "node_key",
+        "node",
+        "indexer",
+        "index",
+        "index_tiles",
+        "prefetch",
+    )
+
+    def __init__(self, node, indexer, node_key=None):
+        self.nodeid = str(node.nodeid)
+        self.alias = node.alias
+        self.graph_slug = node.graph.slug
+        self.node_key = node_key
+        self.node = node
+        self.indexer = indexer
+        self.index = indexer.index
+        self.index_tiles = indexer.index_tiles
+        # None when the indexer has nothing to prefetch
+        self.prefetch = (
+            None
+            if type(indexer).prefetch is BaseIndexing.prefetch
+            else indexer.prefetch
+        )
+
+    def __getattr__(self, name):
+        if name == "node":
+            raise AttributeError(name)
+        return getattr(self.node, name)
+
+
+class IndexPlan(tuple):
+    """A nodegroup's nodes compiled for indexing.
+
+    Nodes whose datatype has no indexer are left out, so indexing a tile is a
+    walk over ready entries with no per-node string conversion or indexer
+    lookup. Each entry carries its node's SearchNodeKey id, resolved for the
+    whole nodegroup in one query.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def compile(cls, nodes, indexing_factory):
+        indexed = []
+        for node in nodes:
+            indexer = indexing_factory.get_indexer(node.datatype)
+            if indexer is not None:
+                indexed.append((node, indexer))
+        keys = node_keys(
+            (node.graph.slug, node.alias, node.datatype) for node, _ in indexed
+        )
+        return cls(
+            IndexPlanEntry(
+                node, indexer, keys[(node.graph.slug, node.alias, node.datatype)]
+            )
+            for node, indexer in indexed
+        )
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from arches.app.models.models import TileModel
+from arches_search.indexing.fingerprints import changed_fingerprints, save_fingerprints
+from arches_search.indexing.index_from_tile import (
+    delete_index_records,
+    fingerprint_tiles,
+    index_from_tiles,
+    save_grouped_index_records,
+)
+from arches_search.indexing.indexing_factory import IndexingFactory
+from arches_search.indexing.resource_names import resource_names
+from arches_search.indexing.tile_records import tile_records
+from arches_search.models.models import IndexQueueEntry
+
+
+def enqueue_tiles(tileids):
+    """Record tiles for deferred reindexing.
+
+    A tile that is already queued keeps a single entry; its queued_at is bumped
+    so a drain that is currently holding the old entry cannot drop the new edit.
+    """
+    now = timezone.now()
+    IndexQueueEntry.objects.bulk_create(
+        [IndexQueueEntry(tileid=tileid, queued_at=now) for tileid in tileids],
+        update_conflicts=True,
+        unique_fields=["tileid"],
+        update_fields=["queued_at"],
+    )
+
+
+def queue_depth():
+    return IndexQueueEntry.objects.count()
+
+
+def drain_index_queue(batch_size=None):
+    """Reindex every queued tile, batch_size tiles per transaction.
+
+    Entries are claimed with SKIP LOCKED so several drains can run at once.
+    Tiles deleted since they were queued just have their search rows purged.
+    Entries re-queued after a batch was read are left for the next batch.
+    """
+    if batch_size is None:
+        batch_size = settings.SEARCH_INDEX_QUEUE_BATCH_SIZE
+    with resource_names.caching():
+        return _drain(batch_size)
+
+
+def _drain(batch_size):
+    indexing_factory = IndexingFactory()
+    nodegroup_cache = {}
+    drained = 0
+
+    while True:
+        with transaction.atomic():
+            read_at = timezone.now()
+            tileids = list(
+                IndexQueueEntry.objects.select_for_update(skip_locked=True)
+                .order_by("queued_at")
+                .values_list("tileid", flat=True)[:batch_size]
+            )
+            if not tileids:
+                break
+
+            tiles = list(tile_records(TileModel.objects.filter(tileid__in=tileids)))
+            fingerprints = changed_fingerprints(
+                fingerprint_tiles(tiles, nodegroup_cache, indexing_factory)
+            )
+            # tiles whose indexed values did not change keep their rows; purge
+            # the rest by queued id, as deleted tiles do not come back above
+            unchanged = {tile.tileid for tile in tiles} - fingerprints.keys()
+            delete_index_records(
+                [tileid for tileid in tileids if tileid not in unchanged]
+            )
+            grouped = index_from_tiles(
+                [tile for tile in tiles if tile.tileid in fingerprints],
+                delete_existing=False,
+                indexing_factory=indexing_factory,
+                nodegroup_cache=nodegroup_cache,
+            )
+            save_grouped_index_records(grouped)
+            save_fingerprints(fingerprints)
+            IndexQueueEntry.objects.filter(
+                tileid__in=tileids, queued_at__lte=read_at
+            ).delete()
+        drained += len(tileids)
+
+    return drained
@@ -5,12 +5,14 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class BooleanIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype = DataTypeFactory().get_instance("boolean")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         boolean_value = tile.data.get(nodeid, None)
         search_items = []
         if boolean_value is not None:
@@ -19,7 +21,7 @@ class BooleanIndexing(BaseIndexing):
                 tileid_id=tile.tileid,
                 resourceinstanceid_id=tile.resourceinstance_id,
                 datatype=self.datatype.datatype_name,
-                graph_slug=node.graph.slug,
+                graph_slug=node.graph_slug,
                 value=boolean_value,
             )
             search_items.append(boolean_search)
@@ -4,6 +4,7 @@ from arches.app.models.models import Language
 from arches_search.models.models import DateRangeSearch, TermSearch, UUIDSearch
 
 from arches_search.indexing.base import BaseIndexing
+from arches_search.indexing.concept_cache import concept_cache
 
 
 class ConceptIndexing(BaseIndexing):
@@ -18,49 +19,50 @@ class ConceptIndexing(BaseIndexing):
                 self.languages[l_obj.code] = l_obj
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
-        document = {"domains": [], "strings": [], "date_ranges": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        nodeid = node.nodeid
+        valueids = self.datatype.get_nodevalues(tile.data[nodeid])
+        concept_values = concept_cache.get_many(valueids)
         search_items = []
-        for string in document["strings"]:
-            if string["string"] is not None:
+        for valueid in valueids:
+            concept_value = concept_values.get(valueid)
+            if concept_value is None:
+                continue
+
+            if concept_value.label is not None:
                 string_search = TermSearch(
                     node_alias=node.alias,
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    value=string["string"],
+                    graph_slug=node.graph_slug,
+                    value=concept_value.label,
                 )
                 search_items.append(string_search)
 
-        for concept in document["domains"]:
-            for id in [concept["conceptid"], concept["valueid"]]:
+            for id in [concept_value.conceptid, valueid]:
                 if id is not None:
                     uuid_search = UUIDSearch(
                         node_alias=node.alias,
                         tileid_id=tile.tileid,
                         resourceinstanceid_id=tile.resourceinstance_id,
                         datatype=self.datatype.datatype_name,
-                        graph_slug=node.graph.slug,
+                        graph_slug=node.graph_slug,
                         value=id,
                     )
                     search_items.append(uuid_search)
 
-        for concept in document["date_ranges"]:
-            if (
-                concept["date_range"]["gte"] is not None
-                and concept["date_range"]["lte"] is not None
-            ):
-                date_range_search = DateRangeSearch(
-                    node_alias=node.alias,
-                    tileid_id=tile.tileid,
-                    resourceinstanceid_id=tile.resourceinstance_id,
-                    datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    start_value=concept["date_range"]["gte"],
-                    end_value=concept["date_range"]["lte"],
-                )
-                search_items.append(date_range_search)
+            if concept_value.date_range is not None:
+                start_value, end_value = concept_value.date_range
+                if start_value is not None and end_value is not None:
+                    date_range_search = DateRangeSearch(
+                        node_alias=node.alias,
+                        tileid_id=tile.tileid,
+                        resourceinstanceid_id=tile.resourceinstance_id,
+                        datatype=self.datatype.datatype_name,
+                        graph_slug=node.graph_slug,
+                        start_value=start_value,
+                        end_value=end_value,
+                    )
+                    search_items.append(date_range_search)
 
         return search_items
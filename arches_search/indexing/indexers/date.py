@@ -1,54 +1,35 @@
-from arches.app.utils.date_utils import ExtendedDateFormat
 from arches.app.datatypes.datatypes import DataTypeFactory, BaseDataType
 from arches_search.models.models import DateSearch
 
 from arches_search.indexing.base import BaseIndexing
+from arches_search.indexing.iso_dates import sortable_dates
 
 
 class DateIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype: BaseDataType = DataTypeFactory().get_instance("date")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
-        document = {"dates": [], "date_ranges": []}
-        date_value = tile.data[nodeid]
-        # remove time component if it exists
-        date_components = date_value.split(" ")[0].split("-")
+        return self.index_tiles([tile], node)
+
+    def index_tiles(self, tiles, node):
+        # ISO dates (by far the most common) are converted arithmetically;
+        # only other formats go through the slow edtf library
+        nodeid = node.nodeid
+        dates = sortable_dates([tile.data[nodeid] for tile in tiles])
         search_items = []
-        if len(date_components[0]) == 4 and len(date_components) == 3:
-            # date parsing with the edtf library is slow, so for known
-            # formats (like date) we can speed it up with this
-            self._short_circuit_date(document, date_components, nodeid, node, tile)
-        else:
-            self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
-        for date in document["dates"]:
-            if date["date"] is not None:
+        for tile, date in zip(tiles, dates):
+            if date is not None:
                 date_search = DateSearch(
                     node_alias=node.alias,
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    value=date["date"],
+                    graph_slug=node.graph_slug,
+                    value=date,
                 )
                 search_items.append(date_search)
         return search_items
-
-    def _short_circuit_date(self, document, date_components, nodeid, node, tile):
-
-        year = int(date_components[0])
-        month = int(date_components[1])
-        day = int(date_components[2])
-        edtf = ExtendedDateFormat()
-        date_int = edtf.to_sortable_date(year, month, day)
-
-        document["dates"].append(
-            {
-                "date": date_int,
-                "nodegroup_id": tile.nodegroup_id,
-                "nodeid": nodeid,
-                "provisional": tile.provisionaledits,
-            }
-        )
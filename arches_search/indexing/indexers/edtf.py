@@ -2,43 +2,54 @@ from arches.app.datatypes.datatypes import DataTypeFactory
 from arches_search.models.models import DateSearch, DateRangeSearch
 
 from arches_search.indexing.base import BaseIndexing
+from arches_search.indexing.edtf_cache import parse_edtf
 
 
 class EDTFIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype = DataTypeFactory().get_instance("edtf")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
-        document = {"dates": [], "date_ranges": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], nodeid, tile)
+        nodeid = node.nodeid
+        parsed = parse_edtf(tile.data[nodeid], node.config)
+        dates = []
+        date_ranges = []
+        for bounds in parsed.result_set or (parsed.bounds,):
+            if bounds.lower == bounds.upper:
+                if bounds.lower is not None:
+                    dates.append(bounds.lower)
+            else:
+                if bounds.lower_fuzzy is not None:
+                    dates.append(bounds.lower_fuzzy)
+                if bounds.upper_fuzzy is not None:
+                    dates.append(bounds.upper_fuzzy)
+                date_ranges.append((bounds.lower_fuzzy, bounds.upper_fuzzy))
+
         search_items = []
-        for date in document["dates"]:
-            if date["date"] is not None:
-                date_search = DateSearch(
-                    node_alias=node.alias,
-                    tileid_id=tile.tileid,
-                    resourceinstanceid_id=tile.resourceinstance_id,
-                    datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    value=date["date"],
-                )
-                search_items.append(date_search)
+        for date in dates:
+            date_search = DateSearch(
+                node_alias=node.alias,
+                tileid_id=tile.tileid,
+                resourceinstanceid_id=tile.resourceinstance_id,
+                datatype=self.datatype.datatype_name,
+                graph_slug=node.graph_slug,
+                value=date,
+            )
+            search_items.append(date_search)
 
-        for date_range in document["date_ranges"]:
-            if (
-                date_range["date_range"]["lte"] is not None
-                and date_range["date_range"]["gte"] is not None
-            ):
+        for start_value, end_value in date_ranges:
+            if start_value is not None and end_value is not None:
                 date_range_search = DateRangeSearch(
                     node_alias=node.alias,
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    start_value=date_range["date_range"]["gte"],
-                    end_value=date_range["date_range"]["lte"],
+                    graph_slug=node.graph_slug,
+                    start_value=start_value,
+                    end_value=end_value,
                 )
                 search_items.append(date_range_search)
 
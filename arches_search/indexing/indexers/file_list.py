@@ -8,6 +8,8 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class FileListIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype: BaseDataType = DataTypeFactory().get_instance("file-list")
@@ -19,7 +21,7 @@ class FileListIndexing(BaseIndexing):
                 self.languages[l_obj.code] = l_obj
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         self._set_languages()
         document = {"strings": []}
         self.datatype.append_to_document(document, tile.data[nodeid], nodeid, tile)
@@ -32,7 +34,7 @@ class FileListIndexing(BaseIndexing):
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
                     language=string["language"] if "language" in string else "",
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=string["string"],
                 )
                 search_items.append(string_search)
@@ -56,7 +58,7 @@ class FileListIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=file_name or None,
                     extension=extension,
                     file_size=file_item.get("size"),
@@ -1,38 +1,77 @@
 import json
 
+from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection
 from arches.app.datatypes.datatypes import DataTypeFactory
 from arches_search.models.models import GeometrySearch
 from arches_search.indexing.base import BaseIndexing
 
+# One row per GeoJSON geometry in, one row per stored piece out, tagged with
+# the input's (1-based) position. arches_search_geometry_pieces (migration
+# 0030) repairs or skips bad geometries one at a time.
+_CONVERT_SQL = (
+    "SELECT g.position, ST_AsEWKB(piece) "
+    "FROM unnest(%s::text[]) WITH ORDINALITY AS g(geojson, position), "
+    "LATERAL arches_search_geometry_pieces(g.geojson, %s) AS piece"
+)
+
 
 class GeoJSONFeatureCollectionIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype = DataTypeFactory().get_instance("geojson-feature-collection")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
-        feature_collection = tile.data.get(nodeid)
-        if not feature_collection:
+        return self.index_tiles([tile], node)
+
+    def _convert(self, geometries):
+        """(position, geometry) pieces for a list of GeoJSON geometry strings.
+
+        postgis parses the whole list in one query. Invalid geometries are
+        repaired and those it cannot parse are left out, and with
+        INDEX_GEOMETRY_MAX_VERTICES set each geometry is split into pieces of
+        at most that many vertices, so the GiST index holds small boxes
+        instead of whole parcels or coastlines.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _CONVERT_SQL, [geometries, settings.INDEX_GEOMETRY_MAX_VERTICES]
+            )
+            return [
+                (position - 1, GEOSGeometry(memoryview(bytes(ewkb))))
+                for position, ewkb in cursor.fetchall()
+            ]
+
+    def index_tiles(self, tiles, node):
+        nodeid = node.nodeid
+        feature_tiles = []
+        geometries = []
+        for tile in tiles:
+            feature_collection = tile.data.get(nodeid)
+            if not feature_collection:
+                continue
+            for feature in feature_collection.get("features", []):
+                geometry = feature.get("geometry")
+                if geometry is None:
+                    continue
+                feature_tiles.append(tile)
+                geometries.append(json.dumps(geometry))
+        if not geometries:
             return []
 
         search_items = []
-        for feature in feature_collection.get("features", []):
-            geometry = feature.get("geometry")
-            if geometry is None:
-                continue
-            try:
-                geom = GEOSGeometry(json.dumps(geometry), srid=4326)
-            except Exception:
-                continue
+        for position, geom in self._convert(geometries):
+            tile = feature_tiles[position]
             search_items.append(
                 GeometrySearch(
                     node_alias=node.alias,
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     geom=geom,
                 )
             )
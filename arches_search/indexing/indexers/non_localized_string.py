@@ -6,14 +6,16 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class NonLocalizedStringIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype = DataTypeFactory().get_instance("non-localized-string")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         document = {"strings": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        self.datatype.append_to_document(document, tile.data[nodeid], node.node, tile)
         search_items = []
         for string_object in document["strings"]:
             if string_object["string"] is not None:
@@ -22,7 +24,7 @@ class NonLocalizedStringIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=string_object["string"],
                 )
                 search_items.append(term_search)
@@ -6,15 +6,17 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class NumberIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.languages: dict[str, Language] = {}
         self.datatype = DataTypeFactory().get_instance("number")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         document = {"numbers": [], "strings": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        self.datatype.append_to_document(document, tile.data[nodeid], node.node, tile)
         search_items = []
         for number_object in document["numbers"]:
             if number_object["number"] is not None:
@@ -23,7 +25,7 @@ class NumberIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=number_object["number"],
                 )
                 search_items.append(numeric_search)
@@ -7,6 +7,8 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class ReferenceIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype: BaseDataType = DataTypeFactory().get_instance("reference")
@@ -18,10 +20,10 @@ class ReferenceIndexing(BaseIndexing):
                 self.languages[l_obj.code] = l_obj
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         self._set_languages()
         document = {"strings": [], "references": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        self.datatype.append_to_document(document, tile.data[nodeid], node.node, tile)
         search_items = []
         for string in document["strings"]:
             if string["string"] is not None:
@@ -30,7 +32,7 @@ class ReferenceIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     language=node.config.lang,
                     value=string["string"],
                 )
@@ -43,7 +45,7 @@ class ReferenceIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=reference["id"],
                 )
                 search_items.append(uuid_search)
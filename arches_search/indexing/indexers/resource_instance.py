@@ -1,8 +1,10 @@
-from django.contrib.postgres.search import SearchVector
+import uuid
+
 from arches.app.datatypes.datatypes import DataTypeFactory, BaseDataType
 from arches_search.models.models import TermSearch, UUIDSearch
 
 from arches_search.indexing.base import BaseIndexing
+from arches_search.indexing.resource_names import resource_names
 
 
 class ResourceInstanceIndexing(BaseIndexing):
@@ -12,32 +14,82 @@ class ResourceInstanceIndexing(BaseIndexing):
             "resource-instance"
         )
 
+    def _related_resources(self, tile, nodeid):
+        return [
+            item
+            for item in self.datatype.get_nodevalues(tile.data[nodeid])
+            if isinstance(item, dict)
+        ]
+
+    def _relationship(self, ontology_property):
+        try:
+            uuid.UUID(ontology_property)
+        except ValueError:
+            return ontology_property
+        return (
+            self.datatype.get_relationship_display_value(ontology_property)
+            or ontology_property
+        )
+
+    def prefetch(self, tiles, node):
+        nodeid = node.nodeid
+        resource_names.get_many(
+            item.get("resourceId")
+            for tile in tiles
+            for item in self._related_resources(tile, nodeid)
+        )
+
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
-        document = {"strings": [], "ids": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        return self.index_tiles([tile], node)
+
+    def index_tiles(self, tiles, node):
+        # related resource names are resolved for the whole batch at once;
+        # a resourceName stored in the tile still takes precedence
+        nodeid = node.nodeid
+        related_by_tile = [self._related_resources(tile, nodeid) for tile in tiles]
+        names = resource_names.get_many(
+            item.get("resourceId")
+            for related in related_by_tile
+            for item in related
+            if not item.get("resourceName")
+        )
+
         search_items = []
-        for string in document["strings"]:
-            if string["string"] is not None:
-                string_search = TermSearch(
-                    node_alias=node.alias,
-                    tileid_id=tile.tileid,
-                    resourceinstanceid_id=tile.resourceinstance_id,
-                    datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    value=string["string"],
-                )
-                search_items.append(string_search)
-
-        for related_resource_id in document["ids"]:
-            if related_resource_id["id"] is not None:
-                uuid_search = UUIDSearch(
-                    node_alias=node.alias,
-                    tileid_id=tile.tileid,
-                    resourceinstanceid_id=tile.resourceinstance_id,
-                    datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
-                    value=related_resource_id["id"],
-                )
-                search_items.append(uuid_search)
+        for tile, related in zip(tiles, related_by_tile):
+            for item in related:
+                strings = []
+                if item.get("resourceName"):
+                    strings.append(("", item["resourceName"]))
+                else:
+                    strings.extend(names.get(str(item.get("resourceId")), ()))
+                for ontology_property in (
+                    item.get("ontologyProperty", ""),
+                    item.get("inverseOntologyProperty", ""),
+                ):
+                    if ontology_property:
+                        strings.append(("", self._relationship(ontology_property)))
+
+                for language, string in strings:
+                    if string is not None:
+                        string_search = TermSearch(
+                            node_alias=node.alias,
+                            tileid_id=tile.tileid,
+                            resourceinstanceid_id=tile.resourceinstance_id,
+                            datatype=self.datatype.datatype_name,
+                            language=language,
+                            graph_slug=node.graph_slug,
+                            value=string,
+                        )
+                        search_items.append(string_search)
+
+                if item.get("resourceId") is not None:
+                    uuid_search = UUIDSearch(
+                        node_alias=node.alias,
+                        tileid_id=tile.tileid,
+                        resourceinstanceid_id=tile.resourceinstance_id,
+                        datatype=self.datatype.datatype_name,
+                        graph_slug=node.graph_slug,
+                        value=item["resourceId"],
+                    )
+                    search_items.append(uuid_search)
         return search_items
@@ -7,14 +7,16 @@ import sys
 
 
 class StringIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype = DataTypeFactory().get_instance("string")
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         document = {"strings": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        self.datatype.append_to_document(document, tile.data[nodeid], node.node, tile)
         search_items = []
         for string_object in document["strings"]:
             if string_object["string"] not in (None, ""):
@@ -24,7 +26,7 @@ class StringIndexing(BaseIndexing):
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
                     language=string_object["language"],
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=string_object["string"],
                 )
                 search_items.append(term_search)
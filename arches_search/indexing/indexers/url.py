@@ -6,6 +6,8 @@ from arches_search.indexing.base import BaseIndexing
 
 
 class URLIndexing(BaseIndexing):
+    reads_tile_only = True
+
     def __init__(self):
         super().__init__()
         self.datatype: BaseDataType = DataTypeFactory().get_instance("url")
@@ -17,10 +19,10 @@ class URLIndexing(BaseIndexing):
                 self.languages[l_obj.code] = l_obj
 
     def index(self, tile, node):
-        nodeid = str(node.nodeid)
+        nodeid = node.nodeid
         self._set_languages()
         document = {"strings": []}
-        self.datatype.append_to_document(document, tile.data[nodeid], node, tile)
+        self.datatype.append_to_document(document, tile.data[nodeid], node.node, tile)
         search_items = []
         for string in document["strings"]:
             if string["string"] is not None:
@@ -29,7 +31,7 @@ class URLIndexing(BaseIndexing):
                     tileid_id=tile.tileid,
                     resourceinstanceid_id=tile.resourceinstance_id,
                     datatype=self.datatype.datatype_name,
-                    graph_slug=node.graph.slug,
+                    graph_slug=node.graph_slug,
                     value=string["string"],
                 )
                 search_items.append(string_search)
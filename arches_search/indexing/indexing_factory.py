@@ -1,30 +1,105 @@
-import importlib
-import inspect
-import sys
+import threading
+from importlib.metadata import entry_points
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
 from arches_search.indexing.base import BaseIndexing
-from pathlib import Path
+
+INDEXER_ENTRY_POINT_GROUP = "arches_search.indexers"
+
+BUILTIN_INDEXERS = {
+    "boolean": "arches_search.indexing.indexers.boolean.BooleanIndexing",
+    "concept": "arches_search.indexing.indexers.concept.ConceptIndexing",
+    "concept-list": "arches_search.indexing.indexers.concept_list.ConceptListIndexing",
+    "date": "arches_search.indexing.indexers.date.DateIndexing",
+    "edtf": "arches_search.indexing.indexers.edtf.EDTFIndexing",
+    "file-list": "arches_search.indexing.indexers.file_list.FileListIndexing",
+    "geojson-feature-collection": (
+        "arches_search.indexing.indexers.geojson_feature_collection."
+        "GeoJSONFeatureCollectionIndexing"
+    ),
+    "non-localized-string": (
+        "arches_search.indexing.indexers.non_localized_string."
+        "NonLocalizedStringIndexing"
+    ),
+    "number": "arches_search.indexing.indexers.number.NumberIndexing",
+    "reference": "arches_search.indexing.indexers.reference.ReferenceIndexing",
+    "resource-instance": (
+        "arches_search.indexing.indexers.resource_instance.ResourceInstanceIndexing"
+    ),
+    "resource-instance-list": (
+        "arches_search.indexing.indexers.resource_instance_list."
+        "ResourceInstanceListIndexing"
+    ),
+    "string": "arches_search.indexing.indexers.string.StringIndexing",
+    "url": "arches_search.indexing.indexers.url.URLIndexing",
+}
+
+_lock = threading.Lock()
+_indexer_paths: dict[str, str] | None = None
+_indexers: dict[str, BaseIndexing | None] = {}
+
+
+def _load_indexer_paths():
+    """Datatype name -> indexer class path.
+
+    Built-in indexers are overridden by entry points in the
+    "arches_search.indexers" group (name: datatype, value: "module:Class"),
+    which are in turn overridden by the SEARCH_INDEXERS setting.
+    """
+    paths = dict(BUILTIN_INDEXERS)
+    for entry_point in entry_points(group=INDEXER_ENTRY_POINT_GROUP):
+        paths[entry_point.name] = entry_point.value.replace(":", ".")
+    paths.update(getattr(settings, "SEARCH_INDEXERS", {}))
+    return paths
+
+
+def reset_indexers():
+    global _indexer_paths
+    with _lock:
+        _indexer_paths = None
+        _indexers.clear()
+
+
+def _reset_on_setting_change(setting, **kwargs):
+    if setting == "SEARCH_INDEXERS":
+        reset_indexers()
+
+
+setting_changed.connect(_reset_on_setting_change)
+
+
+def uses_builtin_indexer(datatype):
+    """Whether `datatype` is indexed by its built-in indexer (not overridden)."""
+    global _indexer_paths
+    with _lock:
+        if _indexer_paths is None:
+            _indexer_paths = _load_indexer_paths()
+        return _indexer_paths.get(datatype) == BUILTIN_INDEXERS.get(datatype)
 
 
 class IndexingFactory:
-    registry: dict[str, BaseIndexing] = {}
-
-    def __init__(self):
-        modules = (Path(__file__).parent / "indexers").glob("*.py")
-        for module in modules:
-            if module.name == "__init__.py":
-                continue
-            module_name = "arches_search.indexing.indexers.{}".format(module.stem)
-            spec = importlib.util.spec_from_file_location(module_name, str(module))
-            py_module = importlib.util.module_from_spec(spec)
-
-            sys.modules[module_name] = py_module
-            spec.loader.exec_module(py_module)
-
-            for name in dir(py_module):
-                obj = getattr(py_module, name)
-                if inspect.isclass(obj) and obj.__module__ == module_name:
-                    indexer = obj()
-                    self.registry[indexer.datatype.datatype_name] = indexer
+    """Looks indexers up in a process-wide registry.
+
+    Indexer classes are imported and instantiated the first time their
+    datatype is asked for and shared from then on, so constructing a factory
+    costs nothing.
+    """
+
+    def get_indexer(self, datatype: str) -> BaseIndexing | None:
+        try:
+            return _indexers[datatype]
+        except KeyError:
+            pass
+        global _indexer_paths
+        with _lock:
+            if datatype not in _indexers:
+                if _indexer_paths is None:
+                    _indexer_paths = _load_indexer_paths()
+                path = _indexer_paths.get(datatype)
+                _indexers[datatype] = import_string(path)() if path else None
+            return _indexers[datatype]
 
     def get_indexing_class(self, datatype: str) -> BaseIndexing:
-        return self.registry.get(datatype, BaseIndexing())
+        return self.get_indexer(datatype) or BaseIndexing()
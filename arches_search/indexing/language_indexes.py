@@ -0,0 +1,126 @@
+import hashlib
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_migrate
+
+# TermSearch.search_vector is indexed by one partial GIN index per language in
+# settings.LANGUAGES, plus one for rows without a language, rather than one
+# index over every row, so a full-text probe for the active language only scans
+# those entries. The set of languages is deployment specific, so the indexes
+# are kept in step after each migrate instead of being declared on the model.
+
+INDEX_PREFIX = "term_fts_"
+
+
+def language_index_name(language_code):
+    # "" is the language of concept, number, url and non-localized rows
+    return INDEX_PREFIX + (re.sub(r"[^a-z0-9]", "_", language_code.lower()) or "none")
+
+
+def configured_language_codes():
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def _create_partitioned_index(cursor, table, name, language_code):
+    # postgres cannot build an index on a partitioned table CONCURRENTLY:
+    # create it on the parent alone, build each partition's concurrently and
+    # attach it; the parent's index is valid once every partition's is
+    from arches_search.indexing.partitions import partitions
+
+    qn = connection.ops.quote_name
+    definition = "USING gin (search_vector) WHERE language = %s"
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(name)} ON ONLY {qn(table)} {definition}",
+        [language_code],
+    )
+    for partition in partitions(cursor, table):
+        digest = hashlib.md5(partition.encode()).hexdigest()[:8]
+        partition_index = f"{name}_{digest}"
+        cursor.execute(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)",
+            [partition_index],
+        )
+        row = cursor.fetchone()
+        if row is not None and not row[0]:
+            cursor.execute(f"DROP INDEX CONCURRENTLY {qn(partition_index)}")
+        cursor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {qn(partition_index)} "
+            f"ON {qn(partition)} {definition}",
+            [language_code],
+        )
+        cursor.execute(f"ALTER INDEX {qn(name)} ATTACH PARTITION {qn(partition_index)}")
+
+
+def sync_language_indexes(language_codes=None):
+    """Create the missing per-language indexes and drop those of removed
+    languages. Returns the (created, dropped) index names.
+
+    Outside a transaction the indexes are built CONCURRENTLY, so writes to
+    TermSearch carry on meanwhile; on a partitioned TermSearch that is done
+    partition by partition. A concurrent build that failed leaves an invalid
+    index behind; it is built again. Indexes of a partitioned TermSearch can
+    only be dropped with a plain DROP INDEX, which is a catalog change.
+    """
+    from arches_search.indexing.partitions import is_partitioned
+    from arches_search.models.models import TermSearch
+
+    table = TermSearch._meta.db_table
+    qn = connection.ops.quote_name
+    wanted = {
+        language_index_name(code): code
+        for code in [*(language_codes or configured_language_codes()), ""]
+    }
+    with connection.cursor() as cursor:
+        partitioned = is_partitioned(cursor, table)
+        concurrently = not connection.in_atomic_block
+        drop = (
+            "DROP INDEX CONCURRENTLY"
+            if concurrently and not partitioned
+            else "DROP INDEX"
+        )
+        cursor.execute(
+            "SELECT c.relname, i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE i.indrelid = %s::regclass AND c.relname LIKE %s",
+            [table, INDEX_PREFIX.replace("_", r"\_") + "%"],
+        )
+        existing = dict(cursor.fetchall())
+        valid = {name for name, is_valid in existing.items() if is_valid}
+        created = sorted(set(wanted) - valid)
+        dropped = sorted(set(existing) - set(wanted))
+        rebuilt = [name for name in created if name in existing]
+        if concurrently and partitioned:
+            # the attaching below completes a partitioned index left invalid
+            rebuilt = []
+        for name in dropped + rebuilt:
+            cursor.execute(f"{drop} IF EXISTS {qn(name)}")
+        for name in created:
+            if concurrently and partitioned:
+                _create_partitioned_index(cursor, table, name, wanted[name])
+                continue
+            cursor.execute(
+                f"CREATE INDEX{' CONCURRENTLY' if concurrently else ''} "
+                f"IF NOT EXISTS {qn(name)} "
+                f"ON {qn(table)} USING gin (search_vector) WHERE language = %s",
+                [wanted[name]],
+            )
+    return created, dropped
+
+
+def _sync_after_migrate(sender, using, **kwargs):
+    if using != connection.alias:
+        return
+    from arches_search.models.models import TermSearch
+
+    if TermSearch._meta.db_table in connection.introspection.table_names():
+        sync_language_indexes()
+
+
+def connect_language_index_sync(app_config):
+    post_migrate.connect(
+        _sync_after_migrate,
+        sender=app_config,
+        dispatch_uid="arches_search_language_indexes",
+    )
@@ -0,0 +1,85 @@
+from django.db.models.signals import pre_save
+from arches_search.models.models import SearchNodeKey
+
+
+def node_keys(triples):
+    """{(graph_slug, node_alias, datatype): SearchNodeKey id} for the triples.
+
+    Triples not in the dictionary yet are added to it. Keys are never changed
+    or deleted, so they can be cached for as long as the nodes they were
+    resolved for.
+    """
+    triples = set(triples)
+    if not triples:
+        return {}
+
+    def lookup():
+        return {
+            (graph_slug, node_alias, datatype): key
+            for graph_slug, node_alias, datatype, key in SearchNodeKey.objects.filter(
+                graph_slug__in={triple[0] for triple in triples},
+                node_alias__in={triple[1] for triple in triples},
+            ).values_list("graph_slug", "node_alias", "datatype", "id")
+            if (graph_slug, node_alias, datatype) in triples
+        }
+
+    keys = lookup()
+    if len(keys) < len(triples):
+        SearchNodeKey.objects.bulk_create(
+            [
+                SearchNodeKey(
+                    graph_slug=graph_slug, node_alias=node_alias, datatype=datatype
+                )
+                for graph_slug, node_alias, datatype in triples - keys.keys()
+            ],
+            ignore_conflicts=True,
+        )
+        keys = lookup()
+    return keys
+
+
+def node_key(graph_slug, node_alias, datatype):
+    return node_keys([(graph_slug, node_alias, datatype)])[
+        (graph_slug, node_alias, datatype)
+    ]
+
+
+def keys_for_aliases(pairs):
+    """{(graph_slug, node_alias): [ids]} for every datatype a node was indexed as.
+
+    Pairs that were never indexed are missing from the result.
+    """
+    pairs = set(pairs)
+    keys = {}
+    if not pairs:
+        return keys
+    for graph_slug, node_alias, key in SearchNodeKey.objects.filter(
+        graph_slug__in={pair[0] for pair in pairs},
+        node_alias__in={pair[1] for pair in pairs},
+    ).values_list("graph_slug", "node_alias", "id"):
+        if (graph_slug, node_alias) in pairs:
+            keys.setdefault((graph_slug, node_alias), []).append(key)
+    return keys
+
+
+def _assign_node_key(sender, instance, **kwargs):
+    if instance.node_key is None:
+        instance.node_key = node_key(
+            instance.graph_slug, instance.node_alias, instance.datatype
+        )
+
+
+def connect_node_key_assignment():
+    """Key search rows saved one at a time without a node_key.
+
+    Indexed rows get their key from the IndexPlan; this covers rows created
+    directly, which do not go through bulk_create.
+    """
+    from arches_search.indexing.index_from_tile import SEARCH_MODELS
+
+    for model in SEARCH_MODELS:
+        pre_save.connect(
+            _assign_node_key,
+            sender=model,
+            dispatch_uid=f"arches_search_node_key_{model.__name__}",
+        )
@@ -0,0 +1,219 @@
+import hashlib
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from arches.app.models.models import GraphModel, GraphXPublishedGraph
+
+# Search tables can be list-partitioned on graph_slug (SEARCH_PARTITION_BY_GRAPH):
+# one partition per resource model plus a default partition for rows of any
+# other slug. Queries that filter graph_slug are pruned to one partition and a
+# graph's rows can be dropped with TRUNCATE.
+
+PARTITION_KEY = "graph_slug"
+
+# "CREATE [UNIQUE] INDEX <name> ON [ONLY] <table> <rest>"
+_INDEX_DEF = re.compile(r"^(CREATE (?:UNIQUE )?INDEX) \S+ ON (?:ONLY )?\S+ (.*)$")
+
+# how long attaching a partition waits for its locks rather than queueing
+# searches of the default partition behind it
+PARTITION_LOCK_TIMEOUT = "5s"
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def partition_name(table, graph_slug):
+    # slugs can be long or contain anything, so name partitions by digest
+    return f"{table}_{hashlib.md5(graph_slug.encode()).hexdigest()[:12]}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def partitioned_graph_slugs():
+    """Slugs of the resource models that get a partition of their own."""
+    return list(
+        GraphModel.objects.filter(isresource=True, source_identifier__isnull=True)
+        .exclude(pk=settings.SYSTEM_SETTINGS_RESOURCE_MODEL_ID)
+        .exclude(slug__isnull=True)
+        .values_list("slug", flat=True)
+        .distinct()
+    )
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [table])
+    return cursor.fetchone()[0] == "p"
+
+
+def partitions(cursor, table):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass",
+        [table],
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def create_partitions(cursor, table, graph_slugs):
+    """Give a table partitioned by graph_slug a default partition and one per slug."""
+    cursor.execute(
+        f"CREATE TABLE {_qn(default_partition_name(table))} "
+        f"PARTITION OF {_qn(table)} DEFAULT"
+    )
+    for graph_slug in graph_slugs:
+        cursor.execute(
+            f"CREATE TABLE {_qn(partition_name(table, graph_slug))} "
+            f"PARTITION OF {_qn(table)} FOR VALUES IN ({_literal(graph_slug)})"
+        )
+
+
+def rename_partitions(cursor, table, old_prefix, new_prefix):
+    for name in partitions(cursor, table):
+        if name.startswith(old_prefix):
+            cursor.execute(
+                f"ALTER TABLE {_qn(name)} RENAME TO "
+                f"{_qn(new_prefix + name.removeprefix(old_prefix))}"
+            )
+
+
+def _copy_parent_indexes(cursor, table, partition):
+    """Give a table about to become a partition the parent's keys and indexes,
+    so attaching it only links them instead of building them."""
+    cursor.execute(
+        "SELECT pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u')",
+        [table],
+    )
+    for (definition,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {_qn(partition)} ADD {definition}")
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "WHERE i.indrelid = %s::regclass AND NOT EXISTS ("
+        "  SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid"
+        ")",
+        [table],
+    )
+    for (definition,) in cursor.fetchall():
+        match = _INDEX_DEF.match(definition)
+        # unnamed, so postgres picks a name unique to the partition
+        cursor.execute(f"{match.group(1)} ON {_qn(partition)} {match.group(2)}")
+
+
+def _attach_graph_partition(cursor, model, graph_slug):
+    """Build the slug's partition beside the table, then attach it.
+
+    The partition is created as a plain table with a CHECK constraint on its
+    slug, filled with the slug's rows from the default partition (postgres
+    refuses the new partition while the default one holds rows that belong in
+    it) and given the parent's indexes. ATTACH PARTITION then takes SHARE
+    UPDATE EXCLUSIVE on the partitioned table, but ACCESS EXCLUSIVE on the
+    default partition, which it scans for rows of the slug, until commit:
+    searches that are not pruned to another graph's partition wait for that
+    scan. The CHECK constraint spares the new table a scan and the prebuilt
+    indexes are only linked, so the wait is the scan of the default
+    partition, which holds just the rows of graphs without a partition.
+    """
+    table = model._meta.db_table
+    default = default_partition_name(table)
+    name = partition_name(table, graph_slug)
+    columns = ", ".join(
+        _qn(field.column)
+        for field in model._meta.concrete_fields
+        if not field.generated
+    )
+    cursor.execute(f"SET LOCAL lock_timeout = {_literal(PARTITION_LOCK_TIMEOUT)}")
+    cursor.execute(
+        f"CREATE TABLE {_qn(name)} (LIKE {_qn(table)} "
+        "INCLUDING GENERATED INCLUDING CONSTRAINTS)"
+    )
+    cursor.execute(
+        f"ALTER TABLE {_qn(name)} ADD CONSTRAINT {_qn(name + '_slug')} "
+        f"CHECK ({PARTITION_KEY} IS NOT NULL AND {PARTITION_KEY} = "
+        f"{_literal(graph_slug)})"
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {_qn(default)} WHERE {PARTITION_KEY} = %s "
+        f"RETURNING {columns}) "
+        f"INSERT INTO {_qn(name)} ({columns}) SELECT {columns} FROM moved",
+        [graph_slug],
+    )
+    _copy_parent_indexes(cursor, table, name)
+    cursor.execute(
+        f"ALTER TABLE {_qn(table)} ATTACH PARTITION {_qn(name)} "
+        f"FOR VALUES IN ({_literal(graph_slug)})"
+    )
+
+
+def ensure_graph_partitions(graph_slug, models=None):
+    """Add the graph's partition to every partitioned search table missing one.
+
+    Each table's partition is attached in a transaction of its own, so a
+    table whose locks are not granted within PARTITION_LOCK_TIMEOUT raises
+    without holding up the others' searches; its rows stay in the default
+    partition until this is run again.
+    """
+    from arches_search.indexing.index_from_tile import SEARCH_MODELS
+
+    created = []
+    for model in models or SEARCH_MODELS:
+        table = model._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not is_partitioned(cursor, table):
+                continue
+            if partition_name(table, graph_slug) in partitions(cursor, table):
+                continue
+            _attach_graph_partition(cursor, model, graph_slug)
+        created.append(model)
+    return created
+
+
+def truncate_graph_partitions(graph_slug, models=None):
+    """TRUNCATE the graph's partitions; False unless every table has one."""
+    from arches_search.indexing.index_from_tile import SEARCH_MODELS
+
+    models = models or SEARCH_MODELS
+    with connection.cursor() as cursor:
+        names = []
+        for model in models:
+            table = model._meta.db_table
+            name = partition_name(table, graph_slug)
+            if not is_partitioned(cursor, table) or name not in partitions(
+                cursor, table
+            ):
+                return False
+            names.append(name)
+        cursor.execute(f"TRUNCATE {', '.join(_qn(name) for name in names)}")
+    return True
+
+
+def _schedule_graph_partitions(graph_slug):
+    from arches_search.tasks import create_search_graph_partitions, delay_or_run
+
+    delay_or_run(create_search_graph_partitions, graph_slug)
+
+
+def _partition_published_graph(sender, instance, created, **kwargs):
+    graph = instance.graph
+    if not created or not graph.isresource or not graph.slug:
+        return
+    if str(graph.pk) == str(settings.SYSTEM_SETTINGS_RESOURCE_MODEL_ID):
+        return
+    # after the publication commits, so a failure cannot undo the publish
+    transaction.on_commit(lambda: _schedule_graph_partitions(graph.slug))
+
+
+def connect_graph_partitioning():
+    post_save.connect(
+        _partition_published_graph,
+        sender=GraphXPublishedGraph,
+        dispatch_uid="arches_search_graph_partitions",
+    )
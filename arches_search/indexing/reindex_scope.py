@@ -0,0 +1,95 @@
+from django.db.models import Q
+from arches.app.models.models import EditLog
+
+
+def edited_since(since):
+    """Tile and resource ids with edit log entries (saves or deletes) since `since`."""
+    edits = EditLog.objects.filter(timestamp__gte=since)
+    tileids = {
+        tileid for tileid in edits.values_list("tileinstanceid", flat=True) if tileid
+    }
+    resourceids = {
+        resourceid
+        for resourceid in edits.values_list("resourceinstanceid", flat=True)
+        if resourceid
+    }
+    return tileids, resourceids
+
+
+class ReindexScope:
+    """The slice of tiles, and of their search rows, that a scoped reindex rebuilds.
+
+    Every given criterion must match. Search rows are selected through their
+    tile or resource rather than their graph_slug/node_alias columns so rows
+    written before a slug or alias change are purged too.
+    """
+
+    def __init__(
+        self, graph_slug=None, nodegroup_id=None, resourceids=None, since=None
+    ):
+        self.graph_slug = graph_slug
+        self.nodegroup_id = nodegroup_id
+        self.resourceids = resourceids
+        self.since = since
+        self._edited = None
+
+    def __bool__(self):
+        return any(
+            criterion is not None
+            for criterion in (
+                self.graph_slug,
+                self.nodegroup_id,
+                self.resourceids,
+                self.since,
+            )
+        )
+
+    def __str__(self):
+        parts = []
+        if self.graph_slug is not None:
+            parts.append(f"graph {self.graph_slug}")
+        if self.nodegroup_id is not None:
+            parts.append(f"nodegroup {self.nodegroup_id}")
+        if self.resourceids is not None:
+            parts.append(f"{len(self.resourceids)} resource(s)")
+        if self.since is not None:
+            parts.append(f"tiles edited since {self.since.isoformat()}")
+        return ", ".join(parts) or "all tiles"
+
+    def is_graph_only(self):
+        return self.graph_slug is not None and not any(
+            criterion is not None
+            for criterion in (self.nodegroup_id, self.resourceids, self.since)
+        )
+
+    def _edited_since(self):
+        if self._edited is None:
+            self._edited = edited_since(self.since)
+        return self._edited
+
+    def tile_filter(self):
+        scope = Q()
+        if self.graph_slug is not None:
+            scope &= Q(resourceinstance__graph__slug=self.graph_slug)
+        if self.nodegroup_id is not None:
+            scope &= Q(nodegroup_id=self.nodegroup_id)
+        if self.resourceids is not None:
+            scope &= Q(resourceinstance_id__in=self.resourceids)
+        if self.since is not None:
+            tileids, resourceids = self._edited_since()
+            scope &= Q(tileid__in=tileids) | Q(resourceinstance_id__in=resourceids)
+        return scope
+
+    def row_filter(self):
+        scope = Q()
+        if self.graph_slug is not None:
+            scope &= Q(resourceinstanceid__graph__slug=self.graph_slug)
+        if self.nodegroup_id is not None:
+            scope &= Q(tileid__nodegroup_id=self.nodegroup_id)
+        if self.resourceids is not None:
+            scope &= Q(resourceinstanceid__in=self.resourceids)
+        if self.since is not None:
+            # ids rather than joins: deleted tiles and resources must match too
+            tileids, resourceids = self._edited_since()
+            scope &= Q(tileid__in=tileids) | Q(resourceinstanceid__in=resourceids)
+        return scope
@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from arches.app.models.models import ResourceInstance
+
+
+def names_by_language(descriptors, name):
+    """(language, name) pairs for a resource, from its descriptors or i18n name."""
+    names = []
+    if isinstance(descriptors, dict):
+        for language, descriptor in descriptors.items():
+            if isinstance(descriptor, dict):
+                candidate = descriptor.get("name")
+                if isinstance(candidate, str) and candidate.strip():
+                    names.append((language, candidate.strip()))
+    if not names and isinstance(name, dict):
+        for language, candidate in name.items():
+            if isinstance(candidate, str) and candidate.strip():
+                names.append((language, candidate.strip()))
+    return tuple(names)
+
+
+class ResourceNameCache:
+    """Bounded LRU of resource id -> ((language, name), ...) for indexing.
+
+    Misses are resolved together with one resourceinstanceid__in query, so
+    indexers should ask for all the ids of a batch of tiles at once. Names
+    are only kept while a reindex run is active (caching()); elsewhere, such
+    as post_save in web and celery processes, every call reads the current
+    names, so a rename is never indexed with the old name by another process.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._names = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def activate(self):
+        with self._lock:
+            self._active += 1
+
+    def deactivate(self):
+        with self._lock:
+            self._active -= 1
+            if not self._active:
+                self._names.clear()
+
+    @contextmanager
+    def caching(self):
+        """Keep names for the duration of a reindex run."""
+        self.activate()
+        try:
+            yield self
+        finally:
+            self.deactivate()
+
+    def _get_maxsize(self):
+        if self.maxsize is None:
+            return settings.INDEX_RESOURCE_NAME_CACHE_SIZE
+        return self.maxsize
+
+    def get_many(self, resourceids):
+        resourceids = {str(resourceid) for resourceid in resourceids if resourceid}
+        found = {}
+        with self._lock:
+            active = self._active > 0
+            for resourceid in resourceids if active else ():
+                if resourceid in self._names:
+                    self._names.move_to_end(resourceid)
+                    found[resourceid] = self._names[resourceid]
+        missing = resourceids - found.keys()
+        if not missing:
+            return found
+
+        loaded = {resourceid: () for resourceid in missing}
+        for resourceid, descriptors, name in ResourceInstance.objects.filter(
+            resourceinstanceid__in=missing
+        ).values_list("resourceinstanceid", "descriptors", "name"):
+            loaded[str(resourceid)] = names_by_language(descriptors, name)
+
+        if not active:
+            return loaded
+        maxsize = self._get_maxsize()
+        with self._lock:
+            self._names.update(loaded)
+            while len(self._names) > maxsize:
+                self._names.popitem(last=False)
+        found.update(loaded)
+        return found
+
+    def forget(self, resourceids):
+        with self._lock:
+            for resourceid in resourceids:
+                self._names.pop(str(resourceid), None)
+
+    def clear(self):
+        with self._lock:
+            self._names.clear()
+
+
+resource_names = ResourceNameCache()
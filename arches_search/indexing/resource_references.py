@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_init, post_save
+from arches.app.models.models import ResourceInstance, TileModel
+from arches_search.indexing.index_from_tile import index_from_tiles
+from arches_search.indexing.resource_names import names_by_language, resource_names
+from arches_search.indexing.tile_records import tile_records
+from arches_search.models.models import TermSearch, UUIDSearch
+
+RESOURCE_INSTANCE_DATATYPES = ("resource-instance", "resource-instance-list")
+
+
+def _referencing_rows(resourceid):
+    return UUIDSearch.objects.filter(
+        value=resourceid, datatype__in=RESOURCE_INSTANCE_DATATYPES
+    )
+
+
+def is_referenced(resourceid):
+    return _referencing_rows(resourceid).exists()
+
+
+def _stale_tileids(resourceid, names):
+    """Tiles whose rows for the node that references the resource lack its
+    current name.
+
+    A node that references several resources is always refreshed, as its name
+    rows cannot be told apart.
+    """
+    references = set(
+        _referencing_rows(resourceid).values_list("tileid", "node_key").distinct()
+    )
+    tileids = {tileid for tileid, _ in references}
+    if not names:
+        return tileids
+    shared = set(
+        UUIDSearch.objects.filter(
+            tileid__in=tileids, datatype__in=RESOURCE_INSTANCE_DATATYPES
+        )
+        .values("tileid", "node_key")
+        .annotate(references=Count("id"))
+        .filter(references__gt=1)
+        .values_list("tileid", "node_key")
+    )
+    named = set(
+        TermSearch.objects.filter(
+            tileid__in=tileids,
+            datatype__in=RESOURCE_INSTANCE_DATATYPES,
+            value__in=[name for _, name in names],
+        ).values_list("tileid", "node_key")
+    )
+    up_to_date = (references & named) - shared
+    return {tileid for tileid, node_key in references - up_to_date}
+
+
+def reindex_resource_references(resourceid, batch_size=None):
+    """Refresh the related-resource name rows of tiles that point at a resource.
+
+    Referencing tiles are found through their resource-instance UUIDSearch
+    rows. Only tiles that lack a row with the resource's current name are
+    touched, and only their resource-instance TermSearch rows are rewritten,
+    in transactions of `batch_size` tiles. Returns the number of tiles
+    refreshed.
+    """
+    if batch_size is None:
+        batch_size = settings.SEARCH_INDEX_QUEUE_BATCH_SIZE
+    resource_names.forget([resourceid])
+    names = resource_names.get_many([resourceid]).get(str(resourceid), ())
+    tileids = list(_stale_tileids(resourceid, names))
+
+    nodegroup_cache = {}
+    for start in range(0, len(tileids), batch_size):
+        batch = tileids[start : start + batch_size]
+        with transaction.atomic():
+            TermSearch.objects.filter(
+                tileid__in=batch, datatype__in=RESOURCE_INSTANCE_DATATYPES
+            ).delete()
+            grouped = index_from_tiles(
+                tile_records(TileModel.objects.filter(tileid__in=batch)),
+                delete_existing=False,
+                nodegroup_cache=nodegroup_cache,
+                datatypes=RESOURCE_INSTANCE_DATATYPES,
+            )
+            TermSearch.objects.bulk_create(grouped[TermSearch])
+    return len(tileids)
+
+
+def _schedule_reindex(resourceid):
+    from arches_search.tasks import delay_or_run, reindex_search_resource_references
+
+    delay_or_run(reindex_search_resource_references, str(resourceid))
+
+
+def _current_names(instance):
+    return names_by_language(instance.descriptors, instance.name)
+
+
+def remember_resource_names(sender, instance, **kwargs):
+    # snapshot the names as loaded; deferred fields are left unloaded
+    if "descriptors" in instance.__dict__ and "name" in instance.__dict__:
+        instance._search_indexed_names = _current_names(instance)
+
+
+def schedule_resource_references_reindex(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    # arches saves a resource (the Resource proxy) whenever its descriptors
+    # are recomputed; only saves that change its names can need a cascade
+    if created:
+        return
+    if update_fields is not None and not {"descriptors", "name"} & set(update_fields):
+        return
+    names = _current_names(instance)
+    if getattr(instance, "_search_indexed_names", None) == names:
+        return
+    instance._search_indexed_names = names
+    resourceid = instance.resourceinstanceid
+    if is_referenced(resourceid):
+        transaction.on_commit(lambda: _schedule_reindex(resourceid))
+
+
+def connect_resource_rename_cascade():
+    from arches.app.models.resource import Resource
+
+    for sender in (ResourceInstance, Resource):
+        post_init.connect(
+            remember_resource_names,
+            sender=sender,
+            dispatch_uid=f"arches_search_resource_names_{sender.__name__}",
+        )
+        post_save.connect(
+            schedule_resource_references_reindex,
+            sender=sender,
+            dispatch_uid=f"arches_search_resource_rename_cascade_{sender.__name__}",
+        )
@@ -0,0 +1,226 @@
+from django.conf import settings
+from django.db import connection
+from arches.app.models.models import Node
+from arches_search.indexing.indexing_factory import (
+    IndexingFactory,
+    uses_builtin_indexer,
+)
+from arches_search.indexing.index_plan import IndexPlanEntry
+from arches_search.indexing.iso_dates import ISO_DATE_PATTERN
+from arches_search.indexing.node_keys import node_keys
+from arches_search.indexing.tile_records import tile_records
+from arches_search.models.models import (
+    BooleanSearch,
+    DateSearch,
+    NumericSearch,
+    TermSearch,
+)
+
+# Datatypes whose search rows are plain functions of the node's JSON value, so
+# a full reindex can build them with one INSERT ... SELECT per node instead of
+# reading every tile into python.
+SET_BASED_DATATYPES = (
+    "boolean",
+    "date",
+    "non-localized-string",
+    "number",
+    "string",
+    "url",
+)
+
+# Numbers saved as strings are accepted by the python indexer (DecimalField
+# parses them), so they are indexed here too.
+_NUMERIC_STRING = r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$"
+
+_ISO_DATE_MATCH = "CROSS JOIN LATERAL (SELECT regexp_match(n.v #>> '{}', %s) AS m) AS d"
+_ISO_DATE_VALID = (
+    "jsonb_typeof(n.v) = 'string' AND d.m IS NOT NULL "
+    "AND coalesce(d.m[2]::int, 1) BETWEEN 1 AND 12 "
+    "AND coalesce(d.m[3]::int, 1) BETWEEN 1 AND 31"
+)
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+class _Extraction:
+    """How one datatype's search rows are selected from a node's JSON value `n.v`.
+
+    `params` fill the placeholders of `joins`, then of `where`.
+    """
+
+    def __init__(self, model, value, where, joins="", params=(), language=None):
+        self.model = model
+        self.value = value
+        self.where = where
+        self.joins = joins
+        self.params = list(params)
+        self.language = language
+
+
+_EXTRACTIONS = {
+    "boolean": _Extraction(
+        BooleanSearch, "n.v::boolean", "jsonb_typeof(n.v) = 'boolean'"
+    ),
+    "number": _Extraction(
+        NumericSearch,
+        "(n.v #>> '{}')::numeric",
+        "(jsonb_typeof(n.v) = 'number' OR (jsonb_typeof(n.v) = 'string' "
+        "AND n.v #>> '{}' ~ %s))",
+        params=[_NUMERIC_STRING],
+    ),
+    "string": _Extraction(
+        TermSearch,
+        "s.entry ->> 'value'",
+        "coalesce(s.entry ->> 'value', '') <> ''",
+        joins="CROSS JOIN LATERAL jsonb_each(CASE WHEN jsonb_typeof(n.v) = "
+        "'object' THEN n.v END) AS s(language, entry)",
+        language="s.language",
+    ),
+    "non-localized-string": _Extraction(
+        TermSearch,
+        "n.v #>> '{}'",
+        "jsonb_typeof(n.v) IN ('string', 'number')",
+        language="''",
+    ),
+    "url": _Extraction(
+        TermSearch,
+        "u.value",
+        "jsonb_typeof(n.v) = 'object' AND n.v ->> 'url' IS NOT NULL "
+        "AND u.value IS NOT NULL",
+        joins="CROSS JOIN LATERAL (VALUES (n.v ->> 'url_label'), "
+        "(n.v ->> 'url')) AS u(value)",
+        language="''",
+    ),
+    "date": _Extraction(
+        DateSearch,
+        "d.m[1]::bigint * 10000 + coalesce(d.m[2]::int, 1) * 100 "
+        "+ coalesce(d.m[3]::int, 1)",
+        _ISO_DATE_VALID,
+        joins=_ISO_DATE_MATCH,
+        params=[f"^(?:{ISO_DATE_PATTERN})$"],
+    ),
+}
+
+
+def set_based_datatypes():
+    """SET_BASED_DATATYPES still handled by their built-in indexers.
+
+    A datatype whose indexer is overridden (SEARCH_INDEXERS or an entry point)
+    stays with its python indexer.
+    """
+    return [
+        datatype for datatype in SET_BASED_DATATYPES if uses_builtin_indexer(datatype)
+    ]
+
+
+def set_based_nodes(datatypes=None):
+    if datatypes is None:
+        datatypes = set_based_datatypes()
+    return (
+        Node.objects.filter(datatype__in=datatypes)
+        .exclude(graph_id=settings.SYSTEM_SETTINGS_RESOURCE_MODEL_ID)
+        .select_related("graph")
+    )
+
+
+def _node_tiles(tiles, node):
+    """SQL selecting the node's tiles from `tiles`, with the node value as n.v."""
+    sql, params = (
+        tiles.filter(nodegroup_id=node.nodegroup_id)
+        .values("tileid", "resourceinstance_id", "data")
+        .query.sql_with_params()
+    )
+    return (
+        f"FROM ({sql}) AS t " "CROSS JOIN LATERAL (SELECT t.tiledata -> %s AS v) AS n",
+        [*params, str(node.nodeid)],
+    )
+
+
+def _insert_statement(node, node_key, tiles):
+    extraction = _EXTRACTIONS[node.datatype]
+    columns = [
+        "tileid",
+        "resourceinstanceid",
+        "graph_slug",
+        "node_alias",
+        "datatype",
+        "node_key",
+    ]
+    values = ["t.tileid", "t.resourceinstanceid", "%s", "%s", "%s", "%s"]
+    if extraction.language is not None:
+        columns.append("language")
+        values.append(extraction.language)
+    columns.append("value")
+    values.append(extraction.value)
+
+    source, source_params = _node_tiles(tiles, node)
+    sql = (
+        f"INSERT INTO {_qn(extraction.model._meta.db_table)} "
+        f"({', '.join(_qn(column) for column in columns)}) "
+        f"SELECT {', '.join(values)} {source} {extraction.joins} "
+        f"WHERE {extraction.where}"
+    )
+    params = [
+        node.graph.slug,
+        node.alias,
+        node.datatype,
+        node_key,
+        *source_params,
+        *extraction.params,
+    ]
+    return extraction.model, sql, params
+
+
+def _residual_date_tiles(node, tiles):
+    """Tiles with a value for a date node that is not an ISO date, for EDTF parsing."""
+    source, source_params = _node_tiles(tiles, node)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT t.tileid {source} {_ISO_DATE_MATCH} "
+            f"WHERE jsonb_typeof(n.v) <> 'null' AND NOT ({_ISO_DATE_VALID})",
+            [*source_params, f"^(?:{ISO_DATE_PATTERN})$"],
+        )
+        tileids = [tileid for (tileid,) in cursor.fetchall()]
+    if not tileids:
+        return []
+    return list(tile_records(tiles.filter(tileid__in=tileids)))
+
+
+def index_with_sql(tiles, nodes=None, batch_size=None):
+    """Build the search rows of set-based nodes for `tiles` inside postgres.
+
+    `tiles` is a TileModel queryset; `nodes` defaults to set_based_nodes().
+    Date values that are not ISO 8601 are read back and indexed by the date
+    indexer. Returns the number of rows written per search model.
+    """
+    if nodes is None:
+        nodes = set_based_nodes()
+    nodes = list(nodes)
+    keys = node_keys((node.graph.slug, node.alias, node.datatype) for node in nodes)
+    written = {}
+    date_indexer = None
+    with connection.cursor() as cursor:
+        for node in nodes:
+            node_key = keys[(node.graph.slug, node.alias, node.datatype)]
+            model, sql, params = _insert_statement(node, node_key, tiles)
+            cursor.execute(sql, params)
+            written[model] = written.get(model, 0) + cursor.rowcount
+
+            if node.datatype == "date":
+                if date_indexer is None:
+                    date_indexer = IndexingFactory().get_indexer("date")
+                residual = _residual_date_tiles(node, tiles)
+                rows = (
+                    date_indexer.index_tiles(
+                        residual, IndexPlanEntry(node, date_indexer, node_key)
+                    )
+                    if residual
+                    else []
+                )
+                for row in rows:
+                    row.node_key = node_key
+                DateSearch.objects.bulk_create(rows, batch_size=batch_size)
+                written[DateSearch] = written.get(DateSearch, 0) + len(rows)
+    return written
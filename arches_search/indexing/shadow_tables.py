@@ -0,0 +1,253 @@
+import hashlib
+import re
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from arches_search.indexing.partitions import (
+    PARTITION_KEY,
+    create_partitions,
+    is_partitioned,
+    partitioned_graph_slugs,
+    partitions,
+    rename_partitions,
+)
+
+SHADOW_SUFFIX = "_shadow"
+
+_INDEX_DEF = re.compile(r"^(CREATE (?:UNIQUE )?INDEX )(\S+)( ON (?:ONLY )?)(\S+)( .*)$")
+
+
+def shadow_table(model):
+    return model._meta.db_table + SHADOW_SUFFIX
+
+
+def _shadow_name(name):
+    # live constraint names can already use postgres' full 63 characters, so
+    # derive a short stable name instead of appending the suffix
+    return "shadow_" + hashlib.md5(name.encode()).hexdigest()
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+def create_shadow_tables(models, partition_by_graph=False):
+    """Create empty, index-free copies of the given search tables.
+
+    Column types, generated columns, identity and CHECK constraints are copied
+    from the live table. Indexes and primary keys are added by
+    finalize_shadow_tables once the bulk load is done, foreign keys by
+    swap_shadow_tables. With partition_by_graph the copies are list-partitioned
+    on graph_slug, whether or not the live tables are, so swapping them in
+    converts the live tables.
+    """
+    graph_slugs = partitioned_graph_slugs() if partition_by_graph else []
+    with connection.cursor() as cursor:
+        for model in models:
+            live, shadow = model._meta.db_table, shadow_table(model)
+            cursor.execute(f"DROP TABLE IF EXISTS {_qn(shadow)} CASCADE")
+            cursor.execute(
+                f"CREATE TABLE {_qn(shadow)} (LIKE {_qn(live)} "
+                "INCLUDING ALL EXCLUDING INDEXES EXCLUDING DEFAULTS)"
+                + (
+                    f" PARTITION BY LIST ({PARTITION_KEY})"
+                    if partition_by_graph
+                    else ""
+                )
+            )
+            if partition_by_graph:
+                create_partitions(cursor, shadow, graph_slugs)
+            pk_column = model._meta.pk.column
+            cursor.execute(
+                "SELECT attidentity FROM pg_attribute "
+                "WHERE attrelid = %s::regclass AND attname = %s",
+                [shadow, pk_column],
+            )
+            if not cursor.fetchone()[0]:
+                # serial (pre-identity) table: give the shadow its own sequence
+                # rather than sharing the one owned by the live table
+                sequence = _qn(f"{shadow}_{pk_column}_seq")
+                cursor.execute(
+                    f"CREATE SEQUENCE {sequence} "
+                    f"OWNED BY {_qn(shadow)}.{_qn(pk_column)}"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {_qn(shadow)} ALTER COLUMN {_qn(pk_column)} "
+                    f"SET DEFAULT nextval('{sequence}')"
+                )
+
+
+@contextmanager
+def writing_to_shadow_tables(models):
+    """Point the models' ORM queries at their shadow tables for the duration."""
+    redirect_to_shadow_tables(models)
+    try:
+        yield
+    finally:
+        for model in models:
+            model._meta.db_table = model._meta.db_table.removesuffix(SHADOW_SUFFIX)
+
+
+def redirect_to_shadow_tables(models):
+    for model in models:
+        if not model._meta.db_table.endswith(SHADOW_SUFFIX):
+            model._meta.db_table = shadow_table(model)
+
+
+def _live_constraints(cursor, table, contypes=("p", "u", "f")):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype::text = ANY(%s)",
+        [table, list(contypes)],
+    )
+    return cursor.fetchall()
+
+
+def _live_indexes(cursor, table):
+    """Index definitions of the live table, excluding constraint-backed ones."""
+    cursor.execute(
+        "SELECT c.relname, pg_get_indexdef(i.indexrelid) "
+        "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = %s::regclass AND NOT EXISTS ("
+        "  SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid"
+        ")",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def finalize_shadow_tables(models, stdout=None):
+    """Add the live tables' primary keys and indexes to the loaded shadow tables."""
+    with connection.cursor() as cursor:
+        for model in models:
+            live, shadow = model._meta.db_table, shadow_table(model)
+            for name, definition in _live_constraints(cursor, live, ("p", "u")):
+                if definition.startswith("PRIMARY KEY"):
+                    # the key of a partitioned table must include its partition
+                    # key, whatever the live table is
+                    definition = _primary_key(model, is_partitioned(cursor, shadow))
+                cursor.execute(
+                    f"ALTER TABLE {_qn(shadow)} ADD CONSTRAINT "
+                    f"{_qn(_shadow_name(name))} {definition}"
+                )
+            for name, definition in _live_indexes(cursor, live):
+                match = _INDEX_DEF.match(definition)
+                cursor.execute(
+                    match.group(1)
+                    + _qn(_shadow_name(name))
+                    + match.group(3)
+                    + _qn(shadow)
+                    + match.group(5)
+                )
+            cursor.execute(f"ANALYZE {_qn(shadow)}")
+            if stdout is not None:
+                stdout.write(f"Built indexes for {shadow}")
+
+
+def _primary_key(model, partitioned):
+    columns = [model._meta.pk.column]
+    if partitioned:
+        columns.append(PARTITION_KEY)
+    return f"PRIMARY KEY ({', '.join(_qn(column) for column in columns)})"
+
+
+def swap_shadow_tables(models, before_swap=None):
+    """Replace the live tables with their shadows in one short transaction.
+
+    Writes to the live tables are blocked (reads are not) while before_swap
+    runs, so it can replay edits made during the rebuild into the shadows.
+    Foreign keys are attached NOT VALID to keep the swap a catalog-only change;
+    run validate_foreign_keys afterwards. Postgres cannot do that for a
+    partitioned table, so partitioned shadows get theirs beforehand, outside
+    the swap's locks (see _add_partitioned_foreign_keys). The old tables are
+    dropped and the shadows' constraints, indexes, partitions and sequences
+    take over the live names, so later migrations still find them.
+    """
+    with connection.cursor() as cursor:
+        for model in models:
+            live, shadow = model._meta.db_table, shadow_table(model)
+            if is_partitioned(cursor, shadow):
+                _add_partitioned_foreign_keys(cursor, live, shadow)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        tables = ", ".join(_qn(model._meta.db_table) for model in models)
+        cursor.execute(f"LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE")
+        if before_swap is not None:
+            before_swap()
+
+        for model in models:
+            live, shadow = model._meta.db_table, shadow_table(model)
+            if not is_partitioned(cursor, shadow):
+                for name, definition in _live_constraints(cursor, live, ("f",)):
+                    cursor.execute(
+                        f"ALTER TABLE {_qn(shadow)} ADD CONSTRAINT "
+                        f"{_qn(_shadow_name(name))} {definition} NOT VALID"
+                    )
+            constraints = [name for name, _ in _live_constraints(cursor, live)]
+            indexes = [name for name, _ in _live_indexes(cursor, live)]
+            cursor.execute(
+                "SELECT pg_get_serial_sequence(%s, %s)", [shadow, model._meta.pk.column]
+            )
+            sequence = cursor.fetchone()[0]
+
+            cursor.execute(f"DROP TABLE {_qn(live)}")
+            cursor.execute(f"ALTER TABLE {_qn(shadow)} RENAME TO {_qn(live)}")
+            rename_partitions(cursor, live, f"{shadow}_", f"{live}_")
+            for name in constraints:
+                cursor.execute(
+                    f"ALTER TABLE {_qn(live)} RENAME CONSTRAINT "
+                    f"{_qn(_shadow_name(name))} TO {_qn(name)}"
+                )
+            for name in indexes:
+                cursor.execute(
+                    f"ALTER INDEX {_qn(_shadow_name(name))} RENAME TO {_qn(name)}"
+                )
+            if sequence:
+                cursor.execute(
+                    f"ALTER SEQUENCE {sequence} "
+                    f"RENAME TO {_qn(f'{live}_{model._meta.pk.column}_seq')}"
+                )
+
+
+def _add_partitioned_foreign_keys(cursor, live, shadow):
+    """Give a partitioned shadow the live table's foreign keys.
+
+    Each partition gets them NOT VALID, which only briefly locks the
+    referenced tables, and then validated, which scans the partition without
+    blocking writes to them. Adding them to the partitioned table then only
+    attaches the partitions' checked constraints.
+    """
+    foreign_keys = [
+        (_qn(_shadow_name(name)), definition)
+        for name, definition in _live_constraints(cursor, live, ("f",))
+    ]
+    for partition in partitions(cursor, shadow):
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {_qn(partition)} ADD CONSTRAINT {name} "
+                f"{definition} NOT VALID"
+            )
+            cursor.execute(f"ALTER TABLE {_qn(partition)} VALIDATE CONSTRAINT {name}")
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {_qn(shadow)} ADD CONSTRAINT {name} {definition}")
+
+
+def validate_foreign_keys(models):
+    with connection.cursor() as cursor:
+        for model in models:
+            table = model._meta.db_table
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass "
+                "AND contype = 'f' AND NOT convalidated",
+                [table],
+            )
+            for (name,) in cursor.fetchall():
+                cursor.execute(
+                    f"ALTER TABLE {_qn(table)} VALIDATE CONSTRAINT {_qn(name)}"
+                )
+
+
+def drop_shadow_tables(models):
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"DROP TABLE IF EXISTS {_qn(shadow_table(model))} CASCADE")
@@ -0,0 +1,41 @@
+TILE_RECORD_FIELDS = (
+    "tileid",
+    "resourceinstance_id",
+    "nodegroup_id",
+    "data",
+    "provisionaledits",
+)
+
+
+class TileRecord:
+    """The tile columns the indexers read, without a TileModel around them.
+
+    Stands in for a tile wherever one is only indexed: reindexes stream
+    millions of these, and a slotted object is far cheaper to build than a
+    model instance.
+    """
+
+    __slots__ = TILE_RECORD_FIELDS
+
+    def __init__(
+        self, tileid, resourceinstance_id, nodegroup_id, data, provisionaledits
+    ):
+        self.tileid = tileid
+        self.resourceinstance_id = resourceinstance_id
+        self.nodegroup_id = nodegroup_id
+        self.data = data
+        self.provisionaledits = provisionaledits
+
+    def __repr__(self):
+        return f"<TileRecord {self.tileid}>"
+
+
+def tile_records(tiles, chunk_size=None):
+    """Stream a TileModel queryset as TileRecords through a server-side cursor."""
+    rows = tiles.values_list(*TILE_RECORD_FIELDS)
+    if chunk_size is None:
+        rows = rows.iterator()
+    else:
+        rows = rows.iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield TileRecord(*row)
@@ -0,0 +1,74 @@
+import math
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from arches_search.models.models import ReindexWorkUnit
+
+_UUID_SPACE = 1 << 128
+
+
+def plan_work_units(tile_count, unit_size=None):
+    """Replace the progress table with ranges covering the whole tileid space.
+
+    Tile ids are random (v4) UUIDs, so equal slices of the UUID space hold
+    about the same number of tiles and no scan is needed to place boundaries.
+    """
+    if unit_size is None:
+        unit_size = settings.INDEX_WORK_UNIT_SIZE
+    unit_count = max(1, math.ceil(tile_count / unit_size))
+    bounds = (
+        [None]
+        + [uuid.UUID(int=i * _UUID_SPACE // unit_count) for i in range(1, unit_count)]
+        + [None]
+    )
+    with transaction.atomic():
+        ReindexWorkUnit.objects.all().delete()
+        ReindexWorkUnit.objects.bulk_create(
+            ReindexWorkUnit(start_tileid=bounds[i], end_tileid=bounds[i + 1])
+            for i in range(unit_count)
+        )
+    return unit_count
+
+
+def reset_interrupted_work_units():
+    """Hand units leased by a dead run back out; they are purged before reuse."""
+    return ReindexWorkUnit.objects.filter(status=ReindexWorkUnit.LEASED).update(
+        status=ReindexWorkUnit.PENDING
+    )
+
+
+def work_unit_summary():
+    done = ReindexWorkUnit.objects.filter(status=ReindexWorkUnit.DONE)
+    return {
+        "total": ReindexWorkUnit.objects.count(),
+        "done": done.count(),
+        "tiles_done": done.aggregate(tiles=Sum("tile_count"))["tiles"] or 0,
+    }
+
+
+def lease_work_unit(worker):
+    with transaction.atomic():
+        unit = (
+            ReindexWorkUnit.objects.select_for_update(skip_locked=True)
+            .filter(status=ReindexWorkUnit.PENDING)
+            .order_by("id")
+            .first()
+        )
+        if unit is None:
+            return None
+        unit.status = ReindexWorkUnit.LEASED
+        unit.attempts += 1
+        unit.leased_by = worker
+        unit.leased_at = timezone.now()
+        unit.save(update_fields=["status", "attempts", "leased_by", "leased_at"])
+    return unit
+
+
+def complete_work_unit(unit, tile_count):
+    unit.status = ReindexWorkUnit.DONE
+    unit.tile_count = tile_count
+    unit.finished_at = timezone.now()
+    unit.save(update_fields=["status", "tile_count", "finished_at"])
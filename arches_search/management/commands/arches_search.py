@@ -18,8 +18,13 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 """This module contains commands for building Arches."""
 import datetime
+import itertools
 import math
 import multiprocessing
+import os
+import queue
+import socket
+import threading
 import time
 
 import django
@@ -28,103 +33,388 @@ from django.apps import apps
 if not apps.ready:
     django.setup()
 
-from django.core.management.base import BaseCommand
-from django.db import connection, connections
-from arches.app.models.models import TileModel, Node
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from arches.app.models.models import GraphModel, TileModel, Node
 from arches.app.models.system_settings import settings
-from arches_search.indexing.index_from_tile import index_from_tile
+from arches_search.indexing.index_buffer import IndexBuffer
+from arches_search.indexing.index_from_tile import (
+    SEARCH_MODELS,
+    index_from_tile,
+    index_from_tiles,
+    prefetch_index_data,
+    purge_graph_index_records,
+    save_grouped_index_records,
+)
+from arches_search.indexing.concept_cache import concept_cache
+from arches_search.indexing.copy_writer import COPY_FORMATS, CopyWriter
+from arches_search.indexing.fingerprints import clear_fingerprints
+from arches_search.indexing.edtf_cache import edtf_cache_stats, edtf_cache_summary
+from arches_search.indexing.index_queue import drain_index_queue, queue_depth
 from arches_search.indexing.indexing_factory import IndexingFactory
-from arches_search.models.models import (
-    BooleanSearch,
-    DateRangeSearch,
-    DateSearch,
-    FileListSearch,
-    GeometrySearch,
-    NumericSearch,
-    TermSearch,
-    UUIDSearch,
+from arches_search.indexing.language_indexes import sync_language_indexes
+from arches_search.indexing.partitions import truncate_graph_partitions
+from arches_search.indexing.resource_names import resource_names
+from arches_search.indexing.reindex_scope import ReindexScope
+from arches_search.indexing.set_based import index_with_sql, set_based_datatypes
+from arches_search.indexing.tile_records import tile_records
+from arches_search.indexing.work_units import (
+    complete_work_unit,
+    lease_work_unit,
+    plan_work_units,
+    reset_interrupted_work_units,
+    work_unit_summary,
+)
+from arches_search.indexing.shadow_tables import (
+    create_shadow_tables,
+    drop_shadow_tables,
+    finalize_shadow_tables,
+    redirect_to_shadow_tables,
+    swap_shadow_tables,
+    validate_foreign_keys,
+    writing_to_shadow_tables,
 )
 
-SEARCH_MODELS = [
-    TermSearch,
-    NumericSearch,
-    DateSearch,
-    UUIDSearch,
-    DateRangeSearch,
-    BooleanSearch,
-    GeometrySearch,
-    FileListSearch,
-]
 
+def _build_nodegroup_cache(exclude_datatypes=()):
+    """Nodes by nodegroup id, leaving out nodes of `exclude_datatypes`.
 
-def _build_nodegroup_cache():
+    Every nodegroup keeps its entry, even when all of its nodes are left out,
+    so the indexers never fall back to loading those nodes themselves.
+    """
     cache = {}
     for node in Node.objects.exclude(
         graph_id=settings.SYSTEM_SETTINGS_RESOURCE_MODEL_ID
     ).select_related("graph"):
-        cache.setdefault(node.nodegroup_id, []).append(node)
+        nodes = cache.setdefault(node.nodegroup_id, [])
+        if node.datatype not in exclude_datatypes:
+            nodes.append(node)
     return cache
 
 
+def _python_indexed_tiles(exclude_datatypes):
+    """Tile filter for the nodegroups that still have nodes indexed in python."""
+    return Q(
+        nodegroup_id__in=[
+            nodegroup_id
+            for nodegroup_id, nodes in _build_nodegroup_cache(exclude_datatypes).items()
+            if nodes
+        ]
+    )
+
+
+def _tiles_to_index(tile_filter=None):
+    tiles = TileModel.objects.exclude(
+        resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
+    )
+    if tile_filter is not None:
+        tiles = tiles.filter(tile_filter)
+    return tiles
+
+
+def _make_copy_writer(writer, copy_format):
+    return CopyWriter(copy_format) if writer == "copy" else None
+
+
+def _write_values(values_to_index, batch_size, copy_writer=None):
+    """Write and clear every buffered search row, via COPY when configured."""
+    for model, values in values_to_index.items():
+        if values:
+            if copy_writer is None:
+                model.objects.bulk_create(values, batch_size=batch_size)
+            else:
+                copy_writer.write(model, values)
+            values.clear()
+
+
 # Worker-process state, populated once per worker by _init_worker.
 _worker_factory = None
 _worker_nodegroup_cache = None
 _worker_progress = None
+_worker_copy_writer = None
 
 
-def _init_worker(progress_counter=None):
+def _init_worker(
+    progress_counter=None,
+    writer="bulk_create",
+    copy_format="text",
+    shadow=False,
+    exclude_datatypes=(),
+):
     django.setup()
+    if shadow:
+        redirect_to_shadow_tables(SEARCH_MODELS)
     global _worker_factory, _worker_nodegroup_cache, _worker_progress
+    global _worker_copy_writer
     _worker_factory = IndexingFactory()
-    _worker_nodegroup_cache = _build_nodegroup_cache()
+    _worker_nodegroup_cache = _build_nodegroup_cache(exclude_datatypes)
+    concept_cache.preload()
+    # pool processes live only for the run
+    resource_names.activate()
     _worker_progress = progress_counter
+    _worker_copy_writer = _make_copy_writer(writer, copy_format)
+
+
+def _peak_buffer_summary(peak_rows, peak_bytes):
+    return f"peak buffer {peak_rows} rows, ~{peak_bytes / (1024 * 1024):.1f} MiB"
+
 
+def _worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _purge_interrupted_unit(unit, row_filter=None):
+    if unit.attempts > 1:
+        stale_rows = unit.tile_filter()
+        if row_filter is not None:
+            stale_rows &= row_filter
+        for model in SEARCH_MODELS:
+            model.objects.filter(stale_rows).delete()
+
+
+def _index_work_units(
+    indexing_factory,
+    nodegroup_cache,
+    copy_writer=None,
+    tile_filter=None,
+    row_filter=None,
+    report_progress=None,
+    pipelined=False,
+):
+    """Lease tileid ranges from the progress table and index them until none are left.
+
+    A unit's last flush and its completion commit together, so a finished unit
+    is never redone. A unit leased before (by an interrupted run) may already
+    have some of its rows written, so those are purged first. Returns the tile
+    count and the row buffer, whose peaks feed the summary.
+    """
+    if pipelined:
+        return _index_work_units_pipelined(
+            indexing_factory,
+            nodegroup_cache,
+            copy_writer=copy_writer,
+            tile_filter=tile_filter,
+            row_filter=row_filter,
+            report_progress=report_progress,
+        )
 
-def _index_tile_shard(worker_id, num_workers):
-    """Index the tiles whose tileid hashes into this worker's shard."""
     batch_size = settings.INDEX_BATCH_SIZE
-    values_to_index = {model: [] for model in SEARCH_MODELS}
+    buffer = IndexBuffer(settings.INDEX_FLUSH_MAX_ROWS, settings.INDEX_FLUSH_MAX_BYTES)
+    worker = _worker_name()
+
+    def write(values_to_index):
+        _write_values(values_to_index, batch_size, copy_writer)
+
     tile_count = 0
-    since_last_report = 0
 
-    qs = TileModel.objects.exclude(
-        resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
-    ).extra(
-        where=["abs(hashtext(tileid::text)::bigint) %% %s = %s"],
-        params=[num_workers, worker_id],
-    )
+    while (unit := lease_work_unit(worker)) is not None:
+        _purge_interrupted_unit(unit, row_filter)
+        unit_tile_count = 0
+        since_last_report = 0
+        unit_tiles = _tiles_to_index(tile_filter).filter(unit.tile_filter())
+        tiles = tile_records(unit_tiles, chunk_size=batch_size)
+        while chunk := list(itertools.islice(tiles, batch_size)):
+            prefetch_index_data(chunk, nodegroup_cache, indexing_factory)
+            for tile in chunk:
+                buffer.extend(
+                    index_from_tile(
+                        tile,
+                        delete_existing=False,
+                        indexing_factory=indexing_factory,
+                        nodegroup_cache=nodegroup_cache,
+                    )
+                )
+                unit_tile_count += 1
+                since_last_report += 1
+                if buffer.is_full():
+                    buffer.flush(write)
+                    if report_progress is not None:
+                        report_progress(since_last_report)
+                    since_last_report = 0
+
+        with transaction.atomic():
+            buffer.flush(write)
+            complete_work_unit(unit, unit_tile_count)
+        if report_progress is not None and since_last_report:
+            report_progress(since_last_report)
+        tile_count += unit_tile_count
 
-    def flush():
-        for model, values in values_to_index.items():
-            if values:
-                model.objects.bulk_create(values, batch_size=batch_size)
-                values.clear()
+    return tile_count, buffer
+
+
+class _PipelineAborted(Exception):
+    pass
+
+
+_END_OF_STREAM = object()
+
+
+def _index_work_units_pipelined(
+    indexing_factory,
+    nodegroup_cache,
+    copy_writer=None,
+    tile_filter=None,
+    row_filter=None,
+    report_progress=None,
+):
+    """_index_work_units with reading, indexing and writing overlapped.
+
+    A reader thread leases units and prefetches their tiles, the calling
+    thread runs the indexers and a writer thread flushes the rows, linked by
+    queues of INDEX_PIPELINE_QUEUE_SIZE batches. The threads get their own
+    database connections, so this cannot see rows from the caller's open
+    transaction. The first error in any stage stops all three.
+    """
+    batch_size = settings.INDEX_BATCH_SIZE
+    tile_queue = queue.Queue(maxsize=settings.INDEX_PIPELINE_QUEUE_SIZE)
+    row_queue = queue.Queue(maxsize=settings.INDEX_PIPELINE_QUEUE_SIZE)
+    buffer = IndexBuffer(settings.INDEX_FLUSH_MAX_ROWS, settings.INDEX_FLUSH_MAX_BYTES)
+    worker = _worker_name()
+    failed = threading.Event()
+    errors = []
+
+    def put(stage_queue, item):
+        while not failed.is_set():
+            try:
+                stage_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+        raise _PipelineAborted
+
+    def get(stage_queue):
+        while not failed.is_set():
+            try:
+                return stage_queue.get(timeout=0.5)
+            except queue.Empty:
+                pass
+        raise _PipelineAborted
+
+    def run_stage(stage):
+        try:
+            stage()
+        except _PipelineAborted:
+            pass
+        except BaseException as error:
+            errors.append(error)
+            failed.set()
+
+    def read():
+        try:
+            while (unit := lease_work_unit(worker)) is not None:
+                _purge_interrupted_unit(unit, row_filter)
+                unit_tiles = _tiles_to_index(tile_filter).filter(unit.tile_filter())
+                tiles = []
+                for tile in tile_records(unit_tiles, chunk_size=batch_size):
+                    tiles.append(tile)
+                    if len(tiles) == batch_size:
+                        put(tile_queue, (unit, tiles))
+                        tiles = []
+                put(tile_queue, (unit, tiles))
+                # an empty-handed marker closes the unit
+                put(tile_queue, (unit, None))
+            put(tile_queue, _END_OF_STREAM)
+        finally:
+            connection.close()
+
+    def write():
+        try:
+            while (item := get(row_queue)) is not _END_OF_STREAM:
+                values_to_index, tile_count, finished_unit = item
+                if finished_unit is None:
+                    _write_values(values_to_index, batch_size, copy_writer)
+                else:
+                    with transaction.atomic():
+                        _write_values(values_to_index, batch_size, copy_writer)
+                        complete_work_unit(*finished_unit)
+                if report_progress is not None and tile_count:
+                    report_progress(tile_count)
+        finally:
+            connection.close()
+
+    tile_count = 0
+
+    def transform():
+        nonlocal tile_count
+        unit_tile_count = 0
+        since_last_write = 0
+
+        def hand_off(finished_unit=None):
+            nonlocal since_last_write
+            buffer.flush(
+                lambda values: put(
+                    row_queue,
+                    (
+                        {model: list(rows) for model, rows in values.items()},
+                        since_last_write,
+                        finished_unit,
+                    ),
+                )
+            )
+            since_last_write = 0
+
+        while (item := get(tile_queue)) is not _END_OF_STREAM:
+            unit, tiles = item
+            if tiles is None:
+                hand_off((unit, unit_tile_count))
+                unit_tile_count = 0
+                continue
+            prefetch_index_data(tiles, nodegroup_cache, indexing_factory)
+            for tile in tiles:
+                buffer.extend(
+                    index_from_tile(
+                        tile,
+                        delete_existing=False,
+                        indexing_factory=indexing_factory,
+                        nodegroup_cache=nodegroup_cache,
+                    )
+                )
+                unit_tile_count += 1
+                since_last_write += 1
+                tile_count += 1
+                if buffer.is_full():
+                    hand_off()
+        put(row_queue, _END_OF_STREAM)
+
+    stages = [
+        threading.Thread(target=run_stage, args=(stage,), daemon=True)
+        for stage in (read, write)
+    ]
+    for stage in stages:
+        stage.start()
+    run_stage(transform)
+    for stage in stages:
+        stage.join()
+    if errors:
+        raise errors[0]
+    return tile_count, buffer
+
+
+def _index_work_units_worker(worker_id, tile_filter=None, row_filter=None):
+    """Pool entry point: index work units with this process's worker state."""
 
     def report_progress(n):
         if _worker_progress is not None and n:
             with _worker_progress.get_lock():
                 _worker_progress.value += n
 
-    for tile in qs.iterator(chunk_size=batch_size):
-        for val in (
-            index_from_tile(
-                tile,
-                delete_existing=False,
-                indexing_factory=_worker_factory,
-                nodegroup_cache=_worker_nodegroup_cache,
-            )
-            or []
-        ):
-            values_to_index[type(val)].append(val)
-        tile_count += 1
-        since_last_report += 1
-        if tile_count % batch_size == 0:
-            flush()
-            report_progress(since_last_report)
-            since_last_report = 0
-    flush()
-    report_progress(since_last_report)
-    return (worker_id, tile_count)
+    tile_count, buffer = _index_work_units(
+        _worker_factory,
+        _worker_nodegroup_cache,
+        copy_writer=_worker_copy_writer,
+        tile_filter=tile_filter,
+        row_filter=row_filter,
+        report_progress=report_progress,
+        pipelined=settings.INDEX_PIPELINE_QUEUE_SIZE > 0,
+    )
+    return (
+        worker_id,
+        tile_count,
+        buffer.peak_rows,
+        buffer.peak_bytes,
+        edtf_cache_stats(),
+    )
 
 
 class Command(BaseCommand):
@@ -139,9 +429,19 @@ class Command(BaseCommand):
             nargs="?",
             choices=[
                 "reindex_database",
+                "index_queue_status",
+                "flush_index_queue",
+                "purge_graph",
+                "sync_language_indexes",
             ],
             help="Operation Type; "
-            + "'reindex_database'=Deletes and re-creates all arches search indices",
+            + "'reindex_database'=Deletes and re-creates all arches search indices; "
+            + "'index_queue_status'=Reports how many tiles await deferred indexing; "
+            + "'flush_index_queue'=Indexes every queued tile now; "
+            + "'purge_graph'=Deletes the search rows of every resource in the "
+            + "--graph graph, e.g. before deleting its resources; "
+            + "'sync_language_indexes'=Builds the full-text indexes of the "
+            + "languages in settings.LANGUAGES and drops those of removed ones",
         )
         parser.add_argument(
             "--keep-indexes",
@@ -169,29 +469,176 @@ class Command(BaseCommand):
             help="Changes the process pool size when using use_multiprocessing. "
             "Default is ceil(cpu_count()/2)",
         )
+        parser.add_argument(
+            "--shadow",
+            action="store_true",
+            help="Rebuild into shadow copies of the search tables and swap them "
+            "in when done, so the live tables stay queryable throughout.",
+        )
+        parser.add_argument(
+            "--graph",
+            dest="graph_slug",
+            help="Only rebuild the search rows of resources in the graph with "
+            "this slug.",
+        )
+        parser.add_argument(
+            "--nodegroup",
+            dest="nodegroup_id",
+            help="Only rebuild the search rows of tiles in this nodegroup.",
+        )
+        parser.add_argument(
+            "--resource-file",
+            help="Only rebuild the search rows of the resources listed in this "
+            "file, one resourceinstanceid per line.",
+        )
+        parser.add_argument(
+            "--since",
+            type=datetime.datetime.fromisoformat,
+            help="Only rebuild the search rows of tiles saved or deleted since "
+            "this ISO 8601 timestamp, according to the edit log.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted reindex_database from its progress "
+            "table instead of starting over. Pass the same scope options as the "
+            "interrupted run.",
+        )
+        parser.add_argument(
+            "--writer",
+            choices=["bulk_create", "copy"],
+            default="bulk_create",
+            help="How reindex_database writes search rows: 'bulk_create' issues "
+            "multi-row INSERTs, 'copy' streams rows with COPY FROM STDIN.",
+        )
+        parser.add_argument(
+            "--copy-format",
+            choices=COPY_FORMATS,
+            default="text",
+            help="Wire format used by --writer=copy.",
+        )
+        parser.add_argument(
+            "--set-based",
+            action="store_true",
+            help="Build the search rows of number, boolean, string, "
+            "non-localized-string, url and date nodes with INSERT ... SELECT "
+            "statements run inside postgres; only the remaining datatypes are "
+            "indexed in python.",
+        )
 
     def handle(self, *_, **options):
         if options["operation"] == "reindex_database":
-            self.reindex_database(
-                keep_indexes=options["keep_indexes"],
-                use_multiprocessing=options["use_multiprocessing"],
-                max_subprocesses=options["max_subprocesses"],
+            resourceids = None
+            if options["resource_file"]:
+                with open(options["resource_file"]) as resource_file:
+                    resourceids = [
+                        line.strip()
+                        for line in resource_file
+                        if line.strip() and not line.startswith("#")
+                    ]
+            with resource_names.caching():
+                self.reindex_database(
+                    keep_indexes=options["keep_indexes"],
+                    use_multiprocessing=options["use_multiprocessing"],
+                    max_subprocesses=options["max_subprocesses"],
+                    writer=options["writer"],
+                    copy_format=options["copy_format"],
+                    shadow=options["shadow"],
+                    resume=options["resume"],
+                    set_based=options["set_based"],
+                    scope=ReindexScope(
+                        graph_slug=options["graph_slug"],
+                        nodegroup_id=options["nodegroup_id"],
+                        resourceids=resourceids,
+                        since=options["since"],
+                    ),
+                )
+        elif options["operation"] == "index_queue_status":
+            self.stdout.write(f"{queue_depth()} tile(s) queued for indexing")
+        elif options["operation"] == "flush_index_queue":
+            drained = drain_index_queue()
+            self.stdout.write(f"Indexed {drained} queued tile(s)")
+        elif options["operation"] == "purge_graph":
+            self.purge_graph(options["graph_slug"])
+        elif options["operation"] == "sync_language_indexes":
+            created, dropped = sync_language_indexes()
+            self.stdout.write(
+                f"Created {len(created)} and dropped {len(dropped)} "
+                "language index(es)"
             )
 
-    def _flush(self, values_to_index, batch_size):
-        for index_type, values in values_to_index.items():
-            if values:
-                index_type.objects.bulk_create(values, batch_size=batch_size)
-                values.clear()
+    def purge_graph(self, graph_slug):
+        if not graph_slug:
+            raise CommandError("purge_graph needs --graph")
+        graphids = list(
+            GraphModel.objects.filter(slug=graph_slug).values_list("graphid", flat=True)
+        )
+        if not graphids:
+            raise CommandError(f"No graph with slug {graph_slug}")
+        if truncate_graph_partitions(graph_slug):
+            self.stdout.write(f"Truncated the partitions of {graph_slug}")
+        deleted = sum(purge_graph_index_records(graphid) for graphid in graphids)
+        self.stdout.write(f"Deleted {deleted} search row(s) of graph {graph_slug}")
 
     def reindex_database(
         self,
         keep_indexes=False,
         use_multiprocessing=False,
         max_subprocesses=0,
+        writer="bulk_create",
+        copy_format="text",
+        shadow=False,
+        resume=False,
+        scope=None,
+        set_based=False,
     ):
-        self.delete_indexes()
+        if shadow and scope:
+            raise CommandError(
+                "--shadow rebuilds every search row; it cannot be scoped"
+            )
+        if shadow and resume:
+            raise CommandError(
+                "--shadow runs cannot be resumed; their shadow tables are "
+                "dropped when they fail"
+            )
+        if set_based and (scope or resume):
+            raise CommandError(
+                "--set-based rebuilds every search row in one pass; it cannot be "
+                "scoped or resumed"
+            )
+        # rows rebuilt here carry no fingerprint; drop the old ones rather
+        # than trust them for rows a failed run may have purged
+        clear_fingerprints(scope.tile_filter() if scope else None)
+
+        if scope:
+            self.reindex_scope(
+                scope,
+                use_multiprocessing,
+                max_subprocesses,
+                writer,
+                copy_format,
+                resume=resume,
+            )
+            return
+
+        if shadow:
+            self._reindex_shadow(
+                use_multiprocessing, max_subprocesses, writer, copy_format, set_based
+            )
+            return
+
+        exclude_datatypes = tuple(set_based_datatypes()) if set_based else ()
+        tile_filter = _python_indexed_tiles(exclude_datatypes) if set_based else None
+
         indexing_start = datetime.datetime.now()
+        if resume:
+            self._resume_work_units()
+            # the interrupted run may have left some indexes dropped; load
+            # with whatever is there and put any missing ones back at the end
+            keep_indexes = True
+        else:
+            self.delete_indexes()
+            self._plan_work_units(tile_filter)
 
         # do not remove this block or tests will fail.  open transactions
         # will interfere with dropping/recreating indexes, so skip that
@@ -206,9 +653,24 @@ class Command(BaseCommand):
         dropped_indexes = [] if keep_indexes else self._drop_indexes()
         try:
             if use_multiprocessing:
-                self._reindex_multiprocess(max_subprocesses)
+                self._reindex_multiprocess(
+                    max_subprocesses,
+                    writer,
+                    copy_format,
+                    tile_filter=tile_filter,
+                    exclude_datatypes=exclude_datatypes,
+                )
             else:
-                self._reindex_singleprocess()
+                self._reindex_singleprocess(
+                    writer,
+                    copy_format,
+                    tile_filter=tile_filter,
+                    exclude_datatypes=exclude_datatypes,
+                )
+            if set_based:
+                self._index_with_sql()
+            if resume:
+                self._recreate_missing_indexes()
         finally:
             if dropped_indexes:
                 self.stdout.write(
@@ -223,35 +685,179 @@ class Command(BaseCommand):
                 )
         self.stdout.write(f"Indexing took {datetime.datetime.now() - indexing_start}")
 
-    def _reindex_singleprocess(self):
-        batch_size = settings.INDEX_BATCH_SIZE
-        nodegroup_cache = _build_nodegroup_cache()
-        values_to_index = {model: [] for model in SEARCH_MODELS}
-        indexing_factory = IndexingFactory()
-        tile_count = 0
-
-        for tile in TileModel.objects.exclude(
-            resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
-        ).iterator(chunk_size=batch_size):
-            for val in (
-                index_from_tile(
-                    tile,
-                    delete_existing=False,
-                    indexing_factory=indexing_factory,
-                    nodegroup_cache=nodegroup_cache,
-                )
-                or []
-            ):
-                values_to_index[type(val)].append(val)
+    def _reindex_shadow(
+        self,
+        use_multiprocessing,
+        max_subprocesses,
+        writer,
+        copy_format,
+        set_based=False,
+    ):
+        indexing_start = datetime.datetime.now()
+        exclude_datatypes = tuple(set_based_datatypes()) if set_based else ()
+        tile_filter = _python_indexed_tiles(exclude_datatypes) if set_based else None
+        create_shadow_tables(
+            SEARCH_MODELS, partition_by_graph=settings.SEARCH_PARTITION_BY_GRAPH
+        )
+        self._plan_work_units(tile_filter)
+        try:
+            with writing_to_shadow_tables(SEARCH_MODELS):
+                if use_multiprocessing:
+                    self._reindex_multiprocess(
+                        max_subprocesses,
+                        writer,
+                        copy_format,
+                        shadow=True,
+                        tile_filter=tile_filter,
+                        exclude_datatypes=exclude_datatypes,
+                    )
+                else:
+                    self._reindex_singleprocess(
+                        writer,
+                        copy_format,
+                        tile_filter=tile_filter,
+                        exclude_datatypes=exclude_datatypes,
+                    )
+                if set_based:
+                    self._index_with_sql()
+            self.stdout.write("Building indexes on shadow tables...")
+            finalize_shadow_tables(SEARCH_MODELS, stdout=self.stdout)
+            swap_shadow_tables(
+                SEARCH_MODELS,
+                before_swap=lambda: self._replay_edits(indexing_start),
+            )
+        except BaseException:
+            drop_shadow_tables(SEARCH_MODELS)
+            raise
+        self.stdout.write("Swapped shadow tables in; validating foreign keys...")
+        validate_foreign_keys(SEARCH_MODELS)
+        self.stdout.write(f"Indexing took {datetime.datetime.now() - indexing_start}")
 
-            tile_count += 1
-            if tile_count % batch_size == 0:
-                self._flush(values_to_index, batch_size)
-                self.stdout.write(f"indexed {tile_count} tiles")
+    def _replay_edits(self, since):
+        """Reindex, into the shadow tables, tiles edited or deleted since `since`."""
+        with writing_to_shadow_tables(SEARCH_MODELS):
+            self._purge_and_reindex_scope(ReindexScope(since=since))
+
+    def _purge_and_reindex_scope(self, scope):
+        for model in SEARCH_MODELS:
+            model.objects.filter(scope.row_filter()).delete()
+        save_grouped_index_records(
+            index_from_tiles(
+                tile_records(_tiles_to_index(scope.tile_filter())),
+                delete_existing=False,
+                nodegroup_cache=_build_nodegroup_cache(),
+            )
+        )
+
+    def reindex_scope(
+        self,
+        scope,
+        use_multiprocessing=False,
+        max_subprocesses=0,
+        writer="bulk_create",
+        copy_format="text",
+        resume=False,
+    ):
+        """Delete and rebuild only the search rows selected by `scope`."""
+        indexing_start = datetime.datetime.now()
+        self.stdout.write(f"Reindexing {scope}")
+        tile_filter = scope.tile_filter()
+        row_filter = scope.row_filter()
+        if resume:
+            self._resume_work_units()
+        else:
+            if scope.is_graph_only() and truncate_graph_partitions(scope.graph_slug):
+                self.stdout.write(f"Truncated the partitions of {scope.graph_slug}")
+            # rows filed under an older slug are not in the graph's partitions
+            for model in SEARCH_MODELS:
+                model.objects.filter(row_filter).delete()
+            self._plan_work_units(tile_filter)
+        if use_multiprocessing:
+            self._reindex_multiprocess(
+                max_subprocesses,
+                writer,
+                copy_format,
+                tile_filter=tile_filter,
+                row_filter=row_filter,
+            )
+        else:
+            self._reindex_singleprocess(
+                writer, copy_format, tile_filter=tile_filter, row_filter=row_filter
+            )
+        self.stdout.write(f"Indexing took {datetime.datetime.now() - indexing_start}")
+
+    def _index_with_sql(self):
+        # runs after the python pass: a retried work unit purges every search
+        # row of its tiles, set-based ones included
+        start = datetime.datetime.now()
+        self.stdout.write("Indexing scalar nodes in postgres...")
+        written = index_with_sql(
+            _tiles_to_index(), batch_size=settings.INDEX_BATCH_SIZE
+        )
+        self.stdout.write(
+            f"Wrote {sum(written.values())} search row(s) in postgres in "
+            f"{datetime.datetime.now() - start}"
+        )
 
-        self._flush(values_to_index, batch_size)
+    def _plan_work_units(self, tile_filter=None):
+        unit_count = plan_work_units(_tiles_to_index(tile_filter).count())
+        self.stdout.write(f"Split tiles into {unit_count} work unit(s)")
 
-    def _reindex_multiprocess(self, max_subprocesses):
+    def _resume_work_units(self):
+        reset_interrupted_work_units()
+        summary = work_unit_summary()
+        if not summary["total"]:
+            raise CommandError("There is no interrupted reindex to resume")
+        self.stdout.write(
+            f"Resuming: {summary['done']}/{summary['total']} work unit(s) "
+            f"({summary['tiles_done']} tiles) already done"
+        )
+
+    def _reindex_singleprocess(
+        self,
+        writer="bulk_create",
+        copy_format="text",
+        tile_filter=None,
+        row_filter=None,
+        exclude_datatypes=(),
+    ):
+        tile_count = work_unit_summary()["tiles_done"]
+        edtf_hits_before, edtf_misses_before = edtf_cache_stats()
+        concept_cache.preload()
+
+        def report_progress(n):
+            nonlocal tile_count
+            tile_count += n
+            self.stdout.write(f"indexed {tile_count} tiles")
+
+        _, buffer = _index_work_units(
+            IndexingFactory(),
+            _build_nodegroup_cache(exclude_datatypes),
+            copy_writer=_make_copy_writer(writer, copy_format),
+            tile_filter=tile_filter,
+            row_filter=row_filter,
+            report_progress=report_progress,
+            # pipeline threads use their own connections and would not see
+            # rows from an open transaction (e.g. a TestCase)
+            pipelined=settings.INDEX_PIPELINE_QUEUE_SIZE > 0
+            and not connection.in_atomic_block,
+        )
+        self.stdout.write(_peak_buffer_summary(buffer.peak_rows, buffer.peak_bytes))
+        hits, misses = edtf_cache_stats()
+        self.stdout.write(
+            edtf_cache_summary(hits - edtf_hits_before, misses - edtf_misses_before)
+        )
+
+    def _reindex_multiprocess(
+        self,
+        max_subprocesses,
+        writer="bulk_create",
+        copy_format="text",
+        shadow=False,
+        tile_filter=None,
+        row_filter=None,
+        exclude_datatypes=(),
+    ):
         try:
             multiprocessing.set_start_method("spawn")
         except RuntimeError:
@@ -268,21 +874,25 @@ class Command(BaseCommand):
         else:
             process_count = max_subprocesses
 
-        total_tiles = TileModel.objects.exclude(
-            resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
-        ).count()
+        total_tiles = _tiles_to_index(tile_filter).count()
         self.stdout.write(
             f"Indexing {total_tiles} tiles across {process_count} worker(s)"
         )
 
         connections.close_all()
 
-        progress = multiprocessing.Value("q", 0)
+        progress = multiprocessing.Value("q", work_unit_summary()["tiles_done"])
         errors = []
+        edtf_stats = [0, 0]
 
         def on_done(result):
-            worker_id, tile_count = result
-            self.stdout.write(f"Worker {worker_id} finished ({tile_count} tiles)")
+            worker_id, tile_count, peak_rows, peak_bytes, (hits, misses) = result
+            edtf_stats[0] += hits
+            edtf_stats[1] += misses
+            self.stdout.write(
+                f"Worker {worker_id} finished ({tile_count} tiles, "
+                f"{_peak_buffer_summary(peak_rows, peak_bytes)})"
+            )
 
         def on_err(err):
             import traceback
@@ -297,12 +907,12 @@ class Command(BaseCommand):
         with multiprocessing.Pool(
             processes=process_count,
             initializer=_init_worker,
-            initargs=(progress,),
+            initargs=(progress, writer, copy_format, shadow, exclude_datatypes),
         ) as pool:
             results = [
                 pool.apply_async(
-                    _index_tile_shard,
-                    args=(worker_id, process_count),
+                    _index_work_units_worker,
+                    args=(worker_id, tile_filter, row_filter),
                     callback=on_done,
                     error_callback=on_err,
                 )
@@ -335,6 +945,7 @@ class Command(BaseCommand):
             raise RuntimeError(
                 f"{len(errors)} indexing worker(s) failed; see logs above"
             )
+        self.stdout.write(edtf_cache_summary(*edtf_stats))
 
     def delete_indexes(self):
         table_names = ", ".join(model._meta.db_table for model in SEARCH_MODELS)
@@ -354,6 +965,22 @@ class Command(BaseCommand):
             )
         return dropped
 
+    def _recreate_missing_indexes(self):
+        missing = []
+        with connection.cursor() as cursor:
+            for model in SEARCH_MODELS:
+                existing = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table
+                )
+                missing.extend(
+                    (model, index)
+                    for index in model._meta.indexes
+                    if index.name not in existing
+                )
+        if missing:
+            self.stdout.write(f"Recreating {len(missing)} missing postgres index(es)")
+            self._recreate_indexes(missing)
+
     def _recreate_indexes(self, dropped):
         with connection.schema_editor() as editor:
             for model, index in dropped:
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_search", "0021_daterangesearch_end_value_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexQueueEntry",
+            fields=[
+                ("tileid", models.UUIDField(primary_key=True, serialize=False)),
+                ("queued_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "arches_search_index_queue",
+                "managed": True,
+                "indexes": [
+                    models.Index(fields=["queued_at"], name="asiq_queued_at_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_search", "0022_indexqueueentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReindexWorkUnit",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("start_tileid", models.UUIDField(null=True)),
+                ("end_tileid", models.UUIDField(null=True)),
+                ("status", models.TextField(default="pending")),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("leased_by", models.TextField(blank=True, default="")),
+                ("leased_at", models.DateTimeField(null=True)),
+                ("finished_at", models.DateTimeField(null=True)),
+                ("tile_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "arches_search_reindex_progress",
+                "managed": True,
+                "indexes": [
+                    models.Index(fields=["status"], name="asrp_status_idx"),
+                ],
+            },
+        ),
+    ]
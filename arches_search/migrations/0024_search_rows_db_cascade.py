@@ -0,0 +1,101 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+SEARCH_MODELS = (
+    ("termsearch", "arches_search_terms"),
+    ("numericsearch", "arches_search_numeric"),
+    ("uuidsearch", "arches_search_uuid"),
+    ("datesearch", "arches_search_date"),
+    ("daterangesearch", "arches_search_date_range"),
+    ("booleansearch", "arches_search_boolean"),
+    ("geometrysearch", "arches_search_geometry"),
+    ("filelistsearch", "arches_search_file_list"),
+)
+
+# (column, referenced table, referenced column)
+FOREIGN_KEYS = (
+    ("tileid", "tiles", "tileid"),
+    ("resourceinstanceid", "resource_instances", "resourceinstanceid"),
+)
+
+
+def _foreign_key_names(cursor, table, column):
+    cursor.execute(
+        "SELECT c.conname FROM pg_constraint c "
+        "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey) "
+        "WHERE c.conrelid = %s::regclass AND c.contype = 'f' AND a.attname = %s",
+        [table, column],
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def _recreate_foreign_keys(schema_editor, on_delete):
+    quote_name = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        for _, table in SEARCH_MODELS:
+            for column, target_table, target_column in FOREIGN_KEYS:
+                names = _foreign_key_names(cursor, table, column)
+                for name in names:
+                    cursor.execute(
+                        f"ALTER TABLE {quote_name(table)} "
+                        f"DROP CONSTRAINT {quote_name(name)}"
+                    )
+                # keep Django's name so later migrations still find the key
+                name = names[0] if names else f"{table}_{column}_fk"
+                cursor.execute(
+                    f"ALTER TABLE {quote_name(table)} ADD CONSTRAINT "
+                    f"{quote_name(name)} FOREIGN KEY ({quote_name(column)}) "
+                    f"REFERENCES {quote_name(target_table)} "
+                    f"({quote_name(target_column)}){on_delete} "
+                    "DEFERRABLE INITIALLY DEFERRED"
+                )
+
+
+def add_db_cascades(apps, schema_editor):
+    _recreate_foreign_keys(schema_editor, " ON DELETE CASCADE")
+
+
+def remove_db_cascades(apps, schema_editor):
+    _recreate_foreign_keys(schema_editor, "")
+
+
+def _alter_foreign_keys():
+    operations = []
+    for model_name, _ in SEARCH_MODELS:
+        operations.append(
+            migrations.AlterField(
+                model_name=model_name,
+                name="tileid",
+                field=models.ForeignKey(
+                    db_column="tileid",
+                    on_delete=django.db.models.deletion.DO_NOTHING,
+                    to="models.tile",
+                ),
+            )
+        )
+        operations.append(
+            migrations.AlterField(
+                model_name=model_name,
+                name="resourceinstanceid",
+                field=models.ForeignKey(
+                    db_column="resourceinstanceid",
+                    on_delete=django.db.models.deletion.DO_NOTHING,
+                    to="models.resourceinstance",
+                ),
+            )
+        )
+    return operations
+
+
+class Migration(migrations.Migration):
+    """Let postgres, not Django's deletion collector, remove a tile's or
+    resource's search rows."""
+
+    dependencies = [
+        ("arches_search", "0023_reindexworkunit"),
+    ]
+
+    operations = [
+        *_alter_foreign_keys(),
+        migrations.RunPython(add_db_cascades, remove_db_cascades),
+    ]
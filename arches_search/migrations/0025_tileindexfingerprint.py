@@ -0,0 +1,46 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_search", "0024_search_rows_db_cascade"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TileIndexFingerprint",
+            fields=[
+                (
+                    "tileid",
+                    models.OneToOneField(
+                        db_column="tileid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="models.tile",
+                    ),
+                ),
+                ("fingerprint", models.TextField()),
+            ],
+            options={
+                "db_table": "arches_search_tile_fingerprint",
+                "managed": True,
+            },
+        ),
+        migrations.RunSQL(
+            """
+            ALTER TABLE arches_search_tile_fingerprint
+            ADD CONSTRAINT arches_search_tile_fingerprint_tileid_fk
+            FOREIGN KEY (tileid) REFERENCES tiles (tileid)
+            ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED;
+            """,
+            """
+            ALTER TABLE arches_search_tile_fingerprint
+            DROP CONSTRAINT IF EXISTS arches_search_tile_fingerprint_tileid_fk;
+            """,
+        ),
+    ]
@@ -0,0 +1,248 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+SEARCH_TABLES = (
+    ("termsearch", "arches_search_terms"),
+    ("numericsearch", "arches_search_numeric"),
+    ("uuidsearch", "arches_search_uuid"),
+    ("datesearch", "arches_search_date"),
+    ("daterangesearch", "arches_search_date_range"),
+    ("booleansearch", "arches_search_boolean"),
+    ("geometrysearch", "arches_search_geometry"),
+    ("filelistsearch", "arches_search_file_list"),
+)
+
+# composite indexes led by graph_slug/node_alias, replaced by node_key ones
+REPLACED_INDEXES = (
+    ("termsearch", "arches_sear_graph_s_3e2efc_idx"),
+    ("termsearch", "gslug_na_val"),
+    ("termsearch", "gslug_na_lang_val"),
+    ("termsearch", "gslug_na_tile_val"),
+    ("termsearch", "gslug_na_tile_lang_val"),
+    ("numericsearch", "arches_sear_graph_s_4a34b3_idx"),
+    ("numericsearch", "arches_sear_graph_s_97d9d8_idx"),
+    ("numericsearch", "arches_sear_graph_s_57080f_idx"),
+    ("uuidsearch", "arches_sear_graph_s_c0fa2b_idx"),
+    ("uuidsearch", "arches_sear_graph_s_169917_idx"),
+    ("uuidsearch", "arches_sear_graph_s_aaf504_idx"),
+    ("datesearch", "arches_sear_graph_s_455ff1_idx"),
+    ("datesearch", "arches_sear_graph_s_be0429_idx"),
+    ("datesearch", "arches_sear_graph_s_c85445_idx"),
+    ("daterangesearch", "arches_sear_graph_s_39b677_idx"),
+    ("daterangesearch", "arches_sear_graph_s_000a17_idx"),
+    ("daterangesearch", "arches_sear_graph_s_b00d8a_idx"),
+    ("daterangesearch", "arches_sear_graph_s_afd25b_idx"),
+    ("booleansearch", "arches_sear_graph_s_7d4115_idx"),
+    ("booleansearch", "arches_sear_graph_s_0d1840_idx"),
+    ("booleansearch", "arches_sear_graph_s_06e27b_idx"),
+    ("geometrysearch", "arches_sear_subject_geo_idx"),
+    ("filelistsearch", "afls_scope_idx"),
+    ("filelistsearch", "afls_subject_ext_idx"),
+    ("filelistsearch", "afls_subject_size_idx"),
+    ("filelistsearch", "afls_subject_mod_idx"),
+    ("filelistsearch", "afls_subject_name_trgm"),
+)
+
+
+def _scalar_indexes(model_name, prefix):
+    return [
+        (
+            model_name,
+            models.Index(fields=["node_key", "value"], name=f"{prefix}_nkey_val_idx"),
+        ),
+        (
+            model_name,
+            models.Index(
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name=f"{prefix}_nkey_subject_idx",
+            ),
+        ),
+        (
+            model_name,
+            models.Index(
+                fields=["node_key", "tileid", "value"],
+                name=f"{prefix}_nkey_tile_val_idx",
+            ),
+        ),
+    ]
+
+
+NODE_KEY_INDEXES = [
+    (
+        "termsearch",
+        models.Index(
+            fields=["node_key", "resourceinstanceid", "tileid"],
+            name="term_nkey_subject_idx",
+        ),
+    ),
+    (
+        "termsearch",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["node_key", "value"],
+            name="nkey_val",
+            opclasses=["int4_ops", "gin_trgm_ops"],
+        ),
+    ),
+    (
+        "termsearch",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["node_key", "language", "value"],
+            name="nkey_lang_val",
+            opclasses=["int4_ops", "text_ops", "gin_trgm_ops"],
+        ),
+    ),
+    (
+        "termsearch",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["node_key", "tileid", "value"],
+            name="nkey_tile_val",
+            opclasses=["int4_ops", "uuid_ops", "gin_trgm_ops"],
+        ),
+    ),
+    (
+        "termsearch",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["node_key", "tileid", "language", "value"],
+            name="nkey_tile_lang_val",
+            opclasses=["int4_ops", "uuid_ops", "text_ops", "gin_trgm_ops"],
+        ),
+    ),
+    *_scalar_indexes("numericsearch", "numeric"),
+    *_scalar_indexes("uuidsearch", "uuid"),
+    *_scalar_indexes("datesearch", "date"),
+    (
+        "daterangesearch",
+        models.Index(
+            fields=["node_key", "start_value", "end_value"],
+            name="daterange_nkey_range_idx",
+        ),
+    ),
+    (
+        "daterangesearch",
+        models.Index(
+            fields=["node_key", "resourceinstanceid", "tileid"],
+            name="daterange_nkey_subject_idx",
+        ),
+    ),
+    (
+        "daterangesearch",
+        models.Index(
+            fields=["node_key", "tileid", "start_value", "end_value"],
+            name="daterange_nkey_tile_range_idx",
+        ),
+    ),
+    (
+        "daterangesearch",
+        models.Index(fields=["node_key", "end_value"], name="daterange_nkey_end_idx"),
+    ),
+    *_scalar_indexes("booleansearch", "boolean"),
+    (
+        "geometrysearch",
+        models.Index(
+            fields=["node_key", "resourceinstanceid", "tileid"],
+            name="arches_sear_nkey_geo_idx",
+        ),
+    ),
+    (
+        "filelistsearch",
+        models.Index(
+            fields=["node_key", "resourceinstanceid", "tileid"],
+            name="afls_nkey_scope_idx",
+        ),
+    ),
+    (
+        "filelistsearch",
+        models.Index(fields=["node_key", "extension"], name="afls_nkey_ext_idx"),
+    ),
+    (
+        "filelistsearch",
+        models.Index(fields=["node_key", "file_size"], name="afls_nkey_size_idx"),
+    ),
+    (
+        "filelistsearch",
+        models.Index(fields=["node_key", "modified_at"], name="afls_nkey_mod_idx"),
+    ),
+    (
+        "filelistsearch",
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["node_key", "value"],
+            name="afls_nkey_name_trgm",
+            opclasses=["int4_ops", "gin_trgm_ops"],
+        ),
+    ),
+]
+
+
+def backfill_node_keys(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for _, table in SEARCH_TABLES:
+            cursor.execute(
+                "INSERT INTO arches_search_node_key (graph_slug, node_alias, datatype) "
+                f"SELECT DISTINCT graph_slug, node_alias, datatype FROM {table} "
+                "ON CONFLICT DO NOTHING"
+            )
+            cursor.execute(
+                f"UPDATE {table} AS t SET node_key = k.id "
+                "FROM arches_search_node_key AS k "
+                "WHERE k.graph_slug = t.graph_slug AND k.node_alias = t.node_alias "
+                "AND k.datatype = t.datatype"
+            )
+
+
+class Migration(migrations.Migration):
+    """Key search rows by a SearchNodeKey id and index them by it.
+
+    The graph_slug/node_alias-led indexes are dropped before the backfill so
+    the UPDATE does not maintain them.
+    """
+
+    dependencies = [
+        ("arches_search", "0025_tileindexfingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchNodeKey",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("graph_slug", models.TextField()),
+                ("node_alias", models.TextField()),
+                ("datatype", models.TextField()),
+            ],
+            options={
+                "db_table": "arches_search_node_key",
+                "managed": True,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("graph_slug", "node_alias", "datatype"),
+                        name="unique_search_node_key",
+                    )
+                ],
+            },
+        ),
+        *[
+            migrations.AddField(
+                model_name=model_name,
+                name="node_key",
+                field=models.IntegerField(null=True),
+            )
+            for model_name, _ in SEARCH_TABLES
+        ],
+        *[
+            migrations.RemoveIndex(model_name=model_name, name=name)
+            for model_name, name in REPLACED_INDEXES
+        ],
+        migrations.RunPython(backfill_node_keys, migrations.RunPython.noop),
+        *[
+            migrations.AlterField(
+                model_name=model_name,
+                name="node_key",
+                field=models.IntegerField(),
+            )
+            for model_name, _ in SEARCH_TABLES
+        ],
+        *[
+            migrations.AddIndex(model_name=model_name, index=index)
+            for model_name, index in NODE_KEY_INDEXES
+        ],
+    ]
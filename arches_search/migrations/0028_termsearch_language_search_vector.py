@@ -0,0 +1,79 @@
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchConfig
+from django.db import migrations, models
+
+# frozen copy of models.TEXT_SEARCH_CONFIGS
+TEXT_SEARCH_CONFIGS = {
+    "ar": "arabic",
+    "da": "danish",
+    "de": "german",
+    "el": "greek",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "ga": "irish",
+    "hu": "hungarian",
+    "id": "indonesian",
+    "it": "italian",
+    "lt": "lithuanian",
+    "ne": "nepali",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "ta": "tamil",
+    "tr": "turkish",
+}
+
+
+def _row_text_search_config():
+    return models.Case(
+        *[
+            models.When(
+                models.Q(language=code) | models.Q(language__startswith=f"{code}-"),
+                then=SearchConfig(config),
+            )
+            for code, config in TEXT_SEARCH_CONFIGS.items()
+        ],
+        default=SearchConfig("simple"),
+    )
+
+
+class Migration(migrations.Migration):
+    """Derive search_vector's text search config from each row's language.
+
+    The index over every row's search_vector is dropped; the partial indexes
+    per configured language are built CONCURRENTLY after migrate by
+    arches_search.indexing.language_indexes, or by
+    `manage.py arches_search sync_language_indexes`.
+    """
+
+    dependencies = [
+        ("arches_search", "0027_searchnodekey"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="termsearch",
+            name="arches_sear_search__40996d_gin",
+        ),
+        migrations.RemoveField(
+            model_name="termsearch",
+            name="search_vector",
+        ),
+        migrations.AddField(
+            model_name="termsearch",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "value", config=_row_text_search_config()
+                ),
+                null=True,
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_search", "0028_termsearch_language_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexCacheVersion",
+            fields=[
+                ("name", models.TextField(primary_key=True, serialize=False)),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "arches_search_cache_version",
+                "managed": True,
+            },
+        ),
+    ]
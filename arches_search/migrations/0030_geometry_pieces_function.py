@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """A set-returning function turning one GeoJSON geometry into the pieces
+    GeometrySearch stores.
+
+    Errors are caught per geometry: one that postgis cannot parse yields no
+    pieces, an invalid one is repaired with ST_MakeValid, and one that still
+    cannot be subdivided is stored whole, so a bad feature never fails the
+    rest of the batch.
+    """
+
+    dependencies = [
+        ("arches_search", "0029_indexcacheversion"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION arches_search_geometry_pieces(
+                geojson text, max_vertices integer
+            ) RETURNS SETOF geometry
+            LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE AS $$
+            DECLARE
+                geom geometry;
+                pieces geometry[];
+            BEGIN
+                BEGIN
+                    geom := ST_SetSRID(ST_GeomFromGeoJSON(geojson), 4326);
+                    IF NOT ST_IsValid(geom) THEN
+                        geom := ST_MakeValid(geom);
+                    END IF;
+                EXCEPTION WHEN OTHERS THEN
+                    RETURN;
+                END;
+                IF geom IS NULL OR ST_IsEmpty(geom) THEN
+                    RETURN;
+                END IF;
+                IF max_vertices > 0 THEN
+                    BEGIN
+                        pieces := ARRAY(SELECT ST_Subdivide(geom, max_vertices));
+                        RETURN QUERY SELECT unnest(pieces);
+                        RETURN;
+                    EXCEPTION WHEN OTHERS THEN
+                        NULL;
+                    END;
+                END IF;
+                RETURN NEXT geom;
+            END;
+            $$;
+            """,
+            "DROP FUNCTION IF EXISTS arches_search_geometry_pieces(text, integer);",
+        ),
+    ]
@@ -2,12 +2,12 @@ import uuid
 
 from django.contrib.gis.db.models import GeometryField
 from django.db import models
-from django.db.models import F
+from django.db.models import Case, F, Q, When
 from django.contrib.postgres.indexes import GinIndex, GistIndex
-from django.contrib.postgres.search import SearchVectorField
+from django.contrib.postgres.search import SearchConfig, SearchVectorField
 from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import gettext_lazy as _
-from django.utils.translation import get_language, get_language_info
+from django.utils.translation import get_language
 from arches.app.models.fields.i18n import I18n_TextField
 from django.contrib.postgres.search import SearchVector
 from django.conf import settings
@@ -94,31 +94,103 @@ class AdvancedSearchFacet(models.Model):
         return rows.filter(**{self.filter_field: resolved_language})
 
 
+class SearchNodeKey(models.Model):
+    """Dictionary of the (graph slug, node alias, datatype) triples of indexed
+    nodes; search rows refer to their node by this small integer id."""
+
+    id = models.AutoField(primary_key=True)
+    graph_slug = models.TextField()
+    node_alias = models.TextField()
+    datatype = models.TextField()
+
+    class Meta:
+        managed = True
+        db_table = "arches_search_node_key"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["graph_slug", "node_alias", "datatype"],
+                name="unique_search_node_key",
+            ),
+        ]
+
+
+# Postgres text search configs by language code (region subtags such as
+# "de-ch" use their base language). Languages without one are tokenized by
+# "simple", which does no stemming. Keep in step with migration 0028.
+TEXT_SEARCH_CONFIGS = {
+    "ar": "arabic",
+    "da": "danish",
+    "de": "german",
+    "el": "greek",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "ga": "irish",
+    "hu": "hungarian",
+    "id": "indonesian",
+    "it": "italian",
+    "lt": "lithuanian",
+    "ne": "nepali",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "ta": "tamil",
+    "tr": "turkish",
+}
+FALLBACK_TEXT_SEARCH_CONFIG = "simple"
+
+
+def text_search_config(language_code):
+    base_code = (language_code or "").lower().split("-")[0]
+    return TEXT_SEARCH_CONFIGS.get(base_code, FALLBACK_TEXT_SEARCH_CONFIG)
+
+
+def row_text_search_config():
+    """CASE expression picking the config for a TermSearch row's language.
+
+    Each branch is a regconfig literal so the generated column stays immutable.
+    """
+    return Case(
+        *[
+            When(
+                Q(language=code) | Q(language__startswith=f"{code}-"),
+                then=SearchConfig(config),
+            )
+            for code, config in TEXT_SEARCH_CONFIGS.items()
+        ],
+        default=SearchConfig(FALLBACK_TEXT_SEARCH_CONFIG),
+    )
+
+
+# Search rows reference their tile and resource with DO_NOTHING: postgres
+# removes them through ON DELETE CASCADE foreign keys (migration 0024), so
+# deleting a tile or resource never loads its search rows into python.
+# node_key is the row's SearchNodeKey id; queries and composite indexes use it
+# rather than the graph_slug/node_alias text columns.
 class TermSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     language = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.TextField()
     search_vector = models.GeneratedField(
         null=True,
         db_persist=True,
-        expression=SearchVector(
-            "value",
-            config=next(
-                (lang[1] for lang in settings.LANGUAGES if lang[0] == F("language")),
-                get_language_info(get_language())["name"].lower(),
-            ),
-        ),
+        expression=SearchVector("value", config=row_text_search_config()),
         output_field=SearchVectorField(),
     )
 
@@ -168,35 +240,29 @@ class TermSearch(models.Model):
             models.Index(fields=["node_alias"]),
             models.Index(fields=["language"]),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="term_nkey_subject_idx",
             ),
             GinIndex(
-                name="gslug_na_val",
-                fields=["graph_slug", "node_alias", "value"],
-                opclasses=["text_ops", "text_ops", "gin_trgm_ops"],
+                name="nkey_val",
+                fields=["node_key", "value"],
+                opclasses=["int4_ops", "gin_trgm_ops"],
             ),
             GinIndex(
-                name="gslug_na_lang_val",
-                fields=["graph_slug", "node_alias", "language", "value"],
-                opclasses=["text_ops", "text_ops", "text_ops", "gin_trgm_ops"],
+                name="nkey_lang_val",
+                fields=["node_key", "language", "value"],
+                opclasses=["int4_ops", "text_ops", "gin_trgm_ops"],
             ),
             GinIndex(
-                name="gslug_na_tile_val",
-                fields=["graph_slug", "node_alias", "tileid", "value"],
-                opclasses=["text_ops", "text_ops", "uuid_ops", "gin_trgm_ops"],
+                name="nkey_tile_val",
+                fields=["node_key", "tileid", "value"],
+                opclasses=["int4_ops", "uuid_ops", "gin_trgm_ops"],
             ),
             GinIndex(
-                name="gslug_na_tile_lang_val",
-                fields=["graph_slug", "node_alias", "tileid", "language", "value"],
-                opclasses=[
-                    "text_ops",
-                    "text_ops",
-                    "uuid_ops",
-                    "text_ops",
-                    "gin_trgm_ops",
-                ],
+                name="nkey_tile_lang_val",
+                fields=["node_key", "tileid", "language", "value"],
+                opclasses=["int4_ops", "uuid_ops", "text_ops", "gin_trgm_ops"],
             ),
-            GinIndex(fields=["search_vector"]),
             GinIndex(
                 name="term_value_trgm", fields=["value"], opclasses=["gin_trgm_ops"]
             ),
@@ -206,16 +272,17 @@ class TermSearch(models.Model):
 class NumericSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.DecimalField(decimal_places=10, max_digits=64)
 
     class Meta:
@@ -228,27 +295,32 @@ class NumericSearch(models.Model):
             models.Index(fields=["datatype"]),
             models.Index(fields=["node_alias"]),
             models.Index(fields=["value"]),
-            models.Index(fields=["graph_slug", "node_alias", "value"]),
+            models.Index(fields=["node_key", "value"], name="numeric_nkey_val_idx"),
+            models.Index(
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="numeric_nkey_subject_idx",
+            ),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "tileid", "value"],
+                name="numeric_nkey_tile_val_idx",
             ),
-            models.Index(fields=["graph_slug", "node_alias", "tileid", "value"]),
         ]
 
 
 class UUIDSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.UUIDField()
 
     class Meta:
@@ -261,27 +333,32 @@ class UUIDSearch(models.Model):
             models.Index(fields=["datatype"]),
             models.Index(fields=["node_alias"]),
             models.Index(fields=["value"]),
-            models.Index(fields=["graph_slug", "node_alias", "value"]),
+            models.Index(fields=["node_key", "value"], name="uuid_nkey_val_idx"),
+            models.Index(
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="uuid_nkey_subject_idx",
+            ),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "tileid", "value"],
+                name="uuid_nkey_tile_val_idx",
             ),
-            models.Index(fields=["graph_slug", "node_alias", "tileid", "value"]),
         ]
 
 
 class DateSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.BigIntegerField()
 
     class Meta:
@@ -294,11 +371,15 @@ class DateSearch(models.Model):
             models.Index(fields=["datatype"]),
             models.Index(fields=["node_alias"]),
             models.Index(fields=["value"]),
-            models.Index(fields=["graph_slug", "node_alias", "value"]),
+            models.Index(fields=["node_key", "value"], name="date_nkey_val_idx"),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="date_nkey_subject_idx",
+            ),
+            models.Index(
+                fields=["node_key", "tileid", "value"],
+                name="date_nkey_tile_val_idx",
             ),
-            models.Index(fields=["graph_slug", "node_alias", "tileid", "value"]),
         ]
 
     @classmethod
@@ -323,16 +404,17 @@ class DateSearch(models.Model):
 class DateRangeSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     start_value = models.BigIntegerField()
     end_value = models.BigIntegerField()
 
@@ -346,21 +428,20 @@ class DateRangeSearch(models.Model):
             models.Index(fields=["datatype"]),
             models.Index(fields=["node_alias"]),
             models.Index(
-                fields=["graph_slug", "node_alias", "start_value", "end_value"]
+                fields=["node_key", "start_value", "end_value"],
+                name="daterange_nkey_range_idx",
             ),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="daterange_nkey_subject_idx",
             ),
             models.Index(
-                fields=[
-                    "graph_slug",
-                    "node_alias",
-                    "tileid",
-                    "start_value",
-                    "end_value",
-                ]
+                fields=["node_key", "tileid", "start_value", "end_value"],
+                name="daterange_nkey_tile_range_idx",
+            ),
+            models.Index(
+                fields=["node_key", "end_value"], name="daterange_nkey_end_idx"
             ),
-            models.Index(fields=["graph_slug", "node_alias", "end_value"]),
         ]
 
     normalize_operands = DateSearch.normalize_operands
@@ -369,16 +450,17 @@ class DateRangeSearch(models.Model):
 class BooleanSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.BooleanField()
 
     class Meta:
@@ -391,27 +473,32 @@ class BooleanSearch(models.Model):
             models.Index(fields=["datatype"]),
             models.Index(fields=["node_alias"]),
             models.Index(fields=["value"]),
-            models.Index(fields=["graph_slug", "node_alias", "value"]),
+            models.Index(fields=["node_key", "value"], name="boolean_nkey_val_idx"),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"]
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="boolean_nkey_subject_idx",
+            ),
+            models.Index(
+                fields=["node_key", "tileid", "value"],
+                name="boolean_nkey_tile_val_idx",
             ),
-            models.Index(fields=["graph_slug", "node_alias", "tileid", "value"]),
         ]
 
 
 class GeometrySearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     geom = GeometryField(srid=4326, spatial_index=False)
 
     class Meta:
@@ -425,8 +512,8 @@ class GeometrySearch(models.Model):
             models.Index(fields=["tileid"], name="arches_sear_tileid_geo_idx"),
             models.Index(fields=["node_alias"], name="arches_sear_nodeal_geo_idx"),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"],
-                name="arches_sear_subject_geo_idx",
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="arches_sear_nkey_geo_idx",
             ),
             GistIndex(fields=["geom"], name="arches_sear_geom_gist_idx"),
         ]
@@ -435,16 +522,17 @@ class GeometrySearch(models.Model):
 class FileListSearch(models.Model):
     id = models.AutoField(primary_key=True)
     tileid = models.ForeignKey(
-        "models.Tile", on_delete=models.CASCADE, db_column="tileid"
+        "models.Tile", on_delete=models.DO_NOTHING, db_column="tileid"
     )
     resourceinstanceid = models.ForeignKey(
         "models.ResourceInstance",
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         db_column="resourceinstanceid",
     )
     graph_slug = models.TextField()
     node_alias = models.TextField()
     datatype = models.TextField()
+    node_key = models.IntegerField()
     value = models.TextField(null=True, blank=True)
     extension = models.TextField(null=True, blank=True)
     file_size = models.BigIntegerField(null=True, blank=True)
@@ -463,34 +551,103 @@ class FileListSearch(models.Model):
             models.Index(fields=["file_size"], name="afls_file_size_idx"),
             models.Index(fields=["modified_at"], name="afls_modified_at_idx"),
             models.Index(
-                fields=["graph_slug", "node_alias", "resourceinstanceid", "tileid"],
-                name="afls_scope_idx",
-            ),
-            models.Index(
-                fields=["graph_slug", "node_alias", "extension"],
-                name="afls_subject_ext_idx",
-            ),
-            models.Index(
-                fields=["graph_slug", "node_alias", "file_size"],
-                name="afls_subject_size_idx",
-            ),
-            models.Index(
-                fields=["graph_slug", "node_alias", "modified_at"],
-                name="afls_subject_mod_idx",
+                fields=["node_key", "resourceinstanceid", "tileid"],
+                name="afls_nkey_scope_idx",
             ),
+            models.Index(fields=["node_key", "extension"], name="afls_nkey_ext_idx"),
+            models.Index(fields=["node_key", "file_size"], name="afls_nkey_size_idx"),
+            models.Index(fields=["node_key", "modified_at"], name="afls_nkey_mod_idx"),
             GinIndex(
                 fields=["value"],
                 name="afls_value_trgm_idx",
                 opclasses=["gin_trgm_ops"],
             ),
             GinIndex(
-                fields=["graph_slug", "node_alias", "value"],
-                name="afls_subject_name_trgm",
-                opclasses=["text_ops", "text_ops", "gin_trgm_ops"],
+                fields=["node_key", "value"],
+                name="afls_nkey_name_trgm",
+                opclasses=["int4_ops", "gin_trgm_ops"],
             ),
         ]
 
 
+class IndexQueueEntry(models.Model):
+    tileid = models.UUIDField(primary_key=True)
+    queued_at = models.DateTimeField()
+
+    class Meta:
+        managed = True
+        db_table = "arches_search_index_queue"
+        indexes = [
+            models.Index(fields=["queued_at"], name="asiq_queued_at_idx"),
+        ]
+
+
+class TileIndexFingerprint(models.Model):
+    """Hash of the node values a tile's search rows were built from."""
+
+    # the ON DELETE CASCADE foreign key is added by migration 0025
+    tileid = models.OneToOneField(
+        "models.Tile",
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_column="tileid",
+        db_constraint=False,
+        related_name="+",
+    )
+    fingerprint = models.TextField()
+
+    class Meta:
+        managed = True
+        db_table = "arches_search_tile_fingerprint"
+
+
+class IndexCacheVersion(models.Model):
+    """Version counter of a per-process indexing cache.
+
+    Bumped when what the cache holds changes in the database, so every process
+    can notice and drop its copy.
+    """
+
+    name = models.TextField(primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        managed = True
+        db_table = "arches_search_cache_version"
+
+
+class ReindexWorkUnit(models.Model):
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+
+    id = models.AutoField(primary_key=True)
+    start_tileid = models.UUIDField(null=True)
+    end_tileid = models.UUIDField(null=True)
+    status = models.TextField(default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    leased_by = models.TextField(blank=True, default="")
+    leased_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    tile_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        managed = True
+        db_table = "arches_search_reindex_progress"
+        indexes = [
+            models.Index(fields=["status"], name="asrp_status_idx"),
+        ]
+
+    def tile_filter(self):
+        """Half-open [start_tileid, end_tileid) range; works on tiles and search rows."""
+        tile_range = Q()
+        if self.start_tileid is not None:
+            tile_range &= Q(tileid__gte=self.start_tileid)
+        if self.end_tileid is not None:
+            tile_range &= Q(tileid__lt=self.end_tileid)
+        return tile_range
+
+
 class SavedSearch(models.Model):
     savedsearchid = models.UUIDField(primary_key=True, default=uuid.uuid4)
     name = models.CharField(max_length=255)
@@ -295,6 +295,63 @@ BYPASS_REQUIRED_VALUE_TILE_VALIDATION = False
 # tiles are read and bulk-inserted in chunks of this size by each worker.
 INDEX_BATCH_SIZE = 2000
 
+# Each reindex worker writes its buffered search rows once it holds this many
+# rows or roughly this many bytes of them, whichever comes first.
+INDEX_FLUSH_MAX_ROWS = 50000
+INDEX_FLUSH_MAX_BYTES = 64 * 1024 * 1024
+
+# Reindex workers overlap reading tiles, running the indexers and writing rows
+# in separate threads joined by queues of at most this many batches (so a
+# worker holds up to about this many extra flushes in memory). 0 runs the
+# stages one after another.
+INDEX_PIPELINE_QUEUE_SIZE = 2
+
+# Parsed EDTF values kept per process by the date and edtf indexers; the hit
+# rate is reported at the end of a reindex.
+INDEX_EDTF_CACHE_SIZE = 100000
+
+# Concept values (labels and date ranges) kept per process by the concept
+# indexers; reindexes preload up to this many labels.
+INDEX_CONCEPT_CACHE_SIZE = 200000
+
+# Related resource names kept per process by the resource-instance indexers.
+INDEX_RESOURCE_NAME_CACHE_SIZE = 50000
+
+# Geometries are split into pieces of at most this many vertices when indexed
+# (postgis ST_Subdivide), so spatial filters test small bounding boxes rather
+# than those of whole parcels or coastlines. 0, the default, stores every
+# geometry whole; around 256 suits layers of large, detailed polygons.
+INDEX_GEOMETRY_MAX_VERTICES = 0
+
+# `reindex_database` splits the tiles into contiguous tileid ranges of about
+# this many tiles. Workers lease ranges from arches_search_reindex_progress, so
+# an interrupted reindex can pick up where it stopped with --resume.
+INDEX_WORK_UNIT_SIZE = 20000
+
+# Build the search tables list-partitioned on graph_slug, with one partition per
+# resource model (created when a graph is published) and a default partition.
+# Graph-scoped queries are then pruned to one partition and graph reindexes
+# TRUNCATE it. Takes effect on the next `reindex_database --shadow`, which also
+# converts partitioned tables back when it is turned off.
+SEARCH_PARTITION_BY_GRAPH = False
+
+# How SearchIndexingFunction.post_save updates the search tables:
+#   "sync"  - reindex the tile inside the save request (default)
+#   "async" - only record the tileid in arches_search_index_queue; the
+#             `drain-search-index-queue` celery beat task reindexes queued
+#             tiles in batches, so repeated edits to one tile are indexed once.
+#             The task is always scheduled and returns at once in "sync" mode,
+#             so a settings_local can switch modes on its own.
+SEARCH_INDEXING_MODE = "sync"
+SEARCH_INDEX_QUEUE_BATCH_SIZE = 500
+SEARCH_INDEX_QUEUE_DRAIN_INTERVAL = 10  # seconds
+
+# Extra or replacement search indexers, by datatype name:
+#   {"my-datatype": "my_app.indexers.MyDatatypeIndexing"}
+# Packages can also register them under the "arches_search.indexers" entry
+# point group (name: datatype, value: "module:Class"); this setting wins.
+SEARCH_INDEXERS = {}
+
 DATE_IMPORT_EXPORT_FORMAT = (
     "%Y-%m-%d"  # Custom date format for dates imported from and exported to csv
 )
@@ -344,6 +401,10 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": CELERY_SEARCH_EXPORT_CHECK,
         "args": ("Celery Beat is Running",),
     },
+    "drain-search-index-queue": {
+        "task": "arches_search.tasks.drain_search_index_queue",
+        "schedule": SEARCH_INDEX_QUEUE_DRAIN_INTERVAL,
+    },
 }
 
 # Set to True if you want to send celery tasks to the broker without being able to detect celery.
@@ -0,0 +1,49 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.db import OperationalError
+from arches.app.utils.task_management import check_if_celery_available
+
+from arches_search.indexing.index_queue import drain_index_queue
+from arches_search.indexing.partitions import ensure_graph_partitions
+from arches_search.indexing.resource_references import reindex_resource_references
+
+logger = logging.getLogger(__name__)
+
+
+def delay_or_run(task, *args):
+    """Queue task on a celery worker when one is reachable, else run it here.
+
+    Meant for on_commit callbacks: errors are logged rather than raised, as
+    the transaction that scheduled the task has already committed.
+    """
+    if check_if_celery_available():
+        try:
+            return task.delay(*args)
+        except Exception:
+            logger.exception("Could not queue %s; running it in process", task.name)
+    try:
+        return task(*args)
+    except Exception:
+        logger.exception("%s failed", task.name)
+
+
+@shared_task
+def drain_search_index_queue():
+    # scheduled in every mode; only "async" indexing queues tiles
+    if settings.SEARCH_INDEXING_MODE != "async":
+        return 0
+    return drain_index_queue()
+
+
+@shared_task
+def reindex_search_resource_references(resourceid):
+    return reindex_resource_references(resourceid)
+
+
+# on a lock timeout the graph's rows stay in the default partition until a retry
+# attaches its partition
+@shared_task(autoretry_for=(OperationalError,), retry_backoff=True, max_retries=5)
+def create_search_graph_partitions(graph_slug):
+    return [model._meta.db_table for model in ensure_graph_partitions(graph_slug)]
@@ -50,8 +50,9 @@ class LiteralClauseEvaluator:
         subject_node_alias: str,
     ) -> QuerySet:
         return model_class.objects.filter(
-            graph_slug=subject_graph_slug,
-            node_alias=subject_node_alias,
+            self.path_navigator.node_alias_datatype_registry.get_node_filter(
+                subject_graph_slug, subject_node_alias
+            )
         )
 
     def build_presence_subject_row_sets(
@@ -1,8 +1,10 @@
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from django.db.models import Q
 from django.utils.translation import gettext as _
 from arches.app.models import models as arches_models
 
+from arches_search.indexing.node_keys import keys_for_aliases
 from arches_search.utils.advanced_search.constants import (
     OPERAND_TYPE_PATH,
     SUBJECT_TYPE_NODE,
@@ -16,10 +18,12 @@ from arches_search.utils.advanced_search.relationship_utils import (
 class NodeAliasDatatypeRegistry:
     def __init__(self, payload_query: Optional[Dict[str, Any]] = None) -> None:
         self._graph_slug_node_alias_to_datatype: Dict[str, Dict[str, str]] = {}
+        self._node_keys: Dict[Tuple[str, str], List[int]] = {}
 
         if payload_query is not None:
             required_aliases_by_graph = self._collect_required_aliases(payload_query)
             self._preload_required_datatypes(required_aliases_by_graph)
+            self._preload_required_node_keys(required_aliases_by_graph)
 
     @property
     def datatype_cache_by_graph(self) -> Dict[str, Dict[str, str]]:
@@ -42,6 +46,38 @@ class NodeAliasDatatypeRegistry:
         cache_for_graph[node_alias] = datatype_name
         return datatype_name
 
+    def get_node_keys(self, graph_slug: str, node_alias: str) -> List[int]:
+        """SearchNodeKey ids of the node's search rows; empty if never indexed."""
+        pair = (graph_slug, node_alias)
+        if pair not in self._node_keys:
+            self._node_keys[pair] = keys_for_aliases([pair]).get(pair, [])
+        return self._node_keys[pair]
+
+    def get_node_filter(self, graph_slug: str, node_alias: str) -> Q:
+        """Filter selecting the node's search rows by their node_key."""
+        node_keys = self.get_node_keys(graph_slug, node_alias)
+        if not node_keys:
+            # never indexed, so nothing matches; avoid handing Django an
+            # empty IN list, which it cannot compile into a subquery
+            return Q(graph_slug=graph_slug, node_alias=node_alias)
+        # graph_slug lets postgres prune search tables partitioned by graph
+        return Q(graph_slug=graph_slug, node_key__in=node_keys)
+
+    def _preload_required_node_keys(
+        self, required_aliases_by_graph: Dict[str, Set[str]]
+    ) -> None:
+        pairs = [
+            (graph_slug, node_alias)
+            for graph_slug, node_aliases in required_aliases_by_graph.items()
+            for node_alias in node_aliases
+        ]
+        if not pairs:
+            return
+
+        keys = keys_for_aliases(pairs)
+        for pair in pairs:
+            self._node_keys[pair] = keys.get(pair, [])
+
     def _preload_required_datatypes(
         self, required_aliases_by_graph: Dict[str, Set[str]]
     ) -> None:
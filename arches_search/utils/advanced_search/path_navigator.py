@@ -52,8 +52,9 @@ class PathNavigator:
                 )
             )
         terminal_queryset = terminal_search_model.objects.filter(
-            graph_slug=terminal_graph_slug,
-            node_alias=terminal_node_alias,
+            self.node_alias_datatype_registry.get_node_filter(
+                terminal_graph_slug, terminal_node_alias
+            )
         ).order_by()
         return terminal_datatype_name, terminal_graph_slug, terminal_queryset
 
@@ -99,11 +99,15 @@ class RelatedClauseEvaluator:
             )
         )
         facet = self.facet_registry.get_facet(datatype_name, operator_token)
+        subject_filter = (
+            self.path_navigator.node_alias_datatype_registry.get_node_filter(
+                subject_graph_slug, subject_node_alias
+            )
+        )
         if not operand_items:
             correlated_subject_row_sets = [
                 model_class.objects.filter(
-                    graph_slug=subject_graph_slug,
-                    node_alias=subject_node_alias,
+                    subject_filter,
                     resourceinstanceid=OuterRef(traversal_context["child_id_field"]),
                 ).annotate(
                     _anchor_resource_id=OuterRef(traversal_context["anchor_id_field"])
@@ -121,9 +125,7 @@ class RelatedClauseEvaluator:
             return any_value_exists if presence_implies_match else ~any_value_exists
 
         model_class = facet.target_model_class
-        subject_rows = model_class.objects.filter(
-            graph_slug=subject_graph_slug, node_alias=subject_node_alias
-        )
+        subject_rows = model_class.objects.filter(subject_filter)
 
         correlated_subject_rows = subject_rows.filter(
             resourceinstanceid=OuterRef(traversal_context["child_id_field"])
@@ -1,5 +1,20 @@
+from django.conf import settings
 from django.contrib.postgres.search import SearchQuery
 from django.db.models import Q
+from django.utils.translation import get_language
+
+from arches_search.models.models import text_search_config
+
+
+def active_search_language():
+    """The configured language code matching the active language, falling back
+    to its base language and then LANGUAGE_CODE."""
+    language_code = get_language() or settings.LANGUAGE_CODE
+    configured = {code for code, _ in settings.LANGUAGES}
+    for candidate in (language_code, language_code.split("-")[0]):
+        if candidate in configured:
+            return candidate
+    return settings.LANGUAGE_CODE
 
 
 def build_term_match_filter(term_text):
@@ -7,6 +22,21 @@ def build_term_match_filter(term_text):
     Q object matching TermSearch rows whose value either full-text-matches
     term_text (stemmed, whole-lexeme) or contains it as a substring
     (backed by the existing gin_trgm_ops index on TermSearch.value).
+
+    Full-text matching covers rows in the active language, parsed with that
+    language's config, and rows without a language (concepts, non-localized
+    strings, urls, numbers), parsed like their vectors with the fallback
+    config. Each set has a partial index of its own.
     """
-    full_text_query = SearchQuery(term_text, search_type="plain", config="english")
-    return Q(search_vector=full_text_query) | Q(value__icontains=term_text)
+    language_code = active_search_language()
+    full_text_query = SearchQuery(
+        term_text, search_type="plain", config=text_search_config(language_code)
+    )
+    unlocalized_query = SearchQuery(
+        term_text, search_type="plain", config=text_search_config("")
+    )
+    return (
+        Q(language=language_code, search_vector=full_text_query)
+        | Q(language="", search_vector=unlocalized_query)
+        | Q(value__icontains=term_text)
+    )
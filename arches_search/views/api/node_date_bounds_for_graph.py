@@ -8,6 +8,7 @@ from arches.app.models import models as arches_models
 from arches.app.utils.response import JSONErrorResponse, JSONResponse
 from arches.app.views.api import APIBase
 
+from arches_search.indexing.node_keys import keys_for_aliases
 from arches_search.models.models import DateRangeSearch, DateSearch
 
 logger = logging.getLogger(__name__)
@@ -40,9 +41,11 @@ class NodeDateBoundsForGraphAPI(APIBase):
         else:
             date_node_aliases = list(all_date_node_aliases)
 
+        node_keys = keys_for_aliases(
+            (graph_slug, node_alias) for node_alias in date_node_aliases
+        )
         node_alias_filter = {
-            "graph_slug": graph_slug,
-            "node_alias__in": date_node_aliases,
+            "node_key__in": [key for keys in node_keys.values() for key in keys],
         }
 
         date_search_bounds = DateSearch.objects.filter(**node_alias_filter).aggregate(
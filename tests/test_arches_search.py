@@ -1,13 +1,18 @@
 """Tests for the arches_search management command."""
 
 import io
+import tempfile
 import uuid
+from unittest import mock
 
 from django.core.management import call_command
-from django.test import TestCase
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from arches.app.models.models import (
     GraphModel,
+    GraphXPublishedGraph,
     Node,
     NodeGroup,
     ResourceInstance,
@@ -15,18 +20,55 @@ from arches.app.models.models import (
 )
 from arches.app.models.system_settings import settings
 
+from arches_search.indexing.copy_writer import copy_fields
+from arches_search.indexing.index_from_tile import (
+    index_from_tile,
+    save_index_records,
+)
+from arches_search.indexing.language_indexes import (
+    language_index_name,
+    sync_language_indexes,
+)
+from arches_search.indexing.partitions import (
+    _partition_published_graph,
+    default_partition_name,
+    ensure_graph_partitions,
+    partition_name,
+    truncate_graph_partitions,
+)
+from arches_search.indexing.shadow_tables import (
+    SHADOW_SUFFIX,
+    create_shadow_tables,
+    finalize_shadow_tables,
+    swap_shadow_tables,
+    writing_to_shadow_tables,
+)
+from arches_search.indexing.indexing_factory import IndexingFactory
 from arches_search.management.commands.arches_search import (
     SEARCH_MODELS,
     _build_nodegroup_cache,
+    _index_work_units,
+    _tiles_to_index,
+)
+from arches_search.indexing.work_units import (
+    complete_work_unit,
+    lease_work_unit,
+    plan_work_units,
+)
+from arches_search.models.models import (
+    BooleanSearch,
+    DateSearch,
+    NumericSearch,
+    ReindexWorkUnit,
+    TermSearch,
 )
-from arches_search.models.models import TermSearch
 
 
-class SearchCommandTestCaseBase(TestCase):
+class SearchFixtureMixin:
     """Minimal graph → nodegroup → node → resource → tile fixture."""
 
     @classmethod
-    def setUpTestData(cls):
+    def create_search_fixture(cls):
         cls.graph = GraphModel.objects.create(
             graphid=uuid.uuid4(),
             slug="test-search",
@@ -61,6 +103,12 @@ class SearchCommandTestCaseBase(TestCase):
         )
 
 
+class SearchCommandTestCaseBase(SearchFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_search_fixture()
+
+
 class ReindexHappyPathTests(SearchCommandTestCaseBase):
     """End-to-end behavior of `arches_search reindex_database`."""
 
@@ -73,6 +121,405 @@ class ReindexHappyPathTests(SearchCommandTestCaseBase):
         self.assertIn("hello world", values)
 
 
+class CopyWriterReindexTests(SearchCommandTestCaseBase):
+    """`--writer=copy` must produce the same rows as the bulk_create path."""
+
+    def test_copy_writer_skips_generated_and_serial_columns(self):
+        columns = [field.column for field in copy_fields(TermSearch)]
+
+        self.assertNotIn("id", columns)
+        self.assertNotIn("search_vector", columns)
+        self.assertIn("tileid", columns)
+
+    def _assert_reindex_with_copy_writer(self, copy_format):
+        # one reindex per test: a second TRUNCATE would hit the pending
+        # deferred FK trigger events left by the first load
+        call_command(
+            "arches_search",
+            "reindex_database",
+            "--writer=copy",
+            f"--copy-format={copy_format}",
+            stdout=io.StringIO(),
+        )
+
+        rows = TermSearch.objects.filter(tileid=self.tile.tileid)
+        self.assertEqual(list(rows.values_list("value", flat=True)), ["hello world"])
+        self.assertIsNotNone(rows.get().search_vector)
+
+    def test_reindex_with_text_copy_writer(self):
+        self._assert_reindex_with_copy_writer("text")
+
+    def test_reindex_with_binary_copy_writer(self):
+        self._assert_reindex_with_copy_writer("binary")
+
+
+class SetBasedReindexTests(SearchCommandTestCaseBase):
+    """`--set-based` builds scalar rows in SQL, matching the python indexers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        nodes = {}
+        for datatype in ("number", "boolean", "date", "url", "non-localized-string"):
+            alias = datatype.replace("-", "_")
+            nodes[datatype] = Node.objects.create(
+                nodeid=uuid.uuid4(),
+                name=alias,
+                alias=alias,
+                datatype=datatype,
+                graph=cls.graph,
+                nodegroup=cls.nodegroup,
+                istopnode=False,
+            )
+        cls.tile.data.update(
+            {
+                str(nodes["number"].nodeid): 12.5,
+                str(nodes["boolean"].nodeid): False,
+                str(nodes["url"].nodeid): {
+                    "url": "https://example.org",
+                    "url_label": "Example",
+                },
+                str(nodes["non-localized-string"].nodeid): "ABC-123",
+            }
+        )
+        cls.tile.save()
+        cls.date_node = nodes["date"]
+        cls.edtf_tile = TileModel.objects.create(
+            tileid=uuid.uuid4(),
+            nodegroup=cls.nodegroup,
+            resourceinstance=cls.resource_instance,
+            data={str(cls.date_node.nodeid): "1850~"},
+            provisionaledits=None,
+        )
+        cls.iso_tile = TileModel.objects.create(
+            tileid=uuid.uuid4(),
+            nodegroup=cls.nodegroup,
+            resourceinstance=cls.resource_instance,
+            data={str(cls.date_node.nodeid): "2024-02-29T10:30:00Z"},
+            provisionaledits=None,
+        )
+
+    def test_set_based_rows_match_python_indexers(self):
+        expected = {}
+        for tile in (self.tile, self.edtf_tile, self.iso_tile):
+            for row in index_from_tile(tile, delete_existing=False):
+                expected.setdefault(type(row), []).append(
+                    (row.tileid_id, row.node_alias, row.datatype, row.value)
+                )
+        expected = {model: sorted(rows) for model, rows in expected.items()}
+
+        call_command(
+            "arches_search", "reindex_database", "--set-based", stdout=io.StringIO()
+        )
+
+        for model, rows in expected.items():
+            self.assertEqual(
+                sorted(
+                    model.objects.values_list(
+                        "tileid", "node_alias", "datatype", "value"
+                    ).order_by()
+                ),
+                rows,
+            )
+        self.assertEqual(
+            TermSearch.objects.get(node_alias="search_test_node").language, "en"
+        )
+        self.assertEqual(
+            DateSearch.objects.get(tileid=self.iso_tile.tileid).value, 20240229
+        )
+        self.assertTrue(DateSearch.objects.filter(tileid=self.edtf_tile.tileid))
+
+    def test_set_based_cannot_be_resumed(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "arches_search",
+                "reindex_database",
+                "--set-based",
+                "--resume",
+                stdout=io.StringIO(),
+            )
+
+
+class SearchRowCascadeTests(SearchCommandTestCaseBase):
+    """Postgres, not Django's collector, removes search rows of deleted tiles."""
+
+    def setUp(self):
+        save_index_records(index_from_tile(self.tile, delete_existing=False))
+
+    def test_deleting_a_tile_cascades_in_the_database(self):
+        self.assertTrue(TermSearch.objects.filter(tileid=self.tile.tileid).exists())
+
+        TileModel.objects.filter(tileid=self.tile.tileid).delete()
+
+        self.assertFalse(TermSearch.objects.filter(tileid=self.tile.tileid).exists())
+
+    def test_purge_graph(self):
+        out = io.StringIO()
+        call_command(
+            "arches_search", "purge_graph", f"--graph={self.graph.slug}", stdout=out
+        )
+
+        self.assertIn("Deleted 1 search row(s)", out.getvalue())
+        self.assertFalse(
+            TermSearch.objects.filter(
+                resourceinstanceid=self.resource_instance.resourceinstanceid
+            ).exists()
+        )
+
+
+class ShadowReindexTests(SearchCommandTestCaseBase):
+    """`--shadow` rebuilds into copies of the search tables and swaps them in."""
+
+    def _index_names(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = %s", [table]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_shadow_reindex_populates_and_keeps_indexes(self):
+        table = TermSearch._meta.db_table
+        indexes_before = self._index_names(table)
+
+        call_command(
+            "arches_search", "reindex_database", "--shadow", stdout=io.StringIO()
+        )
+
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertEqual(list(values), ["hello world"])
+        self.assertEqual(self._index_names(table), indexes_before)
+        self.assertEqual(TermSearch._meta.db_table, table)
+        self.assertNotIn(
+            f"{table}{SHADOW_SUFFIX}", connection.introspection.table_names()
+        )
+
+
+class PartitionedSearchTableTests(SearchCommandTestCaseBase):
+    """Search tables list-partitioned on graph_slug by a shadow rebuild."""
+
+    def _count(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def _swap_in_partitioned(self, load):
+        create_shadow_tables([TermSearch], partition_by_graph=True)
+        with writing_to_shadow_tables([TermSearch]):
+            load()
+        finalize_shadow_tables([TermSearch])
+        swap_shadow_tables([TermSearch])
+
+    def test_graph_rows_land_in_their_partition_and_can_be_truncated(self):
+        table = TermSearch._meta.db_table
+        self._swap_in_partitioned(
+            lambda: save_index_records(
+                index_from_tile(self.tile, delete_existing=False)
+            )
+        )
+
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertEqual(list(values), ["hello world"])
+        self.assertEqual(self._count(partition_name(table, self.graph.slug)), 1)
+
+        self.assertTrue(truncate_graph_partitions(self.graph.slug, [TermSearch]))
+        self.assertFalse(TermSearch.objects.exists())
+
+    def test_partitioned_foreign_keys_are_checked_before_the_swap_lock(self):
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            self._swap_in_partitioned(
+                lambda: save_index_records(
+                    index_from_tile(self.tile, delete_existing=False)
+                )
+            )
+
+        lock = next(i for i, sql in enumerate(statements) if sql.startswith("LOCK"))
+        foreign_keys = [i for i, sql in enumerate(statements) if "FOREIGN KEY" in sql]
+        self.assertTrue(foreign_keys)
+        self.assertLess(max(foreign_keys), lock)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_constraint WHERE conrelid = %s::regclass "
+                "AND contype = 'f' AND NOT convalidated",
+                [TermSearch._meta.db_table],
+            )
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_publishing_moves_a_graphs_rows_out_of_the_default_partition(self):
+        table = TermSearch._meta.db_table
+        late_slug = "test-search-late"
+
+        def load():
+            # published after the tables were partitioned
+            GraphModel.objects.create(
+                graphid=uuid.uuid4(), slug=late_slug, isresource=True
+            )
+            TermSearch.objects.create(
+                tileid=self.tile,
+                resourceinstanceid=self.resource_instance,
+                graph_slug=late_slug,
+                node_alias="late_node",
+                language="en",
+                datatype="string",
+                value="late",
+            )
+
+        self._swap_in_partitioned(load)
+        self.assertEqual(self._count(default_partition_name(table)), 1)
+
+        self.assertEqual(ensure_graph_partitions(late_slug), [TermSearch])
+
+        self.assertEqual(self._count(default_partition_name(table)), 0)
+        self.assertEqual(self._count(partition_name(table, late_slug)), 1)
+        self.assertEqual(ensure_graph_partitions(late_slug), [])
+        # the prebuilt indexes were linked to the parent's, not duplicated
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*), count(h.inhparent) FROM pg_index i "
+                "LEFT JOIN pg_inherits h ON h.inhrelid = i.indexrelid "
+                "WHERE i.indrelid = %s::regclass",
+                [partition_name(table, late_slug)],
+            )
+            indexes, attached = cursor.fetchone()
+            cursor.execute(
+                "SELECT count(*) FROM pg_index WHERE indrelid = %s::regclass",
+                [table],
+            )
+            self.assertEqual((indexes, attached), (cursor.fetchone()[0],) * 2)
+
+    def _publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            _partition_published_graph(
+                GraphXPublishedGraph,
+                mock.Mock(graph=self.graph),
+                created=True,
+            )
+
+    def test_publishing_hands_partitioning_to_a_worker(self):
+        with (
+            mock.patch(
+                "arches_search.tasks.check_if_celery_available", return_value=True
+            ),
+            mock.patch(
+                "arches_search.tasks.create_search_graph_partitions.delay"
+            ) as delay,
+        ):
+            self._publish()
+
+        delay.assert_called_once_with(self.graph.slug)
+
+    def test_publishing_partitions_in_process_when_the_broker_is_unreachable(self):
+        with (
+            mock.patch(
+                "arches_search.tasks.check_if_celery_available", return_value=True
+            ),
+            mock.patch(
+                "arches_search.tasks.create_search_graph_partitions.delay",
+                side_effect=ConnectionError,
+            ),
+            mock.patch("arches_search.tasks.ensure_graph_partitions") as ensure,
+            self.assertLogs("arches_search.tasks", "ERROR"),
+        ):
+            self._publish()
+
+        ensure.assert_called_once_with(self.graph.slug)
+
+
+class ScopedReindexTests(SearchCommandTestCaseBase):
+    """Scoped reindexes only delete and rebuild the rows they select."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_graph = GraphModel.objects.create(
+            graphid=uuid.uuid4(),
+            slug="test-search-other",
+            isresource=True,
+        )
+        cls.other_resource = ResourceInstance.objects.create(
+            resourceinstanceid=uuid.uuid4(),
+            graph=cls.other_graph,
+        )
+        cls.other_tile = TileModel.objects.create(
+            tileid=uuid.uuid4(),
+            nodegroup=cls.nodegroup,
+            resourceinstance=cls.other_resource,
+            data={},
+            provisionaledits=None,
+        )
+
+    def setUp(self):
+        self.untouched_row = TermSearch.objects.create(
+            tileid_id=self.other_tile.tileid,
+            resourceinstanceid_id=self.other_resource.resourceinstanceid,
+            graph_slug=self.other_graph.slug,
+            node_alias="other_node",
+            language="en",
+            datatype="string",
+            value="out of scope",
+        )
+        self.stale_row = TermSearch.objects.create(
+            tileid_id=self.tile.tileid,
+            resourceinstanceid_id=self.resource_instance.resourceinstanceid,
+            graph_slug="renamed-graph",
+            node_alias="renamed_node",
+            language="en",
+            datatype="string",
+            value="stale",
+        )
+
+    def _assert_only_scope_rebuilt(self):
+        self.assertTrue(TermSearch.objects.filter(pk=self.untouched_row.pk).exists())
+        self.assertFalse(TermSearch.objects.filter(pk=self.stale_row.pk).exists())
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertEqual(list(values), ["hello world"])
+
+    def test_graph_scope(self):
+        call_command(
+            "arches_search",
+            "reindex_database",
+            f"--graph={self.graph.slug}",
+            stdout=io.StringIO(),
+        )
+
+        self._assert_only_scope_rebuilt()
+
+    def test_resource_file_scope(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as resource_file:
+            resource_file.write(f"{self.resource_instance.resourceinstanceid}\n")
+            resource_file.flush()
+
+            call_command(
+                "arches_search",
+                "reindex_database",
+                f"--resource-file={resource_file.name}",
+                stdout=io.StringIO(),
+            )
+
+        self._assert_only_scope_rebuilt()
+
+    def test_scope_cannot_be_combined_with_shadow(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "arches_search",
+                "reindex_database",
+                "--shadow",
+                f"--graph={self.graph.slug}",
+                stdout=io.StringIO(),
+            )
+
+
 class TransactionDetectionTests(SearchCommandTestCaseBase):
     """The command must detect an open transaction (TestCase wrap) and
     fall back to keep-indexes, otherwise CREATE INDEX collides with
@@ -122,9 +569,9 @@ class BuildNodegroupCacheTests(SearchCommandTestCaseBase):
                 )
 
 
-class HashShardingPartitionTests(SearchCommandTestCaseBase):
-    """The SQL hash filter used by multiprocess workers must partition tiles
-    cleanly: every tile lands in exactly one worker's shard."""
+class WorkUnitPartitionTests(SearchCommandTestCaseBase):
+    """The tileid ranges leased by reindex workers must partition tiles
+    cleanly: every tile lands in exactly one work unit."""
 
     @classmethod
     def setUpTestData(cls):
@@ -145,38 +592,172 @@ class HashShardingPartitionTests(SearchCommandTestCaseBase):
                 provisionaledits=None,
             )
 
-    def _shard_count(self, worker_id, num_workers):
-        return (
-            TileModel.objects.exclude(
-                resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
-            )
-            .extra(
-                where=["abs(hashtext(tileid::text)::bigint) %% %s = %s"],
-                params=[num_workers, worker_id],
-            )
-            .count()
+    def test_work_units_sum_to_total_tile_count(self):
+        tiles = TileModel.objects.exclude(
+            resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
         )
+        total = tiles.count()
 
-    def test_shards_sum_to_total_tile_count(self):
-        total = TileModel.objects.exclude(
-            resourceinstance_id=settings.SYSTEM_SETTINGS_RESOURCE_ID
-        ).count()
+        for unit_size in (total, 4, 2, 1):
+            with self.subTest(unit_size=unit_size):
+                unit_count = plan_work_units(total, unit_size=unit_size)
+                units = list(ReindexWorkUnit.objects.order_by("id"))
+                self.assertEqual(len(units), unit_count)
 
-        for num_workers in (1, 2, 4, 8):
-            with self.subTest(num_workers=num_workers):
-                summed = sum(
-                    self._shard_count(worker_id, num_workers)
-                    for worker_id in range(num_workers)
-                )
+                summed = sum(tiles.filter(unit.tile_filter()).count() for unit in units)
                 self.assertEqual(
                     summed,
                     total,
                     msg=(
-                        f"Hash sharding across {num_workers} workers did not "
-                        f"cover every tile (sum={summed}, total={total})."
+                        f"{unit_count} work units did not cover every tile "
+                        f"exactly once (sum={summed}, total={total})."
                     ),
                 )
 
+    def test_finished_units_are_not_leased_again(self):
+        plan_work_units(1)
+        unit = lease_work_unit("test-worker")
+        complete_work_unit(unit, 1)
+
+        self.assertIsNone(lease_work_unit("test-worker"))
+
+    def test_resume_releases_interrupted_units(self):
+        plan_work_units(1)
+        lease_work_unit("dead-worker")
+
+        out = io.StringIO()
+        call_command("arches_search", "reindex_database", "--resume", stdout=out)
+
+        self.assertIn("Resuming: 0/1 work unit(s)", out.getvalue())
+        unit = ReindexWorkUnit.objects.get()
+        self.assertEqual(unit.status, ReindexWorkUnit.DONE)
+        self.assertEqual(unit.attempts, 2)
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertEqual(list(values), ["hello world"])
+
+
+class PipelinedReindexTests(SearchFixtureMixin, TransactionTestCase):
+    """The reader/indexer/writer pipeline, which needs committed fixture rows:
+    its threads use their own database connections."""
+
+    serialized_rollback = True
+
+    def setUp(self):
+        self.create_search_fixture()
+
+    def _index_pipelined(self):
+        plan_work_units(1)
+        return _index_work_units(
+            IndexingFactory(), _build_nodegroup_cache(), pipelined=True
+        )
+
+    def test_pipelined_reindex_writes_rows_and_completes_units(self):
+        tile_count, _ = self._index_pipelined()
+
+        self.assertEqual(tile_count, _tiles_to_index().count())
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertEqual(list(values), ["hello world"])
+        unit = ReindexWorkUnit.objects.get()
+        self.assertEqual(unit.status, ReindexWorkUnit.DONE)
+        self.assertEqual(unit.tile_count, tile_count)
+
+    def test_indexer_errors_stop_the_pipeline(self):
+        with mock.patch(
+            "arches_search.management.commands.arches_search.index_from_tile",
+            side_effect=RuntimeError("indexer failed"),
+        ):
+            with self.assertRaisesMessage(RuntimeError, "indexer failed"):
+                self._index_pipelined()
+
+        self.assertEqual(ReindexWorkUnit.objects.get().status, ReindexWorkUnit.LEASED)
+        self.assertFalse(TermSearch.objects.exists())
+
+    def test_writer_errors_are_raised_in_the_caller(self):
+        with mock.patch(
+            "arches_search.management.commands.arches_search._write_values",
+            side_effect=RuntimeError("writer failed"),
+        ):
+            with self.assertRaisesMessage(RuntimeError, "writer failed"):
+                self._index_pipelined()
+
+        self.assertEqual(ReindexWorkUnit.objects.get().status, ReindexWorkUnit.LEASED)
+
+
+class LanguageIndexSyncTests(TransactionTestCase):
+    """Outside a transaction the language indexes are built CONCURRENTLY."""
+
+    def _language_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = %s::regclass",
+                [TermSearch._meta.db_table],
+            )
+            return dict(cursor.fetchall())
+
+    def _sync_without_the_english_index(self):
+        """Drop the "en" index and sync to English alone; the statements run."""
+        # restore the indexes of the other configured languages
+        self.addCleanup(sync_language_indexes)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DROP INDEX IF EXISTS "
+                + connection.ops.quote_name(language_index_name("en"))
+            )
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with (
+            override_settings(LANGUAGES=[("en", "English")]),
+            connection.execute_wrapper(record),
+        ):
+            call_command("arches_search", "sync_language_indexes", stdout=io.StringIO())
+        return "\n".join(statements)
+
+    def _rebuild_term_search(self, partition_by_graph):
+        create_shadow_tables([TermSearch], partition_by_graph=partition_by_graph)
+        finalize_shadow_tables([TermSearch])
+        swap_shadow_tables([TermSearch])
+
+    def test_sync_builds_valid_indexes_without_a_transaction(self):
+        name = language_index_name("en")
+
+        statements = self._sync_without_the_english_index()
+
+        self.assertIn(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {connection.ops.quote_name(name)}",
+            statements,
+        )
+        indexes = self._language_indexes()
+        self.assertTrue(indexes[name])
+        self.assertTrue(indexes[language_index_name("")])
+
+    def test_partitioned_tables_are_indexed_partition_by_partition(self):
+        name = language_index_name("en")
+        self._rebuild_term_search(partition_by_graph=True)
+        self.addCleanup(self._rebuild_term_search, partition_by_graph=False)
+
+        statements = self._sync_without_the_english_index()
+
+        self.assertIn(
+            f"ON ONLY {connection.ops.quote_name(TermSearch._meta.db_table)}",
+            statements,
+        )
+        self.assertIn("ATTACH PARTITION", statements)
+        self.assertNotIn(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {connection.ops.quote_name(name)} ",
+            statements,
+        )
+        self.assertTrue(self._language_indexes()[name])
+
 
 class DeleteIndexesTests(SearchCommandTestCaseBase):
     """`delete_indexes` (TRUNCATE) issues TRUNCATE on every search table."""
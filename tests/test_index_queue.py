@@ -0,0 +1,137 @@
+"""Tests for the deferred (async) search index queue."""
+
+import io
+import uuid
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from arches.app.models.models import (
+    GraphModel,
+    Node,
+    NodeGroup,
+    ResourceInstance,
+    TileModel,
+)
+
+from arches_search.functions.search_indexing import SearchIndexingFunction
+from arches_search.indexing.index_from_tile import save_grouped_index_records
+from arches_search.indexing.index_queue import (
+    drain_index_queue,
+    enqueue_tiles,
+    queue_depth,
+)
+from arches_search.models.models import IndexQueueEntry, TermSearch
+from arches_search.tasks import drain_search_index_queue
+
+
+class IndexQueueTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.graph = GraphModel.objects.create(
+            graphid=uuid.uuid4(),
+            slug="test-index-queue",
+            isresource=True,
+        )
+        cls.nodegroup = NodeGroup.objects.create(
+            nodegroupid=uuid.uuid4(),
+        )
+        cls.string_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="queue_string_node",
+            alias="queue_string_node",
+            datatype="string",
+            graph=cls.graph,
+            nodegroup=cls.nodegroup,
+            istopnode=True,
+        )
+        cls.resource_instance = ResourceInstance.objects.create(
+            resourceinstanceid=uuid.uuid4(),
+            graph=cls.graph,
+        )
+        cls.tile = TileModel.objects.create(
+            tileid=uuid.uuid4(),
+            nodegroup=cls.nodegroup,
+            resourceinstance=cls.resource_instance,
+            data={
+                str(cls.string_node.nodeid): {
+                    "en": {"value": "queued value", "direction": "ltr"},
+                },
+            },
+            provisionaledits=None,
+        )
+
+    def test_repeated_enqueues_coalesce_to_one_entry(self):
+        enqueue_tiles([self.tile.tileid])
+        enqueue_tiles([self.tile.tileid])
+
+        self.assertEqual(queue_depth(), 1)
+
+    @override_settings(SEARCH_INDEXING_MODE="async")
+    def test_async_post_save_only_enqueues(self):
+        SearchIndexingFunction().post_save(self.tile)
+
+        self.assertTrue(
+            IndexQueueEntry.objects.filter(tileid=self.tile.tileid).exists()
+        )
+        self.assertFalse(TermSearch.objects.filter(tileid=self.tile.tileid).exists())
+
+    def test_drain_indexes_and_empties_queue(self):
+        enqueue_tiles([self.tile.tileid])
+
+        drained = drain_index_queue(batch_size=1)
+
+        self.assertEqual(drained, 1)
+        self.assertEqual(queue_depth(), 0)
+        values = TermSearch.objects.filter(tileid=self.tile.tileid).values_list(
+            "value", flat=True
+        )
+        self.assertIn("queued value", values)
+
+    def test_scheduled_drain_only_runs_in_async_mode(self):
+        enqueue_tiles([self.tile.tileid])
+
+        with override_settings(SEARCH_INDEXING_MODE="sync"):
+            self.assertEqual(drain_search_index_queue(), 0)
+        self.assertEqual(queue_depth(), 1)
+
+        with override_settings(SEARCH_INDEXING_MODE="async"):
+            self.assertEqual(drain_search_index_queue(), 1)
+        self.assertEqual(queue_depth(), 0)
+
+    def test_tiles_requeued_during_a_batch_keep_their_entry(self):
+        enqueue_tiles([self.tile.tileid])
+        requeued = []
+
+        def save_and_requeue(grouped):
+            save_grouped_index_records(grouped)
+            if not requeued:
+                # an edit committed while the batch was being indexed
+                enqueue_tiles([self.tile.tileid])
+                requeued.append(self.tile.tileid)
+
+        with mock.patch(
+            "arches_search.indexing.index_queue.save_grouped_index_records",
+            side_effect=save_and_requeue,
+        ):
+            drained = drain_index_queue(batch_size=1)
+
+        self.assertEqual(drained, 2)
+        self.assertEqual(queue_depth(), 0)
+
+    def test_drain_purges_rows_of_deleted_tiles(self):
+        missing_tileid = uuid.uuid4()
+        enqueue_tiles([missing_tileid])
+
+        self.assertEqual(drain_index_queue(), 1)
+        self.assertEqual(queue_depth(), 0)
+
+    def test_flush_index_queue_command(self):
+        enqueue_tiles([self.tile.tileid])
+        out = io.StringIO()
+
+        call_command("arches_search", "flush_index_queue", stdout=out)
+
+        self.assertIn("Indexed 1 queued tile(s)", out.getvalue())
+        self.assertEqual(queue_depth(), 0)
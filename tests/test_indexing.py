@@ -9,22 +9,67 @@ TermSearch.value (and equivalent fields on other search models) must have
 null=True / blank=True for those tests to pass.
 """
 
+import json
+import math
 import uuid
+from unittest import mock
 
-from django.test import TestCase
+from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import translation
 
 from arches.app.models.models import (
+    Concept,
     GraphModel,
     Node,
     NodeGroup,
     ResourceInstance,
     TileModel,
+    Value,
 )
 
-from arches_search.indexing.index_from_tile import index_from_tile
+from arches_search.functions.search_indexing import SearchIndexingFunction
+from arches_search.indexing.index_buffer import IndexBuffer
+from arches_search.indexing.index_from_tile import (
+    index_from_tile,
+    index_from_tiles,
+    save_index_records,
+)
+from arches_search.indexing.concept_cache import ConceptCache, concept_cache
+from arches_search.indexing.fingerprints import clear_fingerprints
+from arches_search.indexing.edtf_cache import edtf_cache_stats, parse_edtf
+from arches_search.indexing.index_plan import IndexPlan, IndexPlanEntry
+from arches_search.indexing.resource_names import resource_names
+from arches_search.indexing.language_indexes import (
+    language_index_name,
+    sync_language_indexes,
+)
+from arches_search.indexing.iso_dates import iso_sortable_date, sortable_dates
+from arches_search.indexing.indexing_factory import IndexingFactory
+from arches_search.indexing.indexers.concept import ConceptIndexing
+from arches_search.indexing.indexers.edtf import EDTFIndexing
 from arches_search.indexing.indexers.file_list import FileListIndexing
+from arches_search.indexing.indexers.geojson_feature_collection import (
+    GeoJSONFeatureCollectionIndexing,
+)
+from arches_search.indexing.indexers.resource_instance import (
+    ResourceInstanceIndexing,
+)
+from arches_search.indexing.tile_records import TileRecord, tile_records
 from arches_search.indexing.indexers.string import StringIndexing
-from arches_search.models.models import FileListSearch, TermSearch
+from arches_search.models.models import (
+    DateRangeSearch,
+    DateSearch,
+    FileListSearch,
+    GeometrySearch,
+    SearchNodeKey,
+    TermSearch,
+    TileIndexFingerprint,
+    UUIDSearch,
+)
+from arches_search.utils.term_matching import build_term_match_filter
 
 # ---------------------------------------------------------------------------
 # Shared test fixture
@@ -136,7 +181,7 @@ class LongStringIndexingTests(IndexingTestCase):
             self._localized_string_value(self.long_string),
         )
         indexer = StringIndexing()
-        result = indexer.index(tile, self.string_node)
+        result = indexer.index(tile, IndexPlanEntry(self.string_node, indexer))
 
         self.assertEqual(len(result), 1)
 
@@ -152,13 +197,62 @@ class LongStringIndexingTests(IndexingTestCase):
         )
         indexer = StringIndexing()
 
-        result = indexer.index(tile, self.string_node)
+        result = indexer.index(tile, IndexPlanEntry(self.string_node, indexer))
 
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].language, "en")
         self.assertEqual(result[0].value, "REX")
 
 
+class LanguageSearchVectorTests(IndexingTestCase):
+    """search_vector is built with the text search config of the row's language."""
+
+    def _matching_languages(self, tile, term_text):
+        return set(
+            TermSearch.objects.filter(tileid=tile.tileid)
+            .filter(build_term_match_filter(term_text))
+            .values_list("language", flat=True)
+        )
+
+    @override_settings(LANGUAGES=[("en", "English"), ("de", "German")])
+    def test_terms_match_stems_of_the_active_language(self):
+        tile = self._make_tile(
+            self.string_node,
+            self._localized_string_value("studies", de="Häuser"),
+        )
+        save_index_records(index_from_tile(tile))
+
+        with translation.override("de"):
+            self.assertEqual(self._matching_languages(tile, "Haus"), {"de"})
+            self.assertEqual(self._matching_languages(tile, "study"), set())
+        with translation.override("en"):
+            self.assertEqual(self._matching_languages(tile, "study"), {"en"})
+
+    def test_rows_without_a_language_match_whole_words(self):
+        tile = self._make_tile(self.non_localized_node, "red granite wall")
+        save_index_records(index_from_tile(tile))
+
+        with translation.override("en"):
+            self.assertEqual(self._matching_languages(tile, "wall granite"), {""})
+
+    def test_configured_languages_get_partial_indexes(self):
+        table = TermSearch._meta.db_table
+
+        sync_language_indexes(["en", "de"])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s",
+                [table],
+            )
+            indexes = dict(cursor.fetchall())
+        self.assertIn("language = 'de'", indexes[language_index_name("de")])
+        self.assertIn("language = ''", indexes[language_index_name("")])
+
+        created, dropped = sync_language_indexes(["en"])
+        self.assertEqual(created, [])
+        self.assertEqual(dropped, [language_index_name("de")])
+
+
 # ---------------------------------------------------------------------------
 # File-list indexing tests
 # ---------------------------------------------------------------------------
@@ -195,7 +289,7 @@ class FileListIndexingTests(IndexingTestCase):
             ],
         )
         indexer = FileListIndexing()
-        result = indexer.index(tile, self.file_list_node)
+        result = indexer.index(tile, IndexPlanEntry(self.file_list_node, indexer))
 
         file_list_rows = [row for row in result if isinstance(row, FileListSearch)]
         self.assertEqual(len(file_list_rows), 2)
@@ -301,3 +395,710 @@ class AllDatatypesNullIndexingTest(IndexingTestCase):
                 f"{len(result)} record(s): {result}"
             ),
         )
+
+
+# ---------------------------------------------------------------------------
+# Incremental (post_save) indexing tests
+# ---------------------------------------------------------------------------
+
+
+class IncrementalIndexingTests(IndexingTestCase):
+    def test_post_save_replaces_existing_rows(self):
+        tile = self._make_tile(
+            self.string_node,
+            self._localized_string_value("first"),
+        )
+        function = SearchIndexingFunction()
+        function.post_save(tile)
+
+        tile.data = {
+            str(self.string_node.nodeid): self._localized_string_value("second")
+        }
+        function.post_save(tile)
+
+        values = list(
+            TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                "value", flat=True
+            )
+        )
+        self.assertEqual(values, ["second"])
+
+    def test_post_save_skips_tiles_with_unchanged_values(self):
+        tile = self._make_tile(
+            self.string_node,
+            self._localized_string_value("first"),
+        )
+        function = SearchIndexingFunction()
+        function.post_save(tile)
+        # a row the skipped reindex would have rewritten
+        TermSearch.objects.filter(tileid=tile.tileid).update(value="untouched")
+
+        function.post_save(tile)
+        self.assertEqual(
+            list(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["untouched"],
+        )
+
+        tile.data = {
+            str(self.string_node.nodeid): self._localized_string_value("second")
+        }
+        function.post_save(tile)
+        self.assertEqual(
+            list(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["second"],
+        )
+
+    def test_clearing_fingerprints_in_scope_keeps_the_others(self):
+        tiles = [
+            self._make_tile(self.string_node, self._localized_string_value(value))
+            for value in ("first", "second")
+        ]
+        function = SearchIndexingFunction()
+        for tile in tiles:
+            function.post_save(tile)
+
+        clear_fingerprints(Q(tileid=tiles[0].tileid))
+
+        self.assertEqual(
+            list(TileIndexFingerprint.objects.values_list("tileid", flat=True)),
+            [tiles[1].tileid],
+        )
+
+    def test_delete_existing_purges_uuid_rows(self):
+        tile = self._make_tile(self.string_node, None)
+        UUIDSearch.objects.create(
+            tileid_id=tile.tileid,
+            resourceinstanceid_id=self.resource_instance.resourceinstanceid,
+            graph_slug=self.graph.slug,
+            node_alias="stale_node",
+            datatype="resource-instance",
+            value=uuid.uuid4(),
+        )
+
+        index_from_tile(tile)
+
+        self.assertFalse(UUIDSearch.objects.filter(tileid=tile.tileid).exists())
+
+    def test_index_from_tiles_groups_rows_by_model(self):
+        tiles = [
+            self._make_tile(self.string_node, self._localized_string_value(value))
+            for value in ("alpha", "beta")
+        ]
+        TermSearch.objects.create(
+            tileid_id=tiles[0].tileid,
+            resourceinstanceid_id=self.resource_instance.resourceinstanceid,
+            graph_slug=self.graph.slug,
+            node_alias="stale_node",
+            language="en",
+            datatype="string",
+            value="stale",
+        )
+
+        grouped = index_from_tiles(tiles)
+
+        self.assertFalse(TermSearch.objects.filter(value="stale").exists())
+        self.assertEqual(
+            sorted(row.value for row in grouped[TermSearch]), ["alpha", "beta"]
+        )
+        self.assertEqual(grouped[UUIDSearch], [])
+
+    def test_tile_records_index_like_tiles(self):
+        tile = self._make_tile(self.string_node, self._localized_string_value("gamma"))
+
+        records = list(tile_records(TileModel.objects.filter(tileid=tile.tileid)))
+
+        self.assertEqual(len(records), 1)
+        self.assertIsInstance(records[0], TileRecord)
+        self.assertEqual(records[0].data, tile.data)
+        self.assertEqual(
+            [
+                (row.value, row.language, row.resourceinstanceid_id)
+                for row in index_from_tile(records[0], delete_existing=False)
+            ],
+            [
+                (row.value, row.language, row.resourceinstanceid_id)
+                for row in index_from_tile(tile, delete_existing=False)
+            ],
+        )
+
+
+# ---------------------------------------------------------------------------
+# EDTF tests
+# ---------------------------------------------------------------------------
+
+
+class EDTFIndexingTests(IndexingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.edtf_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_edtf_node",
+            alias="test_edtf_node",
+            datatype="edtf",
+            graph=cls.graph,
+            nodegroup=cls.nodegroup,
+            istopnode=False,
+        )
+
+    def test_repeated_values_are_parsed_once(self):
+        indexer = EDTFIndexing()
+        tiles = [self._make_tile(self.edtf_node, "1900/1950") for _ in range(2)]
+        hits, misses = edtf_cache_stats()
+
+        entry = IndexPlanEntry(self.edtf_node, indexer)
+        results = [indexer.index(tile, entry) for tile in tiles]
+
+        self.assertEqual(edtf_cache_stats(), (hits + 1, misses + 1))
+        for result in results:
+            self.assertEqual(
+                [type(row) for row in result],
+                [DateSearch, DateSearch, DateRangeSearch],
+            )
+            date_range = result[2]
+            self.assertEqual(
+                (date_range.start_value, date_range.end_value),
+                (result[0].value, result[1].value),
+            )
+
+
+class GeometryIndexingTests(IndexingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.geometry_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_geometry_node",
+            alias="test_geometry_node",
+            datatype="geojson-feature-collection",
+            graph=cls.graph,
+            nodegroup=cls.nodegroup,
+            istopnode=False,
+        )
+
+    @staticmethod
+    def _feature_collection(*geometries):
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "properties": {}, "geometry": geometry}
+                for geometry in geometries
+            ],
+        }
+
+    def _circle(self, vertex_count):
+        ring = [
+            [
+                math.cos(2 * math.pi * i / vertex_count),
+                math.sin(2 * math.pi * i / vertex_count),
+            ]
+            for i in range(vertex_count)
+        ]
+        return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+    def _index_geometry(self, tile):
+        indexer = GeoJSONFeatureCollectionIndexing()
+        return indexer.index(tile, IndexPlanEntry(self.geometry_node, indexer))
+
+    @override_settings(INDEX_GEOMETRY_MAX_VERTICES=16)
+    def test_large_geometries_are_subdivided(self):
+        circle = self._circle(200)
+        tile = self._make_tile(self.geometry_node, self._feature_collection(circle))
+
+        rows = self._index_geometry(tile)
+
+        self.assertGreater(len(rows), 1)
+        for row in rows:
+            self.assertEqual(row.geom.srid, 4326)
+            self.assertLessEqual(row.geom.num_coords, 16)
+        whole = GEOSGeometry(json.dumps(circle), srid=4326)
+        self.assertAlmostEqual(sum(row.geom.area for row in rows), whole.area)
+
+    @override_settings(INDEX_GEOMETRY_MAX_VERTICES=16)
+    def test_invalid_geometries_are_skipped(self):
+        point = {"type": "Point", "coordinates": [1, 2]}
+        tile = self._make_tile(
+            self.geometry_node,
+            self._feature_collection(
+                {"type": "Polygon", "coordinates": "not coordinates"}, point
+            ),
+        )
+
+        rows = self._index_geometry(tile)
+
+        self.assertEqual([row.geom.coords for row in rows], [(1.0, 2.0)])
+
+    @override_settings(INDEX_GEOMETRY_MAX_VERTICES=16)
+    def test_self_intersecting_polygons_are_repaired_alone(self):
+        bowtie = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [2, 2], [2, 0], [0, 2], [0, 0]]],
+        }
+        circle = self._circle(200)
+        tile = self._make_tile(
+            self.geometry_node, self._feature_collection(bowtie, circle)
+        )
+
+        rows = self._index_geometry(tile)
+
+        self.assertTrue(all(row.geom.valid for row in rows))
+        self.assertGreater(len(rows), 2)
+        whole = GEOSGeometry(json.dumps(circle), srid=4326)
+        self.assertAlmostEqual(sum(row.geom.area for row in rows), whole.area + 2)
+
+    def test_geometries_are_stored_whole_by_default(self):
+        tile = self._make_tile(
+            self.geometry_node, self._feature_collection(self._circle(200))
+        )
+
+        rows = self._index_geometry(tile)
+
+        self.assertEqual([row.geom.num_coords for row in rows], [201])
+
+
+class ISODateTests(SimpleTestCase):
+    def test_common_iso_variants_match_edtf(self):
+        values = [
+            "1850",
+            "1850-07",
+            "1850-07-14",
+            "1850-07-14 10:30:00",
+            "1850-07-14T10:30:00.250+02:00",
+            "1850-07-14T23:59:59Z",
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    iso_sortable_date(value), parse_edtf(value).bounds.lower
+                )
+
+    def test_other_formats_fall_back_to_edtf(self):
+        self.assertIsNone(iso_sortable_date("1850~"))
+        self.assertIsNone(iso_sortable_date("1850-13-01"))
+        self.assertEqual(
+            sortable_dates(["1850-07-14", "1850~", None]),
+            [18500714, parse_edtf("1850~").bounds.lower, None],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Concept tests
+# ---------------------------------------------------------------------------
+
+
+class ConceptIndexingTests(IndexingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.concept_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_concept_node",
+            alias="test_concept_node",
+            datatype="concept",
+            graph=cls.graph,
+            nodegroup=cls.nodegroup,
+            istopnode=False,
+        )
+        cls.concept = Concept.objects.create(
+            conceptid=uuid.uuid4(), nodetype_id="Concept"
+        )
+        cls.label = Value.objects.create(
+            valueid=uuid.uuid4(),
+            concept=cls.concept,
+            valuetype_id="prefLabel",
+            language_id="en",
+            value="Granite",
+        )
+        for valuetype, year in (("min_year", "1800"), ("max_year", "1900")):
+            Value.objects.create(
+                valueid=uuid.uuid4(),
+                concept=cls.concept,
+                valuetype_id=valuetype,
+                language_id="en",
+                value=year,
+            )
+
+    def test_preloaded_labels_and_date_ranges_need_no_queries(self):
+        indexer = ConceptIndexing()
+        tile = self._make_tile(self.concept_node, str(self.label.valueid))
+        concept_cache.preload()
+
+        entry = IndexPlanEntry(self.concept_node, indexer)
+        with self.assertNumQueries(0):
+            result = indexer.index(tile, entry)
+
+        self.assertEqual(
+            [(type(row), getattr(row, "value", None)) for row in result],
+            [
+                (TermSearch, "Granite"),
+                (UUIDSearch, self.concept.conceptid),
+                (UUIDSearch, str(self.label.valueid)),
+                (DateRangeSearch, None),
+            ],
+        )
+        self.assertEqual(
+            (result[3].start_value, result[3].end_value), (18000101, 19001231)
+        )
+
+    def test_saving_a_value_invalidates_the_cache(self):
+        concept_cache.preload()
+        self.label.value = "Basalt"
+        self.label.save()
+        tile = self._make_tile(self.concept_node, str(self.label.valueid))
+
+        indexer = ConceptIndexing()
+        result = indexer.index(tile, IndexPlanEntry(self.concept_node, indexer))
+
+        self.assertEqual(result[0].value, "Basalt")
+
+    def test_resaving_an_unchanged_tile_reindexes_its_labels(self):
+        tile = self._make_tile(self.concept_node, str(self.label.valueid))
+        function = SearchIndexingFunction()
+        function.post_save(tile)
+        TermSearch.objects.filter(tileid=tile.tileid).update(value="stale")
+
+        function.post_save(tile)
+
+        self.assertEqual(
+            list(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["Granite"],
+        )
+        self.assertFalse(
+            TileIndexFingerprint.objects.filter(tileid=tile.tileid).exists()
+        )
+
+    def test_other_processes_notice_value_changes(self):
+        valueid = str(self.label.valueid)
+        other_process = ConceptCache()
+        other_process._version_check.interval = 0
+        self.assertEqual(other_process.get_many([valueid])[valueid].label, "Granite")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label.value = "Basalt"
+            self.label.save()
+
+        self.assertEqual(other_process.get_many([valueid])[valueid].label, "Basalt")
+
+    def test_unknown_values_are_remembered_within_the_size_bound(self):
+        cache = ConceptCache(maxsize=2)
+        unknown = str(uuid.uuid4())
+        self.assertEqual(cache.get_many([unknown]), {})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get_many([unknown]), {})
+
+        cache.get_many([str(self.label.valueid), str(uuid.uuid4())])
+        self.assertEqual(len(cache._values), 2)
+
+
+# ---------------------------------------------------------------------------
+# Resource instance tests
+# ---------------------------------------------------------------------------
+
+
+class ResourceInstanceIndexingTests(IndexingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.resource_instance_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_resource_instance_node",
+            alias="test_resource_instance_node",
+            datatype="resource-instance",
+            graph=cls.graph,
+            nodegroup=cls.nodegroup,
+            istopnode=False,
+        )
+        cls.related_resource = ResourceInstance.objects.create(
+            resourceinstanceid=uuid.uuid4(),
+            graph=cls.graph,
+        )
+        ResourceInstance.objects.filter(pk=cls.related_resource.pk).update(
+            descriptors={"en": {"name": "Related Site"}}
+        )
+
+    def test_names_for_a_batch_are_resolved_with_one_query(self):
+        resource_names.clear()
+        related_id = str(self.related_resource.resourceinstanceid)
+        tiles = [
+            self._make_tile(self.resource_instance_node, [{"resourceId": related_id}])
+            for _ in range(2)
+        ]
+        indexer = ResourceInstanceIndexing()
+
+        entry = IndexPlanEntry(self.resource_instance_node, indexer)
+        with self.assertNumQueries(1):
+            result = indexer.index_tiles(tiles, entry)
+
+        self.assertEqual(
+            [(type(row), row.value) for row in result],
+            [(TermSearch, "Related Site"), (UUIDSearch, related_id)] * 2,
+        )
+        self.assertEqual(result[0].language, "en")
+
+    def test_names_are_only_kept_during_a_run(self):
+        related_id = str(self.related_resource.resourceinstanceid)
+
+        with resource_names.caching():
+            resource_names.get_many([related_id])
+            with self.assertNumQueries(0):
+                resource_names.get_many([related_id])
+
+        ResourceInstance.objects.filter(pk=self.related_resource.pk).update(
+            descriptors={"en": {"name": "Renamed Site"}}
+        )
+        self.assertEqual(
+            resource_names.get_many([related_id])[related_id], (("en", "Renamed Site"),)
+        )
+
+    def test_rename_rewrites_referencing_term_rows(self):
+        related_id = str(self.related_resource.resourceinstanceid)
+        tile = self._make_tile(
+            self.resource_instance_node, [{"resourceId": related_id}]
+        )
+        save_index_records(index_from_tile(tile))
+        uuid_row_ids = list(
+            UUIDSearch.objects.filter(tileid=tile.tileid).values_list("id", flat=True)
+        )
+
+        renamed = ResourceInstance.objects.get(pk=self.related_resource.pk)
+        renamed.descriptors = {"en": {"name": "Renamed Site"}}
+        with self.captureOnCommitCallbacks(execute=True):
+            renamed.save()
+
+        self.assertEqual(
+            list(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["Renamed Site"],
+        )
+        self.assertEqual(
+            list(
+                UUIDSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "id", flat=True
+                )
+            ),
+            uuid_row_ids,
+        )
+
+    def test_rename_runs_in_process_when_the_broker_is_unreachable(self):
+        related_id = str(self.related_resource.resourceinstanceid)
+        tile = self._make_tile(
+            self.resource_instance_node, [{"resourceId": related_id}]
+        )
+        save_index_records(index_from_tile(tile))
+
+        renamed = ResourceInstance.objects.get(pk=self.related_resource.pk)
+        renamed.descriptors = {"en": {"name": "Renamed Site"}}
+        with (
+            mock.patch(
+                "arches_search.tasks.check_if_celery_available", return_value=True
+            ),
+            mock.patch(
+                "arches_search.tasks.reindex_search_resource_references.delay",
+                side_effect=ConnectionError,
+            ),
+            self.assertLogs("arches_search.tasks", "ERROR"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            renamed.save()
+
+        self.assertEqual(
+            list(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["Renamed Site"],
+        )
+
+    def test_rename_ignores_name_rows_of_other_references(self):
+        other_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_other_resource_node",
+            alias="test_other_resource_node",
+            datatype="resource-instance",
+            graph=self.graph,
+            nodegroup=self.nodegroup,
+            istopnode=False,
+        )
+        other_resource = ResourceInstance.objects.create(
+            resourceinstanceid=uuid.uuid4(), graph=self.graph
+        )
+        ResourceInstance.objects.filter(pk=other_resource.pk).update(
+            descriptors={"en": {"name": "Renamed Site"}}
+        )
+        tile = TileModel.objects.create(
+            tileid=uuid.uuid4(),
+            nodegroup=self.nodegroup,
+            resourceinstance=self.resource_instance,
+            data={
+                str(self.resource_instance_node.nodeid): [
+                    {"resourceId": str(self.related_resource.resourceinstanceid)}
+                ],
+                str(other_node.nodeid): [
+                    {"resourceId": str(other_resource.resourceinstanceid)}
+                ],
+            },
+            provisionaledits=None,
+        )
+        save_index_records(index_from_tile(tile))
+
+        renamed = ResourceInstance.objects.get(pk=self.related_resource.pk)
+        renamed.descriptors = {"en": {"name": "Renamed Site"}}
+        with self.captureOnCommitCallbacks(execute=True):
+            renamed.save()
+
+        self.assertEqual(
+            sorted(
+                TermSearch.objects.filter(tileid=tile.tileid).values_list(
+                    "value", flat=True
+                )
+            ),
+            ["Renamed Site", "Renamed Site"],
+        )
+
+    def test_saves_that_keep_the_name_skip_the_cascade(self):
+        resource = ResourceInstance.objects.get(pk=self.related_resource.pk)
+
+        with mock.patch(
+            "arches_search.indexing.resource_references.is_referenced"
+        ) as is_referenced:
+            resource.save()
+            self._make_tile(self.string_node, self._localized_string_value("x"))
+
+        is_referenced.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Index plan tests
+# ---------------------------------------------------------------------------
+
+
+class IndexPlanTests(IndexingTestCase):
+    def test_nodegroup_cache_entry_is_compiled_without_unindexed_nodes(self):
+        semantic_node = Node.objects.create(
+            nodeid=uuid.uuid4(),
+            name="test_semantic_node",
+            alias="test_semantic_node",
+            datatype="semantic",
+            graph=self.graph,
+            nodegroup=self.nodegroup,
+            istopnode=False,
+        )
+        nodegroup_cache = {
+            self.nodegroup.nodegroupid: [semantic_node, self.string_node],
+        }
+        tile = self._make_tile(self.string_node, self._localized_string_value("delta"))
+
+        result = index_from_tile(
+            tile, delete_existing=False, nodegroup_cache=nodegroup_cache
+        )
+
+        plan = nodegroup_cache[self.nodegroup.nodegroupid]
+        self.assertIsInstance(plan, IndexPlan)
+        self.assertEqual(
+            [(entry.nodeid, entry.alias, entry.graph_slug) for entry in plan],
+            [(str(self.string_node.nodeid), "test_string_node", "test-indexing")],
+        )
+        self.assertEqual([row.value for row in result], ["delta"])
+
+    def test_rows_are_keyed_by_their_node(self):
+        tile = self._make_tile(self.string_node, self._localized_string_value("echo"))
+
+        save_index_records(index_from_tile(tile))
+
+        row = TermSearch.objects.get(tileid=tile)
+        self.assertEqual(
+            SearchNodeKey.objects.filter(pk=row.node_key)
+            .values_list("graph_slug", "node_alias", "datatype")
+            .get(),
+            ("test-indexing", "test_string_node", "string"),
+        )
+        # rows created directly get the same key
+        direct_row = TermSearch.objects.create(
+            tileid=tile,
+            resourceinstanceid=self.resource_instance,
+            graph_slug="test-indexing",
+            node_alias="test_string_node",
+            language="en",
+            datatype="string",
+            value="foxtrot",
+        )
+        self.assertEqual(direct_row.node_key, row.node_key)
+
+
+class IndexingFactoryTests(TestCase):
+    def test_indexers_are_shared_between_factories(self):
+        self.assertIs(
+            IndexingFactory().get_indexer("string"),
+            IndexingFactory().get_indexer("string"),
+        )
+        self.assertIsInstance(IndexingFactory().get_indexer("string"), StringIndexing)
+        self.assertIsNone(IndexingFactory().get_indexer("semantic"))
+
+    @override_settings(
+        SEARCH_INDEXERS={
+            "semantic": "arches_search.indexing.indexers.string.StringIndexing"
+        }
+    )
+    def test_setting_registers_extra_indexers(self):
+        self.assertIsInstance(IndexingFactory().get_indexer("semantic"), StringIndexing)
+
+
+# ---------------------------------------------------------------------------
+# Reindex buffer tests
+# ---------------------------------------------------------------------------
+
+
+class IndexBufferTests(IndexingTestCase):
+    def _term_row(self, value):
+        return TermSearch(
+            tileid_id=uuid.uuid4(),
+            resourceinstanceid_id=self.resource_instance.resourceinstanceid,
+            graph_slug=self.graph.slug,
+            node_alias=self.string_node.alias,
+            language="en",
+            datatype="string",
+            value=value,
+        )
+
+    def test_buffer_fills_on_estimated_bytes(self):
+        buffer = IndexBuffer(max_rows=1000, max_bytes=len(self.long_string))
+
+        buffer.extend([self._term_row("short")])
+        self.assertFalse(buffer.is_full())
+
+        buffer.extend([self._term_row(self.long_string)])
+        self.assertTrue(buffer.is_full())
+
+    def test_flush_hands_over_grouped_rows_and_keeps_peaks(self):
+        buffer = IndexBuffer(max_rows=2, max_bytes=1 << 30)
+        buffer.extend([self._term_row("a"), self._term_row("b")])
+        self.assertTrue(buffer.is_full())
+        written = {}
+
+        buffer.flush(
+            lambda values: written.update(
+                {model: list(rows) for model, rows in values.items() if rows}
+            )
+        )
+
+        self.assertEqual([row.value for row in written[TermSearch]], ["a", "b"])
+        self.assertEqual(buffer.rows, 0)
+        self.assertEqual(buffer.peak_rows, 2)
+        self.assertGreater(buffer.peak_bytes, 0)